@@ -0,0 +1,138 @@
+"""
+Concurrent job source fan-out with a single overall deadline
+Runs every source at the same time and returns whatever has arrived in time
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+
+import metrics
+import upstream_guard
+
+DEFAULT_DEADLINE = float(os.environ.get('SEARCH_DEADLINE_SECONDS', 12))
+
+# Status error of a source that never got a thread before the deadline
+POOL_BUSY = "source pool busy"
+
+# Shared pool so a source that overruns the deadline keeps running in the
+# background instead of blocking the request that gave up on it. Sized for
+# 8 overlapping searches of up to 4 sources each (the JobSpy stream's store
+# plus three sites), so sources don't queue behind other searches; threads
+# are only started as they are needed.
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('SOURCE_WORKERS', 32)),
+    thread_name_prefix='job-source'
+)
+
+def iter_sources(sources, deadline=None):
+    """Run (name, fn, args) sources concurrently, yielding (status, jobs) as each finishes
+
+    The deadline covers the whole fan-out, from submission. Sources still
+    running when it passes are yielded last with a timeout status and no
+    jobs. Sources still waiting for a pool thread are cancelled and yielded
+    as skipped with error POOL_BUSY, since their upstream was never asked.
+    Sources whose upstream circuits are all open are not run and are yielded
+    first as skipped. status is {name, status, latencyMs, count} where
+    status is one of ok / timeout / error / skipped.
+    """
+    if deadline is None:
+        deadline = DEFAULT_DEADLINE
+
+    started = time.monotonic()
+    finished_at = {}
+
+    def run(name, fn, args):
+        with metrics.track_source(name) as tracked:
+            try:
+                jobs = fn(*args)
+                tracked.returned = len(jobs) if jobs else 0
+                return jobs
+            finally:
+                finished_at[name] = time.monotonic()
+
+    futures = {}
+    skipped = []
+    for name, fn, args in sources:
+        if upstream_guard.source_available(name):
+            futures[_executor.submit(run, name, fn, args)] = name
+        else:
+            skipped.append(name)
+
+    for name in skipped:
+        print(f"{name} skipped: upstream circuit open")
+        metrics.SOURCE_RUNS.inc(name, "skipped")
+        yield {
+            "name": name,
+            "status": "skipped",
+            "latencyMs": 0,
+            "count": 0,
+            "error": "upstream circuit open"
+        }, []
+
+    done = set()
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            done.add(future)
+            name = futures[future]
+            status = {
+                "name": name,
+                "status": "ok",
+                "latencyMs": int((finished_at.get(name, time.monotonic()) - started) * 1000),
+                "count": 0
+            }
+            jobs = []
+            try:
+                jobs = future.result() or []
+                status["count"] = len(jobs)
+            except Exception as e:
+                status["status"] = "error"
+                status["error"] = str(e)
+                print(f"{name} scraping failed: {e}")
+            metrics.SOURCE_RUNS.inc(name, status["status"])
+            yield status, jobs
+    except FuturesTimeout:
+        pass
+
+    for future, name in futures.items():
+        if future in done:
+            continue
+        if future.cancel():
+            print(f"{name} skipped: no source thread free within the {deadline}s deadline")
+            metrics.SOURCE_RUNS.inc(name, "skipped")
+            yield {
+                "name": name,
+                "status": "skipped",
+                "latencyMs": int((time.monotonic() - started) * 1000),
+                "count": 0,
+                "error": POOL_BUSY
+            }, []
+            continue
+        print(f"{name} missed the {deadline}s deadline")
+        metrics.SOURCE_RUNS.inc(name, "timeout")
+        yield {
+            "name": name,
+            "status": "timeout",
+            "latencyMs": int((time.monotonic() - started) * 1000),
+            "count": 0
+        }, []
+
+def all_sources_ran(statuses):
+    """False if any source was skipped for lack of a pool thread; such results shouldn't be cached"""
+    return not any(status.get("error") == POOL_BUSY for status in statuses)
+
+def gather_sources(sources, deadline=None):
+    """Run (name, fn, args) sources concurrently and collect results until the deadline
+
+    Returns (results, statuses): results maps source name to its job list and
+    statuses lists each source's iter_sources status in source order.
+    """
+    order = [name for name, _, _ in sources]
+    results = {}
+    statuses = {}
+    for status, jobs in iter_sources(sources, deadline):
+        statuses[status["name"]] = status
+        if status["status"] == "ok":
+            results[status["name"]] = jobs
+
+    return results, [statuses[name] for name in order]
@@ -1,94 +1,210 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
-from jobspy import scrape_jobs
-import pandas as pd
 from datetime import datetime, timedelta
-import uuid
 import os
+import threading
+
+from result_cache import search_cache, make_search_key
+from keyword_matcher import matcher
+from job_store import job_store, stable_job_id
+from dedupe import dedupe_jobs
+from salary import salary_fields, format_salary, salary_bounds, salary_filter, filter_payload
+from crawler import start_crawler
+from aggregator import all_sources_ran
+from pagination import snapshot_store, cursor_response
+from scoring import scorer, score_jobs, parse_weights, rerank_payload
+from async_search import cached_search
+from job_table import JobTable
+from conditional import conditional_page, page_etag
+import upstream_guard
+import json_fragments
+import lazy_imports
+from search_stream import wants_stream, stream_live_search, stream_cached_payload, ndjson_response
+import metrics
+
+# JobSpy, pandas and numpy take most of the startup time; they're loaded with
+# the first scrape (or by warm_up() once the app is serving), not at import
+scrape_jobs = lazy_imports.function('jobspy', 'scrape_jobs')
+pd = lazy_imports.module('pandas')
+np = lazy_imports.module('numpy')
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for Next.js frontend
+metrics.instrument_app(app)
+
+# Common tech skills to look for in descriptions
+TECH_SKILLS = [
+    'react', 'javascript', 'python', 'typescript', 'node.js', 'next.js',
+    'html', 'css', 'tailwindcss', 'git', 'aws', 'docker', 'sql',
+    'mongodb', 'postgresql', 'redis', 'graphql', 'rest api'
+]
 
+REMOTE_KEYWORDS = matcher.vocabulary['remote']
+
+@metrics.timed('convert')
 def convert_jobspy_to_app_format(df):
-    """Convert JobSpy DataFrame to our app's Job interface format"""
-    jobs = []
+    """Convert JobSpy DataFrame to our app's Job interface format
+
+    Works column-at-a-time: every text column is stringified and scanned by
+    the shared keyword matcher once, and the resulting flags, salary and date
+    handling run as vectorized pandas / NumPy operations. Relevance is
+    scored for the whole batch by scoring.
+    """
+    if df.empty:
+        return []
     
-    for _, row in df.iterrows():
-        # Calculate relevance score (we'll enhance this later)
-        relevance_score = calculate_basic_relevance(row)
-        
-        job = {
-            "id": str(uuid.uuid4()),
-            "title": str(row.get('title', '')),
-            "company": str(row.get('company', '')),
-            "location": str(row.get('location', '')),
-            "salary": format_salary(row),
-            "postedDate": format_date(row.get('date_posted')),
-            "source": str(row.get('site', '')).title(),
-            "description": str(row.get('description', ''))[:500] + '...' if len(str(row.get('description', ''))) > 500 else str(row.get('description', '')),
-            "requirements": extract_requirements(row.get('description', '')),
-            "isRemote": is_remote_job(row),
-            "relevanceScore": relevance_score,
+    now = datetime.now()
+    
+    title = _text_column(df, 'title')
+    company = _text_column(df, 'company')
+    location = _text_column(df, 'location')
+    description = _text_column(df, 'description')
+    site = _text_column(df, 'site')
+    job_url = _text_column(df, 'job_url')
+    
+    # One matcher pass per text column
+    title_hits = _scan_column(title)
+    location_hits = _scan_column(location)
+    description_hits = _scan_column(description)
+    job_type_hits = _scan_column(_text_column(df, 'job_type'))
+    
+    # Remote detection across location, title and description
+    is_remote = _has_any(location_hits, REMOTE_KEYWORDS) | _has_any(title_hits, REMOTE_KEYWORDS) | _has_any(description_hits, REMOTE_KEYWORDS)
+    
+    # Skill flags: one boolean column per skill
+    description_present = df['description'].notna().to_numpy() if 'description' in df else np.zeros(len(df), dtype=bool)
+    skill_flags = np.column_stack([_has(description_hits, skill) for skill in TECH_SKILLS])
+    skill_flags &= description_present[:, None]
+    skill_names = [skill.title() for skill in TECH_SKILLS]
+    requirements = [[skill_names[i] for i in np.flatnonzero(flags)][:8] for flags in skill_flags]
+    
+    posted_dates = _parse_date_column(df, now)
+    
+    # Description truncated to 500 characters
+    truncated = description.str.slice(0, 500)
+    descriptions = truncated.where(description.str.len() <= 500, truncated + '...')
+    
+    tags = _build_tags(title_hits, job_type_hits, is_remote)
+    
+    # Stable IDs so the same posting keeps its ID across scrapes
+    ids = [stable_job_id(*fields) for fields in zip(job_url.tolist(), title.tolist(), company.tolist())]
+    
+    salaries, salary_numbers = _salary_columns(df)
+    
+    columns = zip(
+        ids,
+        title.tolist(),
+        company.tolist(),
+        location.tolist(),
+        salaries,
+        salary_numbers,
+        posted_dates,
+        site.str.title().tolist(),
+        descriptions.tolist(),
+        requirements,
+        is_remote.tolist(),
+        tags,
+        job_url.tolist()
+    )
+    
+    jobs = [
+        {
+            "id": row_id,
+            "title": row_title,
+            "company": row_company,
+            "location": row_location,
+            "salary": row_salary,
+            **row_salary_numbers,
+            "postedDate": row_posted,
+            "source": row_source,
+            "description": row_description,
+            "requirements": row_requirements,
+            "isRemote": row_remote,
+            "relevanceScore": 0,
             "applicationStatus": "not_applied",
-            "tags": extract_tags(row),
-            "url": str(row.get('job_url', ''))
+            "tags": row_tags,
+            "url": row_url
         }
-        jobs.append(job)
-    
-    return jobs
+        for (row_id, row_title, row_company, row_location, row_salary, row_salary_numbers, row_posted, row_source,
+             row_description, row_requirements, row_remote, row_tags, row_url) in columns
+    ]
+    return score_jobs(jobs)
 
-def calculate_basic_relevance(row):
-    """Basic relevance scoring - we'll enhance this with the existing AI scoring later"""
-    score = 50  # Base score
-    
-    title = str(row.get('title', '')).lower()
-    description = str(row.get('description', '')).lower()
-    company = str(row.get('company', '')).lower()
+def _text_column(df, name):
+    """Column as str values (NaN -> 'nan', matching str(row.get(name, '')))"""
+    if name not in df:
+        return pd.Series([''] * len(df), index=df.index, dtype=object)
+    return df[name].map(str).astype(object)
+
+def _scan_column(series):
+    """Keyword matcher hits for every value of a text column"""
+    return [matcher.scan(text) for text in series.tolist()]
+
+def _has(hits, phrase):
+    """Rows whose hits include a phrase, as a NumPy bool array"""
+    return np.fromiter((phrase in row for row in hits), dtype=bool, count=len(hits))
+
+def _has_any(hits, phrases):
+    """Rows whose hits include any of the phrases, as a NumPy bool array"""
+    phrases = frozenset(phrases)
+    return np.fromiter((not phrases.isdisjoint(row) for row in hits), dtype=bool, count=len(hits))
+
+def _parse_date_column(df, now):
+    """postedDate ISO strings for the date_posted column, parsed in one pass"""
+    if 'date_posted' not in df:
+        return [now.isoformat()] * len(df)
     
-    # Jeremy's key skills scoring
-    jeremy_skills = ['react', 'javascript', 'python', 'next.js', 'tailwindcss', 'typescript', 'node.js']
+    raw = df['date_posted']
+    try:
+        posted = pd.to_datetime(raw, errors='coerce')
+    except (TypeError, ValueError):
+        # Mixed timezones and similar can't share a column; parse per value
+        posted = pd.Series(pd.NaT, index=df.index)
     
-    for skill in jeremy_skills:
-        if skill in title or skill in description:
-            score += 8
+    # Anything the vectorized pass couldn't parse gets the per-value treatment
+    posted_dates = [
+        ts.isoformat() if pd.notna(ts) else format_date(original)
+        for ts, original in zip(posted.tolist(), raw.tolist())
+    ]
+    return posted_dates
+
+def _salary_columns(df):
+    """Display salary and numeric salary fields of every row"""
+    n = len(df)
+    min_amount = pd.to_numeric(df['min_amount'], errors='coerce').to_numpy(dtype=float) if 'min_amount' in df else np.full(n, np.nan)
+    max_amount = pd.to_numeric(df['max_amount'], errors='coerce').to_numpy(dtype=float) if 'max_amount' in df else np.full(n, np.nan)
+    # JobSpy reports the pay period as yearly / monthly / weekly / daily / hourly
+    interval = df['interval'].where(df['interval'].notna(), 'yearly').astype(str).tolist() if 'interval' in df else ['yearly'] * n
+    currency = df['currency'].where(df['currency'].notna(), 'USD').astype(str).tolist() if 'currency' in df else ['USD'] * n
     
-    # Remote preference
-    if is_remote_job(row):
-        score += 10
+    salaries = []
+    numbers = []
+    for low, high, period, code in zip(min_amount.tolist(), max_amount.tolist(), interval, currency):
+        salaries.append(format_salary(low, high, period, code))
+        numbers.append(salary_fields(low, high, period, code))
+    return salaries, numbers
+
+def _build_tags(title_hits, job_type_hits, is_remote):
+    """Remote, experience level and job type tags of every row"""
+    senior = _has(title_hits, 'senior')
+    junior = _has_any(title_hits, ['junior', 'entry'])
+    mid = _has_any(title_hits, ['mid', 'intermediate'])
+    full_time = _has(job_type_hits, 'full-time')
+    part_time = _has(job_type_hits, 'part-time')
+    contract = _has(job_type_hits, 'contract')
     
-    # Location preference (Nashville)
-    location = str(row.get('location', '')).lower()
-    if 'nashville' in location or 'tennessee' in location:
-        score += 8
+    level = np.select([senior, junior, mid], ['Senior', 'Junior', 'Mid-Level'], default='')
+    job_type = np.select([full_time, part_time, contract], ['Full-Time', 'Part-Time', 'Contract'], default='')
     
-    # Job recency
-    date_posted = row.get('date_posted')
-    if date_posted:
-        try:
-            posted_date = pd.to_datetime(date_posted)
-            days_ago = (datetime.now() - posted_date).days
-            if days_ago <= 7:
-                score += 10
-            elif days_ago <= 30:
-                score += 5
-        except:
-            pass
-    
-    return min(96, max(70, score))
-
-def format_salary(row):
-    """Format salary information"""
-    min_salary = row.get('min_amount')
-    max_salary = row.get('max_amount')
-    
-    if pd.notna(min_salary) and pd.notna(max_salary):
-        return f"${int(min_salary):,} - ${int(max_salary):,}"
-    elif pd.notna(min_salary):
-        return f"${int(min_salary):,}+"
-    elif pd.notna(max_salary):
-        return f"Up to ${int(max_salary):,}"
-    else:
-        return "Salary not specified"
+    tags = []
+    for remote, row_level, row_type in zip(is_remote.tolist(), level.tolist(), job_type.tolist()):
+        row_tags = ['Remote'] if remote else []
+        if row_level:
+            row_tags.append(row_level)
+        if row_type:
+            row_tags.append(row_type)
+        tags.append(row_tags)
+    return tags
 
 def format_date(date_str):
     """Format date to ISO string"""
@@ -102,118 +218,214 @@ def format_date(date_str):
     except:
         return datetime.now().isoformat()
 
-def is_remote_job(row):
-    """Determine if job is remote"""
-    location = str(row.get('location', '')).lower()
-    title = str(row.get('title', '')).lower()
-    description = str(row.get('description', '')).lower()
+# Job sites searched through JobSpy
+SITES = ["indeed", "linkedin", "glassdoor"]
+
+# JobSpy makes its own requests, so each call is guarded as a whole, with one
+# guard per site whether a call scrapes every site or one site when streaming
+JOBSPY_UPSTREAM = 'jobspy'
+
+def site_upstream(site):
+    """Guard key of one JobSpy site"""
+    return f'{JOBSPY_UPSTREAM}:{site}'
+
+for _site in SITES:
+    upstream_guard.register_source(_site.title(), site_upstream(_site))
+
+def collect_jobs(search_term, location, results_wanted, live=False):
+    """Answer from the local job store, scraping JobSpy live only to top it up
+
+    live=True always scrapes, as the crawler does when re-warming a query.
+    """
+    # Over-fetch so near-duplicates don't leave the stored answer short. Only
+    # jobs matching every word count here: "rust developer" isn't answered by
+    # stored "developer" jobs
+    stored, store_status = job_store.search_with_status(search_term, location, results_wanted * 2, all_words=True)
+    stored = dedupe_jobs(stored)
     
-    remote_keywords = ['remote', 'work from home', 'wfh', 'distributed', 'anywhere']
+    if len(stored) >= results_wanted and not live:
+        # Enough stored matches: answer now and refresh the index off the request path
+        if job_store.claim_refresh(search_term, location, results_wanted):
+            threading.Thread(target=scrape_all_jobs, args=(search_term, location, results_wanted), daemon=True).start()
+        return finalize_jobs(stored, [store_status])
     
-    for keyword in remote_keywords:
-        if keyword in location or keyword in title or keyword in description:
-            return True
+    job_store.claim_refresh(search_term, location, results_wanted)
+    # Partial matches still top up the live results
+    stored, store_status = job_store.search_with_status(search_term, location, results_wanted * 2)
+    stored = dedupe_jobs(stored)
+    jobs = scrape_all_jobs(search_term, location, results_wanted)
     
-    return False
+    # Fresh results first, then stored matches the live scrape didn't return
+    return finalize_jobs(jobs + stored, [store_status])
 
-def extract_requirements(description):
-    """Extract requirements/skills from job description"""
-    if pd.isna(description):
-        return []
-    
-    description = str(description).lower()
+def scrape_all_jobs(search_term, location, results_wanted):
+    """Scrape every JobSpy site in one call, convert and store the results"""
+    with metrics.track_source('JobSpy') as tracked:
+        # Scrape jobs from every site in one JobSpy call (fetch and parse happen inside JobSpy)
+        try:
+            # Sites whose circuit is open or whose rate budget is spent are left out
+            with metrics.stage('fetch'), upstream_guard.guarded_all([site_upstream(site) for site in SITES]) as allowed:
+                jobs_df = scrape_jobs(
+                    site_name=[site for site in SITES if site_upstream(site) in allowed],
+                    search_term=search_term,
+                    location=location,
+                    results_wanted=results_wanted,
+                    hours_old=168,  # Jobs posted in last week
+                    country_indeed='USA'
+                )
+        except upstream_guard.UpstreamUnavailable as e:
+            print(f"Skipping JobSpy scrape: {e}")
+            tracked.returned = 0
+            return []
+        metrics.count_parsed(len(jobs_df))
+        
+        # Convert to our app format
+        jobs = convert_jobspy_to_app_format(jobs_df)
+        job_store.upsert(jobs)
+        tracked.returned = len(jobs)
     
-    # Common tech skills to look for
-    tech_skills = [
-        'react', 'javascript', 'python', 'typescript', 'node.js', 'next.js',
-        'html', 'css', 'tailwindcss', 'git', 'aws', 'docker', 'sql',
-        'mongodb', 'postgresql', 'redis', 'graphql', 'rest api'
-    ]
+    return jobs
+
+def scrape_site_jobs(site, search_term, location, results_wanted):
+    """Scrape a single JobSpy site and convert its results"""
+    with metrics.stage('fetch'), upstream_guard.guarded(site_upstream(site)):
+        jobs_df = scrape_jobs(
+            site_name=[site],
+            search_term=search_term,
+            location=location,
+            results_wanted=results_wanted,
+            hours_old=168,  # Jobs posted in last week
+            country_indeed='USA'
+        )
+    metrics.count_parsed(len(jobs_df))
+    return convert_jobspy_to_app_format(jobs_df)
+
+def finalize_jobs(jobs, source_status):
+    """Build the search response payload from per-site results"""
+    # The same posting often comes back from several sites
+    jobs = dedupe_jobs(jobs)
+    if not jobs:
+        return {
+            "jobs": [],
+            "total": 0,
+            "message": "No jobs found for the given criteria",
+            "sources": source_status
+        }
     
-    found_skills = []
-    for skill in tech_skills:
-        if skill in description:
-            found_skills.append(skill.title())
+    # Stored jobs may carry scores from an older scrape; rank the merged list in one batch
+    score_jobs(jobs)
+    jobs.sort(key=lambda x: x.get('relevanceScore', 0), reverse=True)
     
-    return found_skills[:8]  # Limit to 8 skills
+    # Held column-wise for as long as the payload is cached; rows become dicts
+    # again only for the responses that include them
+    return {
+        "jobs": JobTable.from_jobs(jobs),
+        "total": len(jobs),
+        "message": f"Found {len(jobs)} jobs",
+        "sources": source_status
+    }
 
-def extract_tags(row):
-    """Extract tags from job data"""
-    tags = []
+def warm_search(search_term, location, results_wanted):
+    """Crawler hook: scrape a popular search live into the job store and result cache"""
+    payload = collect_jobs(search_term, location, results_wanted, live=True)
+    if payload["total"] > 0:
+        search_cache.put(make_search_key(search_term, location, results_wanted), payload)
+
+# One JobSpy scrape per site
+crawler = start_crawler(warm_search, request_cost=len(SITES))
+lazy_imports.warm_up()
+
+def search_query(args):
+    """(search_term, location, results_wanted) of a search request, with location shorthands resolved"""
+    search_term = args.get('search', 'frontend developer')
+    location = args.get('location', 'Nashville, TN')
+    results_wanted = int(args.get('limit', 20))
     
-    # Add job type tags
-    if is_remote_job(row):
-        tags.append('Remote')
-    
-    # Add experience level tags
-    title = str(row.get('title', '')).lower()
-    if 'senior' in title:
-        tags.append('Senior')
-    elif 'junior' in title or 'entry' in title:
-        tags.append('Junior')
-    elif 'mid' in title or 'intermediate' in title:
-        tags.append('Mid-Level')
-    
-    # Add job type
-    if 'full-time' in str(row.get('job_type', '')).lower():
-        tags.append('Full-Time')
-    elif 'part-time' in str(row.get('job_type', '')).lower():
-        tags.append('Part-Time')
-    elif 'contract' in str(row.get('job_type', '')).lower():
-        tags.append('Contract')
+    # Handle location parameter
+    if location == 'remote':
+        location = 'Remote'
+    elif location == 'nashville':
+        location = 'Nashville, TN'
+    elif location == 'both':
+        location = 'Nashville, TN'  # We'll search Nashville and filter for remote later
     
-    return tags
+    return search_term, location, results_wanted
+
+def has_jobs(payload):
+    """Only searches that found something, with every source run, are cached"""
+    return payload["total"] > 0 and all_sources_ran(payload["sources"])
+
+def search_plan(args):
+    """(cache key, compute, should_cache) of a plain search request, or None for paged and streamed ones
+
+    Lets asgi.py run the search before the view does.
+    """
+    if args.get('cursor') or wants_stream(args):
+        return None
+    search_term, location, results_wanted = search_query(args)
+    compute = lambda: collect_jobs(search_term, location, results_wanted)
+    return make_search_key(search_term, location, results_wanted), compute, has_jobs
 
 @app.route('/api/jobs/search', methods=['GET'])
 def search_jobs():
     """Search for jobs using JobSpy"""
     try:
         # Get query parameters
-        search_term = request.args.get('search', 'frontend developer')
-        location = request.args.get('location', 'Nashville, TN')
-        results_wanted = int(request.args.get('limit', 20))
+        search_term, location, results_wanted = search_query(request.args)
         
-        # Handle location parameter
-        if location == 'remote':
-            location = 'Remote'
-        elif location == 'nashville':
-            location = 'Nashville, TN'
-        elif location == 'both':
-            location = 'Nashville, TN'  # We'll search Nashville and filter for remote later
+        # Later pages come from the first page's snapshot, never from upstreams
+        cursor = request.args.get('cursor')
+        if cursor:
+            return cursor_response(cursor, results_wanted)
         
         print(f"Searching for: {search_term} in {location}")
+        job_store.record_query(search_term, location, results_wanted)
         
-        # Search multiple job sites
-        sites = ["indeed", "linkedin", "glassdoor"]
+        cache_key = make_search_key(search_term, location, results_wanted)
+        keep = salary_filter(*salary_bounds(request.args))
+        weights = parse_weights(request.args)
+        compute = lambda: collect_jobs(search_term, location, results_wanted)
         
-        # Scrape jobs
-        jobs_df = scrape_jobs(
-            site_name=sites,
-            search_term=search_term,
-            location=location,
-            results_wanted=results_wanted,
-            hours_old=168,  # Jobs posted in last week
-            country_indeed='USA'
-        )
+        if wants_stream(request.args):
+            payload, cache_state = search_cache.lookup(cache_key, compute, should_cache=has_jobs)
+            if payload is None and search_cache.pending(cache_key) is not None:
+                # The same search is already scraping for another request; wait for it rather than repeat it
+                payload, cache_state = search_cache.compute_missed(cache_key, compute, should_cache=has_jobs)
+            g.cache_state = cache_state
+            if payload is not None:
+                return ndjson_response(stream_cached_payload(payload, cache_state, keep=keep))
+            
+            def store(payload):
+                if has_jobs(payload):
+                    search_cache.put(cache_key, payload)
+            
+            # Stream each site as soon as its own JobSpy scrape finishes
+            # Stored matches go out first; each site follows and tops up the store
+            sources = [("Store", job_store.search, (search_term, location, results_wanted))] + [
+                (site.title(), job_store.ingesting(scrape_site_jobs), (site, search_term, location, results_wanted))
+                for site in SITES
+            ]
+            return ndjson_response(stream_live_search(sources, finalize_jobs, on_complete=store, keep=keep))
         
-        if jobs_df.empty:
-            return jsonify({
-                "jobs": [],
-                "total": 0,
-                "message": "No jobs found for the given criteria"
-            })
+        payload, cache_state = cached_search(cache_key, compute, should_cache=has_jobs)
+        g.cache_state = cache_state
         
-        # Convert to our app format
-        jobs = convert_jobspy_to_app_format(jobs_df)
+        # Salary filters and custom weights run on the cached payload, so they all share one cache entry
+        cached = payload
+        payload = rerank_payload(filter_payload(cached, keep), weights)
+        # First pages of the same cached payload, filtered and weighted alike, share one snapshot
+        variant = (getattr(keep, 'bounds', None), tuple(sorted(weights.items())) if weights else None)
         
-        return jsonify({
-            "jobs": jobs,
-            "total": len(jobs),
-            "message": f"Found {len(jobs)} jobs"
-        })
+        # Re-polls of an unchanged first page get a 304 before a snapshot or body is made
+        return conditional_page(
+            page_etag(payload, 0, results_wanted),
+            lambda: snapshot_store.first_page(payload, results_wanted, source=cached, variant=variant, cache=cache_state),
+            snapshots=snapshot_store
+        )
         
     except Exception as e:
         print(f"Error searching jobs: {str(e)}")
+        metrics.REQUEST_ERRORS.inc('/api/jobs/search')
         return jsonify({
             "error": str(e),
             "jobs": [],
@@ -225,9 +437,22 @@ def health_check():
     """Health check endpoint"""
     return jsonify({
         "status": "healthy",
-        "message": "JobSpy backend is running"
+        "message": "JobSpy backend is running",
+        "cache": search_cache.stats(),
+        "store": job_store.stats(),
+        "crawler": crawler.stats(),
+        "snapshots": snapshot_store.stats(),
+        "scoring": scorer.stats(),
+        "json": json_fragments.stats(),
+        "upstreams": upstream_guard.stats(),
+        "imports": lazy_imports.stats()
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""
+ASGI entry point: searches wait on upstreams in the event loop, not in worker threads
+Every request is still answered by the Flask app (via a2wsgi); a search is
+run first by async_search and handed to the view finished, so the WSGI
+threads only ever do quick work and /api/health stays responsive.
+
+  uvicorn asgi:app --host 0.0.0.0 --port 5000                   # fallback_app
+  APP_MODULE=app uvicorn asgi:app --host 0.0.0.0 --port 5000    # JobSpy app
+"""
+
+import importlib
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from async_search import mark_started, prefetch_search
+
+SEARCH_PATH = '/api/jobs/search'
+
+module = importlib.import_module(os.environ.get('APP_MODULE', 'fallback_app'))
+wsgi_app = WSGIMiddleware(module.app, workers=int(os.environ.get('ASGI_WSGI_WORKERS', 10)))
+
+async def app(scope, receive, send):
+    if scope["type"] == "http":
+        mark_started(scope)
+        if scope["path"] == SEARCH_PATH:
+            await prefetch_search(scope, module.search_plan)
+    await wsgi_app(scope, receive, send)
@@ -0,0 +1,82 @@
+"""
+Asyncio serving for /api/jobs/search under the ASGI entry point (asgi.py)
+A search that misses the cache is computed on a bounded pool and awaited by
+the request's coroutine, so a request waiting on slow upstreams holds no
+worker thread. The finished result is handed to the Flask view through the
+ASGI scope, and the view only has to build the response from it.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+from werkzeug.datastructures import MultiDict
+
+from result_cache import search_cache
+
+# ASGI scope keys; a2wsgi exposes the scope to Flask as environ['asgi.scope']
+STARTED_KEY = 'jobseek.started'
+RESULT_KEY = 'jobseek.search'
+
+# Runs collect_jobs for cache misses. Requests never wait on this pool's
+# threads, only on the search cache's in-flight futures
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('ASYNC_SEARCH_WORKERS', 32)),
+    thread_name_prefix='async-search'
+)
+
+def query_args(scope):
+    """Query parameters of an ASGI request, as Flask would parse them"""
+    return MultiDict(parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True))
+
+def mark_started(scope):
+    """Remember when a request arrived, so its latency includes time spent before Flask"""
+    scope[STARTED_KEY] = time.perf_counter()
+
+async def prefetch_search(scope, plan):
+    """Run the search an ASGI request asks for without tying up a thread while it waits
+
+    plan(args) returns (cache key, compute, should_cache) for a search, or
+    None for requests the view serves some other way (cursor pages, streams).
+    Cache hits and stale entries are looked up here; misses are awaited.
+    """
+    planned = plan(query_args(scope))
+    if planned is None:
+        return
+
+    key, compute, should_cache = planned
+    payload, state = search_cache.lookup(key, compute, should_cache)
+    if payload is None:
+        # Identical searches already in flight, on any thread, are joined rather than repeated
+        future, leader = search_cache.join_flight(key)
+        state = "coalesced"
+        # Shielded so a client hanging up can't cancel a search others wait on
+        if leader:
+            state = await asyncio.shield(asyncio.wrap_future(
+                _executor.submit(search_cache.run_flight, key, future, compute, should_cache)
+            ))
+        try:
+            payload = await asyncio.shield(asyncio.wrap_future(future))
+        except Exception as e:
+            # Re-raised in the view, which turns it into its usual error response
+            scope[RESULT_KEY] = e
+            return
+    scope[RESULT_KEY] = (payload, state)
+
+def cached_search(key, compute, should_cache=None):
+    """(payload, cache state) for the current Flask request's search
+
+    Uses the result prefetch_search handed over when running under asgi.py,
+    otherwise the search cache, computing inline on a miss.
+    """
+    from flask import request
+
+    scope = request.environ.get('asgi.scope')
+    handed = scope.get(RESULT_KEY) if scope else None
+    if isinstance(handed, Exception):
+        raise handed
+    if handed is not None:
+        return handed
+    return search_cache.get_or_compute(key, compute, should_cache=should_cache)
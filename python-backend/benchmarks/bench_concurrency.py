@@ -0,0 +1,187 @@
+"""
+Concurrent-request throughput: sync workers (gunicorn) vs the ASGI entry point (uvicorn)
+Each mode serves the app in a subprocess with every upstream on the local
+stub server. Many clients then send a mix of searches that miss the cache
+(slow, live scrapes), searches that hit it and /api/health probes at once,
+and the latency of each kind is reported along with overall requests/s
+
+Usage:
+  python benchmarks/bench_concurrency.py [--latency-ms 1000] [--concurrency 100] [--requests 400]
+                                         [--miss-ratio 0.1] [--health-ratio 0.1] [--sync-workers 2]
+                                         [--source-workers N] [--modes sync,async] [--app fallback_app]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from stub_server import StubServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+
+POPULAR = '/api/jobs/search?search=react+developer&location=nashville&limit=20'
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def server_command(mode, app_module, port, sync_workers):
+    if mode == 'sync':
+        return [sys.executable, '-m', 'gunicorn', '-w', str(sync_workers), '-b', f'127.0.0.1:{port}',
+                '--timeout', '120', f'{app_module}:app']
+    return [sys.executable, '-m', 'uvicorn', 'asgi:app', '--host', '127.0.0.1', '--port', str(port),
+            '--log-level', 'warning']
+
+def server_env(stub_url, app_module, source_workers=None):
+    env = dict(os.environ)
+    if source_workers:
+        env['SOURCE_WORKERS'] = str(source_workers)
+    # The stub serves every site from one host; don't let the upstream guard throttle or skip it
+    env.setdefault('UPSTREAM_RATE', '0')
+    env.setdefault('UPSTREAM_FAILURE_THRESHOLD', '0')
+    env.update({
+        'APP_MODULE': app_module,
+        'JOB_STORE_PATH': ':memory:',
+        'CRAWLER_ENABLED': '0',
+        'INDEED_RSS_URL': f'{stub_url}/indeed/rss',
+        'LINKEDIN_RSS_URL': f'{stub_url}/linkedin/feed',
+        'LINKEDIN_SEARCH_URL': f'{stub_url}/linkedin/search',
+        'REMOTEOK_API_URL': f'{stub_url}/remoteok/api',
+    })
+    return env
+
+async def get(port, path, timeout):
+    """(status, seconds) of one GET over a fresh connection; status 0 when it failed or timed out"""
+    started = time.perf_counter()
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), timeout)
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n'.encode('ascii'))
+        remaining = timeout - (time.perf_counter() - started)
+        response = await asyncio.wait_for(reader.read(), max(remaining, 0.001))
+        status = int(response.split(b' ', 2)[1]) if response else 0
+    except (asyncio.TimeoutError, OSError, ValueError, IndexError):
+        status = 0
+    finally:
+        if writer is not None:
+            writer.close()
+    return status, time.perf_counter() - started
+
+async def wait_until_up(port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status, _ = await get(port, '/api/health', 5)
+        if status == 200:
+            return True
+        await asyncio.sleep(0.2)
+    return False
+
+def workload(args, seed=1):
+    """Request paths in send order: unique searches (cache misses), the popular search (hits) and health probes"""
+    rng = random.Random(seed)
+    requests = []
+    for i in range(args.requests):
+        roll = rng.random()
+        if roll < args.miss_ratio:
+            # A term nothing stored matches, so the search scrapes live
+            requests.append(('miss', f'/api/jobs/search?search=zq{i}x&location=nashville&limit=20'))
+        elif roll < args.miss_ratio + args.health_ratio:
+            requests.append(('health', '/api/health'))
+        else:
+            requests.append(('hit', POPULAR))
+    return requests
+
+def summarize(samples, elapsed):
+    by_kind = {}
+    for kind, status, seconds in samples:
+        by_kind.setdefault(kind, []).append((status, seconds))
+
+    report = {
+        "requests": len(samples),
+        "elapsedS": round(elapsed, 3),
+        "throughputRps": round(len(samples) / elapsed, 2) if elapsed else None,
+        "failed": sum(1 for _, status, _ in samples if status != 200),
+    }
+    for kind, results in sorted(by_kind.items()):
+        timings = sorted(seconds * 1000 for _, seconds in results)
+        report[kind] = {
+            "count": len(results),
+            "failed": sum(1 for status, _ in results if status != 200),
+            "p50Ms": round(statistics.median(timings), 1),
+            "p95Ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 1),
+            "maxMs": round(timings[-1], 1),
+        }
+    return report
+
+async def drive(port, requests, concurrency, timeout):
+    """Send every request with at most concurrency in flight; returns (samples, elapsed seconds)"""
+    queue = list(reversed(requests))
+    samples = []
+
+    async def client():
+        while queue:
+            kind, path = queue.pop()
+            status, seconds = await get(port, path, timeout)
+            samples.append((kind, status, seconds))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+async def bench_mode(mode, args, stub_url):
+    port = free_port()
+    process = subprocess.Popen(
+        server_command(mode, args.app, port, args.sync_workers),
+        cwd=BACKEND_DIR, env=server_env(stub_url, args.app, args.source_workers),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        if not await wait_until_up(port):
+            return {"skipped": f"{mode} server did not start (is {'gunicorn' if mode == 'sync' else 'uvicorn'} installed?)"}
+
+        # Cache the popular search in every worker that answers it
+        for _ in range(args.sync_workers * 4 if mode == 'sync' else 1):
+            await get(port, POPULAR, args.timeout)
+
+        samples, elapsed = await drive(port, workload(args), args.concurrency, args.timeout)
+        return summarize(samples, elapsed)
+    finally:
+        process.terminate()
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--latency-ms', type=float, default=1000, help="stub upstream latency")
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--miss-ratio', type=float, default=0.1)
+    parser.add_argument('--health-ratio', type=float, default=0.1)
+    parser.add_argument('--sync-workers', type=int, default=2, help="gunicorn sync workers")
+    parser.add_argument('--source-workers', type=int, help="SOURCE_WORKERS for the app (default: the app's own)")
+    parser.add_argument('--timeout', type=float, default=60, help="per-request client timeout in seconds")
+    parser.add_argument('--modes', default='sync,async')
+    parser.add_argument('--app', default='fallback_app', help="fallback_app or app")
+    args = parser.parse_args()
+
+    results = {}
+    with StubServer(latency_ms=args.latency_ms, seed=1) as stub:
+        for mode in args.modes.split(','):
+            print(f"Running {mode}...", file=sys.stderr)
+            results[mode] = asyncio.run(bench_mode(mode, args, stub.url))
+
+    print(json.dumps({"config": vars(args), "results": results}, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark LinkedIn search page extraction: lxml partial parse vs BeautifulSoup
+Runs offline against saved search pages (benchmarks/fixtures/linkedin_search.html
+by default) and checks both paths extract the same cards
+
+Usage: python benchmarks/bench_linkedin_parse.py [--repeat N] [page.html ...]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_scraper import extract_linkedin_cards, extract_linkedin_cards_bs4
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+CHUNK_SIZE = 16384
+
+def chunked(content):
+    """Split a saved page the way response.iter_content would deliver it"""
+    return (content[i:i + CHUNK_SIZE] for i in range(0, len(content), CHUNK_SIZE))
+
+def time_call(fn, repeat):
+    """Median wall time of fn() in milliseconds, plus its last result"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('pages', nargs='*', default=[os.path.join(FIXTURES, 'linkedin_search.html')])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    for page in args.pages:
+        with open(page, 'rb') as f:
+            content = f.read()
+
+        print(f"{os.path.basename(page)} ({len(content) / 1024:.0f} KB)")
+        for limit in (5, 25, 1000):
+            bs4_ms, bs4_cards = time_call(lambda: extract_linkedin_cards_bs4(content, limit), args.repeat)
+            lxml_ms, lxml_cards = time_call(lambda: extract_linkedin_cards(chunked(content), limit), args.repeat)
+
+            same = "same cards" if bs4_cards == lxml_cards else "CARDS DIFFER"
+            print(f"  limit={limit:<5} bs4 {bs4_ms:8.2f} ms   lxml {lxml_ms:7.2f} ms   "
+                  f"{bs4_ms / lxml_ms:5.1f}x   {len(lxml_cards)} cards, {same}")
+
+if __name__ == '__main__':
+    main()
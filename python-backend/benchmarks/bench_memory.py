@@ -0,0 +1,103 @@
+"""
+Memory held by a cached result set: job dicts vs a job_table.JobTable
+Builds 10k and 100k jobs from the JobSpy fixture, each parsed from its own
+JSON so strings aren't shared the way they wouldn't be after a real scrape,
+and reports the traced allocation size of both forms, how long the table
+takes to build and a salary filter over each form. The table is measured
+fresh and after one full serve, once every row's JSON is cached.
+
+Usage: python benchmarks/bench_memory.py [--sizes 10000,100000] [--repeat 5]
+"""
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+os.environ.setdefault('JOB_STORE_PATH', ':memory:')
+os.environ.setdefault('CRAWLER_ENABLED', '0')
+
+from job_table import JobTable
+from salary import salary_filter
+
+def fixture_jobs():
+    """Frontend-shaped jobs converted from the saved JobSpy frame, encoded as JSON"""
+    import pandas as pd
+    import app
+    with open(os.path.join(BENCH_DIR, 'fixtures', 'jobspy_jobs.json'), 'rb') as f:
+        frame = pd.DataFrame(json.loads(f.read()))
+    return [json.dumps(job) for job in app.convert_jobspy_to_app_format(frame)]
+
+def make_jobs(templates, size):
+    jobs = []
+    for i in range(size):
+        job = json.loads(templates[i % len(templates)])
+        job["id"] = f"bench-{i}"
+        jobs.append(job)
+    return jobs
+
+def served(table):
+    """The table after one response has encoded every row, as a cached result is held"""
+    table.fragments()
+    return table
+
+def traced(build):
+    """(result of build(), bytes it still holds once built)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+def time_call(fn, repeat):
+    """Median wall time of fn() in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    templates = fixture_jobs()
+    keep = salary_filter(80000, None)
+
+    for size in [int(size) for size in args.sizes.split(',')]:
+        # An untraced round first, so one-off allocations (interned strings,
+        # NumPy and JSON encoder caches) aren't charged to the first form measured
+        served(JobTable.from_jobs(make_jobs(templates, size)))
+
+        jobs, dict_bytes = traced(lambda: make_jobs(templates, size))
+        _, fresh_bytes = traced(lambda: JobTable.from_jobs(make_jobs(templates, size)))
+        table, table_bytes = traced(lambda: served(JobTable.from_jobs(make_jobs(templates, size))))
+        same = "same jobs" if list(table) == jobs else "JOBS DIFFER"
+
+        build_ms = time_call(lambda: JobTable.from_jobs(jobs), args.repeat)
+        dict_filter_ms = time_call(lambda: [job for job in jobs if keep(job)], args.repeat)
+        table_filter_ms = time_call(lambda: table.select(keep), args.repeat)
+
+        print(f"{size} jobs, {same}")
+        print(f"  dicts {dict_bytes / 2**20:8.1f} MB ({dict_bytes / size:5.0f} B/job)   "
+              f"table {fresh_bytes / 2**20:8.1f} MB fresh, {table_bytes / 2**20:8.1f} MB served "
+              f"({table_bytes / size:5.0f} B/job)   {1 - table_bytes / dict_bytes:4.0%} smaller once served")
+        print(f"  table build {build_ms:8.1f} ms   salary filter: dicts {dict_filter_ms:7.1f} ms, "
+              f"table {table_filter_ms:6.2f} ms")
+        del jobs, table
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Cold-start cost of both entry points: import time and time to first healthy response
+For each app module, reports the heaviest imports as `python -X importtime`
+sees them, then repeatedly starts the app in a fresh process and times how
+long it takes until /api/health answers 200. For fallback_app, whose
+sources all run against the local stub server, the first search after
+that is timed too (app.py's first search would go to the real JobSpy sites).
+
+Usage:
+  python benchmarks/bench_startup.py [--apps fallback_app,app] [--repeat 5] [--top 12]
+                                     [--warm 1,0] [--output startup.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from bench_concurrency import BACKEND_DIR, free_port, server_env
+from stub_server import StubServer
+
+# Serves the module's app the way a worker would, as soon as it is imported
+LAUNCHER = (
+    "import importlib, sys\n"
+    "from werkzeug.serving import make_server\n"
+    "app = importlib.import_module(sys.argv[1]).app\n"
+    "make_server('127.0.0.1', int(sys.argv[2]), app, threaded=True).serve_forever()\n"
+)
+
+SEARCH = '/api/jobs/search?search=react+developer&location=nashville&limit=20'
+
+def import_report(module, env, top):
+    """(total import ms, heaviest direct imports as (name, cumulative ms)) from -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    total = None
+    children = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        ms = int(cumulative) / 1000
+        if not name.startswith('  '):
+            # A top-level import; the lines since the previous one were its children
+            if name.strip() == module:
+                total = ms
+                break
+            children = []
+        elif not name.startswith('    '):
+            children.append((name.strip(), ms))
+    children.sort(key=lambda child: child[1], reverse=True)
+    return total, children[:top]
+
+def get_status(port, path, timeout=30):
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}{path}', timeout=timeout) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return 0
+
+def start_once(module, env, search):
+    """(ms until /api/health returned 200, ms of the first search or None) for one fresh process"""
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', LAUNCHER, module, str(port)], cwd=BACKEND_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while get_status(port, '/api/health', timeout=5) != 200:
+            if process.poll() is not None:
+                raise RuntimeError(f"{module} exited with {process.returncode} before it was healthy")
+            time.sleep(0.005)
+        healthy_ms = (time.perf_counter() - started) * 1000
+
+        search_ms = None
+        if search:
+            started = time.perf_counter()
+            get_status(port, SEARCH)
+            search_ms = (time.perf_counter() - started) * 1000
+        return healthy_ms, search_ms
+    finally:
+        process.terminate()
+        process.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--apps', default='fallback_app,app')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=12, help='heaviest imports to list per app')
+    parser.add_argument('--warm', default='1,0', help='WARM_IMPORTS settings to compare')
+    parser.add_argument('--output', help='also write the results as JSON')
+    args = parser.parse_args()
+
+    results = {}
+    with StubServer() as server:
+        for module in args.apps.split(','):
+            env = server_env(server.url, module)
+            env['WARM_IMPORTS'] = '0'
+            total, heaviest = import_report(module, env, args.top)
+            print(f"{module}: import {total:.0f} ms")
+            for name, ms in heaviest:
+                print(f"  {ms:8.1f} ms  {name}")
+
+            results[module] = {"importMs": total, "heaviestImports": dict(heaviest)}
+            for warm in args.warm.split(','):
+                env['WARM_IMPORTS'] = warm
+                runs = [start_once(module, env, search=module == 'fallback_app') for _ in range(args.repeat)]
+                healthy = statistics.median(run[0] for run in runs)
+                line = f"  WARM_IMPORTS={warm}: first healthy response {healthy:7.0f} ms"
+                mode = {"firstHealthyMs": round(healthy, 1)}
+                if runs[0][1] is not None:
+                    first_search = statistics.median(run[1] for run in runs)
+                    line += f", then first search {first_search:7.0f} ms"
+                    mode["firstSearchMs"] = round(first_search, 1)
+                print(line)
+                results[module][f"warm{warm}"] = mode
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
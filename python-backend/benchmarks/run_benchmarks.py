@@ -0,0 +1,401 @@
+"""
+Offline benchmark suite for the scrapers and both Flask apps
+Every upstream is replaced by the local stub server, and each stage (fetch,
+parse, convert, score, serialize, plus end-to-end) is timed separately.
+Results are written as JSON so runs from different commits can be compared.
+
+Usage:
+  python benchmarks/run_benchmarks.py [--repeat 10] [--latency-ms 0] [--error-rate 0]
+                                      [--only indeed_scraper,...] [--output results.json]
+  python benchmarks/run_benchmarks.py --compare baseline.json [--threshold 10]
+"""
+
+import argparse
+import copy
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Keep benchmark runs out of the real job store, without a crawler scraping behind them
+os.environ.setdefault('JOB_STORE_PATH', ':memory:')
+os.environ.setdefault('CRAWLER_ENABLED', '0')
+# The stub serves every site from one host; don't let the upstream guard throttle or skip it
+os.environ.setdefault('UPSTREAM_RATE', '0')
+os.environ.setdefault('UPSTREAM_FAILURE_THRESHOLD', '0')
+
+from stub_server import StubServer, FIXTURES
+
+SEARCH_TERM = 'react developer'
+LOCATION = 'Nashville, TN'
+LIMIT = 20
+
+def measure(fn, repeat, setup=None):
+    """Time fn over repeat runs; setup() runs untimed before each and its result is passed in"""
+    timings = []
+    errors = 0
+    items = None
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        started = time.perf_counter()
+        try:
+            result = fn(arg) if setup else fn()
+        except Exception:
+            errors += 1
+            continue
+        finally:
+            timings.append((time.perf_counter() - started) * 1000)
+        if hasattr(result, '__len__'):
+            items = len(result)
+
+    ordered = sorted(timings)
+    return {
+        "runs": repeat,
+        "errors": errors,
+        "items": items,
+        "medianMs": round(statistics.median(ordered), 3),
+        "meanMs": round(statistics.fmean(ordered), 3),
+        "p95Ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "minMs": round(ordered[0], 3),
+    }
+
+def fetch_bytes(url):
+    """Fetch a stub URL through the shared scraper HTTP client"""
+    import http_client
+    response = http_client.get(url, timeout=10)
+    response.raise_for_status()
+    return response.content
+
+def fixture_bytes(name):
+    """Recorded upstream body, for stages that should not depend on injected errors"""
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+def score_cold(jobs, repeat):
+    """Batch scoring with an empty feature cache, as for freshly scraped jobs"""
+    from scoring import RelevanceScorer, load_profile
+    profile = load_profile()
+    return measure(lambda scorer: scorer.score_jobs(jobs), repeat, setup=lambda: RelevanceScorer(profile))
+
+def bench_indeed(base, repeat):
+    import indeed_scraper
+    from rss_stream import iter_rss_elements
+
+    indeed_scraper.INDEED_RSS_URL = f"{base}/indeed/rss"
+    body = fixture_bytes('indeed_rss.xml')
+
+    # Detached copies of every item, so convert/score can run without re-parsing
+    items = [copy.deepcopy(item) for item in iter_rss_elements(io.BytesIO(body))]
+    jobs = [indeed_scraper.parse_indeed_item(item, LOCATION, SEARCH_TERM) for item in items]
+
+    return {
+        "fetch": measure(lambda: fetch_bytes(f"{base}/indeed/rss"), repeat),
+        "parse": measure(lambda: [item.findtext('title') for item in iter_rss_elements(io.BytesIO(body))], repeat),
+        "convert": measure(lambda: [indeed_scraper.parse_indeed_item(item, LOCATION, SEARCH_TERM) for item in items], repeat),
+        "score": score_cold(jobs, repeat),
+        "serialize": measure(lambda: json.dumps(jobs), repeat),
+        "endToEnd": measure(lambda: indeed_scraper.scrape_indeed_jobs(SEARCH_TERM, LOCATION, LIMIT), repeat),
+    }
+
+def bench_linkedin(base, repeat):
+    import linkedin_scraper
+
+    linkedin_scraper.LINKEDIN_RSS_URL = f"{base}/linkedin/feed"
+    linkedin_scraper.LINKEDIN_SEARCH_URL = f"{base}/linkedin/search"
+    body = fixture_bytes('linkedin_search.html')
+
+    def parse():
+        if linkedin_scraper.etree is not None:
+            return linkedin_scraper.extract_linkedin_cards([body], LIMIT)
+        return linkedin_scraper.extract_linkedin_cards_bs4(body, LIMIT)
+
+    cards = parse()
+    jobs = [linkedin_scraper.parse_linkedin_job_card(fields, SEARCH_TERM) for fields in cards]
+
+    return {
+        "fetch": measure(lambda: fetch_bytes(f"{base}/linkedin/search"), repeat),
+        "parse": measure(parse, repeat),
+        "convert": measure(lambda: [linkedin_scraper.parse_linkedin_job_card(fields, SEARCH_TERM) for fields in cards], repeat),
+        "score": score_cold(jobs, repeat),
+        "serialize": measure(lambda: json.dumps(jobs), repeat),
+        "endToEnd": measure(lambda: linkedin_scraper.scrape_linkedin_jobs(SEARCH_TERM, LOCATION, LIMIT), repeat),
+    }
+
+def bench_simple(base, repeat):
+    import remoteok_store
+    import simple_scraper
+
+    remoteok_store.REMOTEOK_API_URL = f"{base}/remoteok/api"
+    body = fixture_bytes('remoteok.json')
+
+    def parse():
+        postings = [item for item in json.loads(body)[1:] if isinstance(item, dict)]
+        return remoteok_store.build_index(postings)
+
+    postings = [item for item in json.loads(body)[1:] if isinstance(item, dict)]
+    store = remoteok_store.RemoteOKStore(fetch=lambda: postings)
+    store.refresh()
+    matches = store.search(SEARCH_TERM, LIMIT)
+    jobs = [simple_scraper.convert_remoteok_job(posting, SEARCH_TERM) for posting in matches]
+
+    # End-to-end runs against the process-wide store, as the app does
+    remoteok_store.remoteok_store.refresh()
+
+    return {
+        "fetch": measure(lambda: fetch_bytes(f"{base}/remoteok/api"), repeat),
+        "parse": measure(parse, repeat),
+        "search": measure(lambda: store.search(SEARCH_TERM, LIMIT), repeat),
+        "convert": measure(lambda: [simple_scraper.convert_remoteok_job(posting, SEARCH_TERM) for posting in matches], repeat),
+        "score": score_cold(jobs, repeat),
+        "serialize": measure(lambda: json.dumps(jobs), repeat),
+        "endToEnd": measure(lambda: simple_scraper.scrape_remoteok_jobs(SEARCH_TERM, LIMIT), repeat),
+    }
+
+def jobspy_frame(base):
+    """JobSpy-shaped DataFrame fetched from the stub, standing in for scrape_jobs()"""
+    import pandas as pd
+    return pd.DataFrame(json.loads(fetch_bytes(f"{base}/jobspy/jobs")))
+
+def bench_app_convert(base, repeat):
+    import pandas as pd
+    import app
+    from dedupe import dedupe_jobs
+
+    body = fixture_bytes('jobspy_jobs.json')
+    df = pd.DataFrame(json.loads(body))
+    jobs = app.convert_jobspy_to_app_format(df)
+
+    return {
+        "fetch": measure(lambda: fetch_bytes(f"{base}/jobspy/jobs"), repeat),
+        "parse": measure(lambda: pd.DataFrame(json.loads(body)), repeat),
+        # Batch scoring runs inside the conversion and is timed with it
+        "convert": measure(lambda: app.convert_jobspy_to_app_format(df), repeat),
+        "dedupe": measure(lambda: dedupe_jobs(jobs), repeat),
+        "serialize": measure(lambda: json.dumps(jobs), repeat),
+    }
+
+def bench_scoring(base, repeat, size=5000):
+    """Scoring a few thousand cached jobs: cold (text scanned) and re-ranked with custom weights"""
+    import pandas as pd
+    import app
+    from scoring import RelevanceScorer, load_profile
+
+    fixture = app.convert_jobspy_to_app_format(pd.DataFrame(json.loads(fixture_bytes('jobspy_jobs.json'))))
+    jobs = [dict(fixture[i % len(fixture)], id=f"bench-{i}") for i in range(size)]
+    profile = load_profile()
+    warm = RelevanceScorer(profile)
+    warm.score(jobs)
+    weights = {"skills": 0.2, "recency": 0.3}
+
+    return {
+        "cold": measure(lambda scorer: scorer.score(jobs), repeat, setup=lambda: RelevanceScorer(profile)),
+        "warm": measure(lambda: warm.score(jobs), repeat),
+        "rerank": measure(lambda: warm.rank(jobs, weights), repeat),
+    }
+
+def bench_serialization(base, repeat, size=1000):
+    """Encoding a search response of a thousand cached jobs: jsonify vs joining pre-encoded rows of a job table"""
+    import pandas as pd
+    import app
+    from flask import jsonify
+    from job_table import JobTable
+    from json_fragments import payload_bytes
+
+    fixture = app.convert_jobspy_to_app_format(pd.DataFrame(json.loads(fixture_bytes('jobspy_jobs.json'))))
+    jobs = [dict(fixture[i % len(fixture)], id=f"bench-{i}") for i in range(size)]
+    payload = {"jobs": jobs, "total": len(jobs), "message": f"Found {len(jobs)} jobs", "sources": [], "cache": "hit"}
+    cached = dict(payload, jobs=JobTable.from_jobs(jobs))
+    payload_bytes(cached)
+
+    def with_jsonify():
+        with app.app.app_context():
+            return jsonify(payload).get_data()
+
+    return {
+        "jsonify": measure(with_jsonify, repeat),
+        # Paid once per computed payload: building its table, then encoding each row the first time it's served
+        "table": measure(lambda: JobTable.from_jobs(jobs), repeat),
+        "encodeOnce": measure(lambda table: payload_bytes(dict(payload, jobs=table)), repeat,
+                              setup=lambda: JobTable.from_jobs(jobs)),
+        "fragments": measure(lambda: payload_bytes(cached), repeat),
+    }
+
+def bench_endpoint(module, repeat):
+    """/api/jobs/search cold (live scrape through the stub), 8 identical cold requests at once, from the job store, cached, and a cursor page"""
+    from result_cache import search_cache
+    from job_store import job_store
+
+    client = module.app.test_client()
+    url = f"/api/jobs/search?search={SEARCH_TERM}&location=nashville&limit={LIMIT}"
+
+    def request():
+        response = client.get(url)
+        return response.get_data()
+
+    def clear_all():
+        search_cache.clear()
+        job_store.clear()
+
+    cold = measure(lambda _: request(), repeat, setup=clear_all)
+
+    def burst(n=8):
+        # Identical cold searches at once; coalescing lets one of them do the scraping
+        threads = [threading.Thread(target=request) for _ in range(n)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return threads
+
+    cold_burst = measure(lambda _: burst(), repeat, setup=clear_all)
+    # The stub feeds hold fewer than LIMIT jobs matching every search word, so
+    # a store-only answer is measured at a page size the store can fill
+    stored_url = f"/api/jobs/search?search={SEARCH_TERM}&location=nashville&limit=5"
+    stored = measure(lambda _: client.get(stored_url).get_data(), repeat, setup=search_cache.clear)
+    request()
+    cached = measure(request, repeat)
+
+    # Page 2 of a 5-job page size, straight from the first page's snapshot
+    first = client.get(f"/api/jobs/search?search={SEARCH_TERM}&location=nashville&limit=5").get_json()
+    page_url = f"/api/jobs/search?limit=5&cursor={first['nextCursor']}"
+    next_page = measure(lambda: client.get(page_url).get_data(), repeat)
+    return {"cold": cold, "coldBurst": cold_burst, "stored": stored, "cached": cached, "nextPage": next_page}
+
+def bench_polling(base, repeat):
+    """Re-polling an unchanged cached search of 20 and 100 jobs: full body, gzipped, and If-None-Match (304)
+
+    items is the response size in bytes.
+    """
+    bench_indeed(base, 1)
+    bench_linkedin(base, 1)
+    bench_simple(base, 1)
+    import fallback_app
+
+    client = fallback_app.app.test_client()
+    results = {}
+    for limit in (20, 100):
+        url = f"/api/jobs/search?search={SEARCH_TERM}&location=nashville&limit={limit}"
+        etag = client.get(url).headers['ETag']
+
+        def poll(headers=None):
+            return client.get(url, headers=headers).get_data()
+
+        results[f"full{limit}"] = measure(poll, repeat)
+        results[f"gzip{limit}"] = measure(lambda: poll({'Accept-Encoding': 'gzip'}), repeat)
+        results[f"notModified{limit}"] = measure(lambda: poll({'If-None-Match': etag}), repeat)
+    return results
+
+def bench_fallback_endpoint(base, repeat):
+    bench_indeed(base, 1)
+    bench_linkedin(base, 1)
+    bench_simple(base, 1)
+    import fallback_app
+    return bench_endpoint(fallback_app, repeat)
+
+def bench_app_endpoint(base, repeat):
+    import app
+    app.scrape_jobs = lambda **kwargs: jobspy_frame(base)
+    return bench_endpoint(app, repeat)
+
+SUITES = {
+    "indeed_scraper": bench_indeed,
+    "linkedin_scraper": bench_linkedin,
+    "simple_scraper": bench_simple,
+    "app_convert": bench_app_convert,
+    "scoring": bench_scoring,
+    "serialization": bench_serialization,
+    "fallback_endpoint": bench_fallback_endpoint,
+    "polling": bench_polling,
+    "app_endpoint": bench_app_endpoint,
+}
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+def run(args):
+    selected = args.only.split(',') if args.only else list(SUITES)
+    results = {}
+
+    server = StubServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                        error_rate=args.error_rate, error_mode=args.error_mode, seed=1)
+    with server:
+        for name in selected:
+            print(f"Running {name}...", file=sys.stderr)
+            try:
+                results[name] = SUITES[name](server.url, args.repeat)
+            except ImportError as e:
+                results[name] = {"skipped": f"missing dependency: {e}"}
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "latencyMs": args.latency_ms,
+            "errorRate": args.error_rate,
+        },
+        "results": results,
+    }
+
+def compare(baseline, current, threshold, out=sys.stdout):
+    """Print per-stage median changes; returns True if any stage regressed past threshold %"""
+    regressed = False
+    print(f"{'suite.stage':<36} {'base ms':>10} {'new ms':>10} {'change':>8}", file=out)
+    for suite, stages in current["results"].items():
+        for stage, stats in stages.items():
+            old = baseline.get("results", {}).get(suite, {}).get(stage)
+            if not isinstance(stats, dict) or not isinstance(old, dict) or "medianMs" not in old:
+                continue
+            change = (stats["medianMs"] - old["medianMs"]) / old["medianMs"] * 100 if old["medianMs"] else 0.0
+            flag = "  REGRESSION" if change > threshold else ""
+            regressed = regressed or bool(flag)
+            print(f"{suite + '.' + stage:<36} {old['medianMs']:>10.3f} {stats['medianMs']:>10.3f} {change:>+7.1f}%{flag}", file=out)
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-mode', choices=['500', 'reset'], default='500')
+    parser.add_argument('--only', help=f"comma-separated subset of: {', '.join(SUITES)}")
+    parser.add_argument('--output', help="write results JSON here instead of stdout")
+    parser.add_argument('--compare', help="baseline results JSON to compare this run against")
+    parser.add_argument('--threshold', type=float, default=10.0, help="regression threshold in percent")
+    args = parser.parse_args()
+
+    # Scrapers log every step with print(), including from background refresh
+    # threads that outlive their suite; keep all of it out of the report
+    report_out = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+
+    report = run(args)
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(encoded + '\n')
+    elif not args.compare:
+        print(encoded, file=report_out)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, report, args.threshold, out=report_out):
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Local stub of the upstream job sites, serving recorded fixtures
+Supports injected latency and errors so benchmarks run without network access
+
+Usage: python benchmarks/stub_server.py [--port 8765] [--latency-ms 200] [--error-rate 0.1]
+"""
+
+import argparse
+import gzip
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Path -> (fixture file, content type); None serves a 404 like the real site
+ROUTES = {
+    '/indeed/rss': ('indeed_rss.xml', 'application/rss+xml; charset=utf-8'),
+    '/linkedin/feed': None,
+    '/linkedin/search': ('linkedin_search.html', 'text/html; charset=utf-8'),
+    '/remoteok/api': ('remoteok.json', 'application/json'),
+    '/jobspy/jobs': ('jobspy_jobs.json', 'application/json'),
+}
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    """Threaded server that ignores clients hanging up mid-connection"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+class StubServer:
+    """Threaded HTTP server for the fixtures, with latency and error injection
+
+    latency_ms (+/- jitter_ms) is slept before every response. error_rate is
+    the probability a request fails, either with a 500 (error_mode="500") or
+    by dropping the connection (error_mode="reset").
+    """
+
+    def __init__(self, port=0, latency_ms=0, jitter_ms=0, error_rate=0.0, error_mode='500', seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_mode = error_mode
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.bodies = {}
+        for path, route in ROUTES.items():
+            if route is None:
+                continue
+            with open(os.path.join(FIXTURES, route[0]), 'rb') as f:
+                raw = f.read()
+            self.bodies[path] = (raw, gzip.compress(raw), route[1])
+
+        self.httpd = QuietHTTPServer(('127.0.0.1', port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='stub-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; don't let Nagle hold the body back
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                stub.requests += 1
+                delay = stub.latency_ms + stub.random.uniform(-stub.jitter_ms, stub.jitter_ms)
+                if delay > 0:
+                    time.sleep(delay / 1000)
+
+                if stub.error_rate and stub.random.random() < stub.error_rate:
+                    if stub.error_mode == 'reset':
+                        self.close_connection = True
+                        self.connection.close()
+                        return
+                    return self._send(500, b'{"error": "injected"}', 'application/json')
+
+                body = stub.bodies.get(urlsplit(self.path).path)
+                if body is None:
+                    return self._send(404, b'Not Found', 'text/plain')
+
+                raw, compressed, content_type = body
+                if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    return self._send(200, compressed, content_type, encoding='gzip')
+                return self._send(200, raw, content_type)
+
+            def _send(self, status, body, content_type, encoding=None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                if encoding:
+                    self.send_header('Content-Encoding', encoding)
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Streaming clients hang up once they have enough items
+                    self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-mode', choices=['500', 'reset'], default='500')
+    args = parser.parse_args()
+
+    server = StubServer(args.port, args.latency_ms, args.jitter_ms, args.error_rate, args.error_mode)
+    print(f"Serving fixtures on {server.url}: {', '.join(ROUTES)}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Conditional GET (ETag / If-None-Match) and gzip for search responses
+A page's ETag hashes the version of every job on it (see json_fragments)
+with the page's totals, so a client re-polling a search whose page has not
+changed gets a 304 before the body is even built. Bodies that do go out are
+gzipped when the client accepts it.
+"""
+
+import gzip
+import hashlib
+import os
+
+from flask import Response, request
+
+from json_fragments import dumps, json_response, versions
+
+GZIP_MIN_BYTES = int(os.environ.get('GZIP_MIN_BYTES', 1024))
+GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', 4))  # most of level 6's savings for about half the CPU
+
+# The gzipped body is a different representation, so it gets its own strong ETag
+GZIP_SUFFIX = '-gz'
+
+# A page with a next cursor is tagged <page etag>.<snapshot id>
+SNAPSHOT_SEPARATOR = '.'
+
+# Fields that differ between responses with the same jobs: cache state,
+# per-scrape source timings and the cursor of each new snapshot
+VOLATILE_KEYS = ('jobs', 'sources', 'cache', 'nextCursor', 'snapshotExpiresAt')
+
+def page_etag(payload, offset, limit):
+    """Strong ETag of the page of payload starting at offset: job IDs and versions, in rank order, plus totals"""
+    jobs = payload.get("jobs", [])
+    meta = {key: value for key, value in payload.items() if key not in VOLATILE_KEYS}
+    meta.update(total=len(jobs), offset=offset, limit=limit)
+
+    hasher = hashlib.blake2b(dumps(meta), digest_size=16)
+    for version in versions(jobs[offset:offset + limit]):
+        hasher.update(version)
+    return hasher.hexdigest()
+
+def _held_tag(etag, snapshots):
+    """The tag (without GZIP_SUFFIX) the client holds for this page, or None
+
+    With snapshots, a tag naming a snapshot only counts while that snapshot
+    is alive, since the client's next cursor points into it.
+    """
+    for tag in request.if_none_match:
+        if tag.endswith(GZIP_SUFFIX):
+            tag = tag[:-len(GZIP_SUFFIX)]
+        if tag == etag:
+            return tag
+        prefix = etag + SNAPSHOT_SEPARATOR
+        if snapshots is not None and tag.startswith(prefix) and snapshots.alive(tag[len(prefix):]):
+            return tag
+    return None
+
+def not_modified(etag, snapshots=None):
+    """304 response when the request's If-None-Match already holds etag, otherwise None"""
+    tag = _held_tag(etag, snapshots)
+    if tag is None:
+        return None
+    response = Response(status=304)
+    response.set_etag(tag + GZIP_SUFFIX if accepts_gzip() else tag)
+    _revalidate(response)
+    return response
+
+def conditional_page(etag, build, snapshots=None):
+    """304 if the client has etag, otherwise build()'s page as JSON, tagged and gzipped when accepted
+
+    snapshots (a pagination.SnapshotStore) is given for first pages: a page
+    with a next cursor is then tagged with its snapshot, and stops being
+    revalidated once that snapshot expires, so a re-poll gets a fresh cursor.
+    """
+    response = not_modified(etag, snapshots)
+    if response is not None:
+        return response
+
+    page = build()
+    if snapshots is not None:
+        snapshot_id = snapshots.snapshot_of(page)
+        if snapshot_id is not None:
+            etag += SNAPSHOT_SEPARATOR + snapshot_id
+
+    response = json_response(page)
+    _revalidate(response)
+    if gzip_response(response):
+        etag += GZIP_SUFFIX
+    response.set_etag(etag)
+    return response
+
+def accepts_gzip():
+    return request.accept_encodings['gzip'] > 0
+
+def gzip_response(response):
+    """Compress a buffered response body in place if the client accepts gzip; True if it did"""
+    if response.is_streamed or response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return False
+    body = response.get_data()
+    if len(body) < GZIP_MIN_BYTES or not accepts_gzip():
+        return False
+    response.set_data(gzip.compress(body, GZIP_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    return True
+
+def _revalidate(response):
+    # Let browsers keep the body but check back every time, sending If-None-Match
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept-Encoding')
@@ -0,0 +1,133 @@
+"""
+Background crawler that keeps popular searches warm off the request path
+Every interval it re-scrapes the most requested (search, location, limit)
+queries, within an hourly upstream request budget, so user requests are
+answered from the job store and result cache instead of live scrapes
+
+Runs as a thread inside either app (CRAWLER_ENABLED, on by default) or as
+a sidecar sharing the app's job store:
+  python crawler.py fallback_app    (or: python crawler.py app)
+"""
+
+import importlib
+import os
+import sys
+import threading
+import time
+
+from job_store import job_store
+
+ENABLED = os.environ.get('CRAWLER_ENABLED', '1').lower() not in ('0', 'false', 'no', 'off')
+TOP_N = int(os.environ.get('CRAWLER_TOP_N', 10))
+INTERVAL = float(os.environ.get('CRAWLER_INTERVAL_SECONDS', 300))
+REQUEST_BUDGET = float(os.environ.get('CRAWLER_REQUEST_BUDGET', 120))  # upstream requests per hour
+START_DELAY = float(os.environ.get('CRAWLER_START_DELAY_SECONDS', 5))
+
+class Crawler:
+    """Re-scrapes the most popular stored queries on a schedule
+
+    warm(search, location, limit) scrapes one query live and writes the
+    result wherever it should be served from. request_cost is roughly how
+    many upstream requests one warm() call makes; each cycle may spend
+    REQUEST_BUDGET * interval / 1h of them, most popular queries first.
+    Queries scraped within the store's refresh interval, by a user request
+    or another worker, are skipped without spending budget.
+    """
+
+    def __init__(self, warm, request_cost, store=job_store, top_n=TOP_N,
+                 interval=INTERVAL, request_budget=REQUEST_BUDGET):
+        self.warm = warm
+        self.request_cost = request_cost
+        self.store = store
+        self.top_n = top_n
+        self.interval = interval
+        self.request_budget = request_budget
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self.cycles = 0
+        self.warmed = 0
+        self.skipped_fresh = 0
+        self.skipped_budget = 0
+        self.failures = 0
+        self.last_cycle = None
+
+    def crawl_once(self):
+        """Warm the top queries that are due, within this cycle's share of the budget"""
+        allowance = self.request_budget * self.interval / 3600
+        spent = 0
+        warmed = 0
+
+        for search_term, location, limit, popularity in self.store.popular_queries(self.top_n):
+            if spent + self.request_cost > allowance:
+                self.skipped_budget += 1
+                continue
+            if not self.store.claim_refresh(search_term, location, limit):
+                self.skipped_fresh += 1
+                continue
+
+            spent += self.request_cost
+            try:
+                self.warm(search_term, location, limit)
+                warmed += 1
+            except Exception as e:
+                self.failures += 1
+                print(f"Crawler failed to warm '{search_term}' in '{location}': {e}")
+
+        self.cycles += 1
+        self.warmed += warmed
+        self.last_cycle = {"at": time.time(), "warmed": warmed, "requestsSpent": spent, "allowance": allowance}
+        if warmed:
+            print(f"Crawler warmed {warmed} popular searches ({spent} upstream requests)")
+        return warmed
+
+    def start(self):
+        """Start the background crawl thread once per process"""
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self.run_forever, name='crawler', daemon=True)
+                self._worker.start()
+
+    def run_forever(self, start_delay=START_DELAY):
+        # Short delay so a freshly booted app can start serving first
+        time.sleep(start_delay)
+        while True:
+            try:
+                self.crawl_once()
+            except Exception as e:
+                print(f"Crawler cycle failed: {e}")
+            time.sleep(self.interval)
+
+    def stats(self):
+        """Counters for the health endpoint"""
+        return {
+            "running": self._worker is not None and self._worker.is_alive(),
+            "intervalSeconds": self.interval,
+            "topN": self.top_n,
+            "requestBudgetPerHour": self.request_budget,
+            "cycles": self.cycles,
+            "warmed": self.warmed,
+            "skippedFresh": self.skipped_fresh,
+            "skippedBudget": self.skipped_budget,
+            "failures": self.failures,
+            "lastCycle": self.last_cycle
+        }
+
+def start_crawler(warm, request_cost):
+    """Create the app's crawler, starting its thread unless CRAWLER_ENABLED is off"""
+    crawler = Crawler(warm, request_cost)
+    if ENABLED:
+        crawler.start()
+    return crawler
+
+def main():
+    """Sidecar: import an app without its own crawler thread and crawl for it"""
+    module_name = sys.argv[1] if len(sys.argv) > 1 else 'fallback_app'
+    # The app module imports crawler afresh and reads this
+    os.environ['CRAWLER_ENABLED'] = '0'
+
+    module = importlib.import_module(module_name)
+    print(f"Crawling for {module_name}: top {TOP_N} queries every {INTERVAL}s, {REQUEST_BUDGET} requests/hour")
+    module.crawler.run_forever(start_delay=0)
+
+if __name__ == '__main__':
+    main()
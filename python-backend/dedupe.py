@@ -0,0 +1,233 @@
+"""
+Cross-source near-duplicate detection for merged job lists
+The same posting scraped from several sites is clustered by normalized
+title + company, and by MinHash similarity of descriptions across all jobs
+(so slightly different company strings and scraper placeholders still
+match); only the richest record of each cluster is kept
+"""
+
+import re
+import zlib
+
+# One-permutation MinHash: every shingle hash lands in one of SIGNATURE_BINS
+# bins and each bin keeps its minimum, so a signature costs one hash per shingle
+SIGNATURE_BINS = 32
+BAND_ROWS = 4
+SHINGLE_WORDS = 3
+MIN_SHINGLES = 8
+
+DESCRIPTION_SIMILARITY = 0.7  # estimated Jaccard of description shingles
+TITLE_SIMILARITY = 0.5        # word Jaccard required alongside a description match
+SAME_COMPANY_TITLE_SIMILARITY = 0.8
+COMPANY_SIMILARITY = 0.5      # word Jaccard of two company names that aren't subsets of each other
+# Without a real company on one side, only the description can tell
+PLACEHOLDER_DESCRIPTION_SIMILARITY = 0.9
+# Larger LSH buckets are boilerplate shared by many postings, not one posting
+MAX_BUCKET_SIZE = 64
+
+COMPANY_SUFFIXES = {'inc', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company', 'plc', 'gmbh', 'the'}
+TITLE_NOISE = {'remote', 'hybrid', 'onsite', 'wfh', 'usa', 'us', 'fulltime', 'parttime', 'contract', 'contractor'}
+TITLE_ALIASES = {'sr': 'senior', 'jr': 'junior', 'eng': 'engineer', 'dev': 'developer'}
+
+# Scraper defaults that don't identify anything
+PLACEHOLDER_COMPANIES = {'', 'company', 'linkedin company', 'remote company', 'nan'}
+PLACEHOLDER_SALARIES = {'', 'salary not specified', 'competitive salary', 'nan'}
+
+_WORD = re.compile(r'[a-z0-9]+')
+_TAGS = re.compile(r'<[^>]+>')
+_PARENTHESES = re.compile(r'\([^)]*\)|\[[^\]]*\]')
+
+def normalize_title(title):
+    """Lowercased title words without parentheticals, work-mode noise or abbreviations"""
+    text = _PARENTHESES.sub(' ', str(title or '').lower()).replace('full-time', 'fulltime').replace('part-time', 'parttime')
+    words = [TITLE_ALIASES.get(word, word) for word in _WORD.findall(text)]
+    return ' '.join(word for word in words if word not in TITLE_NOISE)
+
+def normalize_company(company):
+    """Lowercased company words without legal suffixes; '' for scraper placeholders"""
+    text = str(company or '').lower().replace('&', ' and ')
+    if text.strip() in PLACEHOLDER_COMPANIES:
+        return ''
+    return ' '.join(word for word in _WORD.findall(text) if word not in COMPANY_SUFFIXES)
+
+def normalize_place(location):
+    """City part of a location, or None when remote or unknown (compatible with any place)"""
+    text = str(location or '').lower()
+    if 'remote' in text or text.strip() in ('', 'nan'):
+        return None
+    return ' '.join(_WORD.findall(text.split(',')[0])) or None
+
+def word_jaccard(a, b):
+    a = set(a.split())
+    b = set(b.split())
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def similar_companies(a, b):
+    """True when two normalized company names plausibly name the same employer
+
+    "acme health" and "acme health systems" match: one name's words are all
+    in the other's. Placeholders ('') never match here.
+    """
+    if not a or not b:
+        return False
+    if a == b:
+        return True
+    a_words = set(a.split())
+    b_words = set(b.split())
+    return a_words <= b_words or b_words <= a_words or word_jaccard(a, b) >= COMPANY_SIMILARITY
+
+def minhash_signature(text):
+    """One-permutation MinHash of a text's word shingles, or None if it is too short
+
+    Empty bins are None and are ignored when comparing signatures.
+    """
+    words = _WORD.findall(_TAGS.sub(' ', str(text or '').lower()))
+    if len(words) < SHINGLE_WORDS + MIN_SHINGLES - 1:
+        return None
+
+    signature = [None] * SIGNATURE_BINS
+    for i in range(len(words) - SHINGLE_WORDS + 1):
+        h = zlib.crc32(' '.join(words[i:i + SHINGLE_WORDS]).encode('utf-8'))
+        slot = h % SIGNATURE_BINS
+        value = h // SIGNATURE_BINS
+        if signature[slot] is None or value < signature[slot]:
+            signature[slot] = value
+    return signature
+
+def signature_similarity(a, b):
+    """Estimated Jaccard similarity of two signatures over bins filled in both"""
+    shared = [(x, y) for x, y in zip(a, b) if x is not None and y is not None]
+    if not shared:
+        return 0.0
+    return sum(1 for x, y in shared if x == y) / len(shared)
+
+def richness(job):
+    """How much real information a record carries, for picking a cluster's survivor"""
+    score = 0.0
+    if str(job.get("salary") or '').strip().lower() not in PLACEHOLDER_SALARIES:
+        score += 3
+    if job.get("url") and job.get("url") != '#':
+        score += 2
+    if normalize_company(job.get("company")):
+        score += 2
+    if job.get("postedDate"):
+        score += 1
+    score += min(len(job.get("description") or ''), 2000) / 500
+    score += len(job.get("requirements") or []) / 4
+    return score
+
+class _Clusters:
+    """Union-find over job positions that never joins two different places
+
+    Each cluster remembers the one concrete place (city) of its members, if
+    any, so a remote listing can't chain postings in two cities together.
+    """
+
+    def __init__(self, places):
+        self.parent = list(range(len(places)))
+        self.place = list(places)
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j, force=False):
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return
+        if not force and None not in (self.place[i], self.place[j]) and self.place[i] != self.place[j]:
+            return
+        # Lower position wins so each cluster sits where it first appeared
+        root, child = min(i, j), max(i, j)
+        self.parent[child] = root
+        if self.place[root] is None:
+            self.place[root] = self.place[child]
+
+def find_duplicate_clusters(jobs):
+    """Group positions of jobs that are the same posting; returns a list of clusters
+
+    Two jobs are the same posting when they share an ID, or when they are in
+    the same place (remote / unknown matches anywhere) and either the same
+    company lists the same or nearly the same normalized title, or their
+    descriptions are near-duplicates (MinHash LSH candidates over all jobs,
+    confirmed by estimated Jaccard) and either their companies are similar
+    and their titles overlap, or one company is a scraper placeholder and
+    the descriptions are nearly identical.
+    """
+    titles = [normalize_title(job.get("title")) for job in jobs]
+    companies = [normalize_company(job.get("company")) for job in jobs]
+    clusters = _Clusters([normalize_place(job.get("location")) for job in jobs])
+
+    by_id = {}
+    by_company = {}
+    for i, job in enumerate(jobs):
+        job_id = job.get("id")
+        if job_id is not None:
+            clusters.union(i, by_id.setdefault(job_id, i), force=True)
+        if companies[i]:
+            by_company.setdefault(companies[i], []).append(i)
+
+    # Same company, same or slightly reworded title
+    for members in by_company.values():
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                i, j = members[a], members[b]
+                if titles[i] == titles[j] or word_jaccard(titles[i], titles[j]) >= SAME_COMPANY_TITLE_SIMILARITY:
+                    clusters.union(i, j)
+
+    # Near-identical descriptions: LSH bands bucket candidate pairs across all
+    # jobs, whatever their company strings say
+    signatures = [minhash_signature(job.get("description")) for job in jobs]
+
+    buckets = {}
+    for i, signature in enumerate(signatures):
+        if signature is None:
+            continue
+        for band in range(0, SIGNATURE_BINS, BAND_ROWS):
+            rows = tuple(signature[band:band + BAND_ROWS])
+            if None in rows:
+                continue
+            buckets.setdefault((band, rows), []).append(i)
+
+    checked = set()
+    for members in buckets.values():
+        if len(members) > MAX_BUCKET_SIZE:
+            continue
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                i, j = members[a], members[b]
+                if (i, j) in checked or clusters.find(i) == clusters.find(j):
+                    continue
+                checked.add((i, j))
+                similarity = signature_similarity(signatures[i], signatures[j])
+                if similarity < DESCRIPTION_SIMILARITY:
+                    continue
+                if not companies[i] or not companies[j]:
+                    if similarity >= PLACEHOLDER_DESCRIPTION_SIMILARITY:
+                        clusters.union(i, j)
+                elif (similar_companies(companies[i], companies[j])
+                        and word_jaccard(titles[i], titles[j]) >= TITLE_SIMILARITY):
+                    clusters.union(i, j)
+
+    grouped = {}
+    for i in range(len(jobs)):
+        grouped.setdefault(clusters.find(i), []).append(i)
+    return [grouped[root] for root in sorted(grouped)]
+
+def dedupe_jobs(jobs):
+    """Keep the richest record of every duplicate cluster, in first-seen order"""
+    if len(jobs) < 2:
+        return list(jobs)
+
+    kept = []
+    for members in find_duplicate_clusters(jobs):
+        # max() keeps the earliest of equally rich records
+        kept.append(jobs[max(members, key=lambda i: (richness(jobs[i]), -i))])
+
+    if len(kept) < len(jobs):
+        print(f"Removed {len(jobs) - len(kept)} duplicate jobs")
+    return kept
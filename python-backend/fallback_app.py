@@ -3,129 +3,249 @@ Fallback Flask app for Python < 3.10
 Uses simple scraping instead of JobSpy
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
 import os
+import threading
 import traceback
 
-# Import with error handling
-try:
-    from simple_scraper import scrape_remoteok_jobs, generate_mock_jobs
-    print("✅ simple_scraper imported successfully")
-except Exception as e:
-    print(f"❌ Error importing simple_scraper: {e}")
-    def scrape_remoteok_jobs(*args, **kwargs): return []
-    def generate_mock_jobs(search_term="developer", location="Nashville", limit=20):
-        import uuid
-        from datetime import datetime, timedelta
-        import random
-        jobs = []
-        for i in range(limit):
-            jobs.append({
-                "id": str(uuid.uuid4()),
-                "title": f"{search_term.title()} Engineer",
-                "company": f"TechCorp {i+1}",
-                "location": location,
-                "salary": "$80,000 - $120,000",
-                "postedDate": (datetime.now() - timedelta(days=random.randint(1, 7))).isoformat(),
-                "source": "Mock API",
-                "description": f"Great {search_term} opportunity",
-                "requirements": ["React", "JavaScript", "Python"],
-                "isRemote": True,
-                "relevanceScore": 85,
-                "applicationStatus": "not_applied",
-                "tags": ["Remote", "Full-Time"],
-                "url": "#"
-            })
-        return jobs
-
-try:
-    from indeed_scraper import scrape_indeed_jobs
-    print("✅ indeed_scraper imported successfully")
-except Exception as e:
-    print(f"❌ Error importing indeed_scraper: {e}")
-    def scrape_indeed_jobs(*args, **kwargs): return []
-
-try:
-    from linkedin_scraper import scrape_linkedin_jobs
-    print("✅ linkedin_scraper imported successfully") 
-except Exception as e:
-    print(f"❌ Error importing linkedin_scraper: {e}")
-    def scrape_linkedin_jobs(*args, **kwargs): return []
+from aggregator import all_sources_ran, gather_sources
+from result_cache import search_cache, make_search_key
+from remoteok_store import remoteok_store
+from job_store import job_store
+from dedupe import dedupe_jobs
+from crawler import start_crawler
+from pagination import snapshot_store, cursor_response
+from salary import salary_bounds, salary_filter, filter_payload
+from scoring import scorer, score_jobs, parse_weights, rerank_payload
+from async_search import cached_search
+from job_table import JobTable
+from conditional import conditional_page, page_etag
+from search_stream import wants_stream, stream_live_search, stream_cached_payload, ndjson_response
+import http_client
+import upstream_guard
+import json_fragments
+import lazy_imports
+import metrics
+
+def no_jobs(*args, **kwargs):
+    return []
+
+def mock_jobs_fallback(search_term="developer", location="Nashville", limit=20):
+    """Stand-in for simple_scraper.generate_mock_jobs when it can't be imported"""
+    import uuid
+    from datetime import datetime, timedelta
+    import random
+    jobs = []
+    for i in range(limit):
+        jobs.append({
+            "id": str(uuid.uuid4()),
+            "title": f"{search_term.title()} Engineer",
+            "company": f"TechCorp {i+1}",
+            "location": location,
+            "salary": "$80,000 - $120,000",
+            "postedDate": (datetime.now() - timedelta(days=random.randint(1, 7))).isoformat(),
+            "source": "Mock API",
+            "description": f"Great {search_term} opportunity",
+            "requirements": ["React", "JavaScript", "Python"],
+            "isRemote": True,
+            "relevanceScore": 85,
+            "applicationStatus": "not_applied",
+            "tags": ["Remote", "Full-Time"],
+            "url": "#"
+        })
+    return jobs
+
+# Job sources are imported on first use (bs4, lxml and the scrapers aren't
+# needed to answer a health check), falling back to no jobs if they fail to import
+scrape_remoteok_jobs = lazy_imports.function('simple_scraper', 'scrape_remoteok_jobs', fallback=no_jobs)
+generate_mock_jobs = lazy_imports.function('simple_scraper', 'generate_mock_jobs', fallback=mock_jobs_fallback)
+scrape_indeed_jobs = lazy_imports.function('indeed_scraper', 'scrape_indeed_jobs', fallback=no_jobs)
+scrape_linkedin_jobs = lazy_imports.function('linkedin_scraper', 'scrape_linkedin_jobs', fallback=no_jobs)
 
 app = Flask(__name__)
 CORS(app)
+metrics.instrument_app(app)
+
+def job_sources(search_term, location, results_wanted):
+    """Real job sources for a search as (name, scraper, args)
+
+    Every scraper's results are upserted into the local job store as they
+    arrive, including sources that finish after the search deadline.
+    """
+    per_source = max(1, results_wanted // 3)
+    return [
+        ("Indeed", job_store.ingesting(scrape_indeed_jobs), (search_term, location, per_source)),
+        ("LinkedIn", job_store.ingesting(scrape_linkedin_jobs), (search_term, location, per_source)),
+        ("RemoteOK", job_store.ingesting(scrape_remoteok_jobs), (search_term, results_wanted)),
+    ]
+
+def collect_jobs(search_term, location, results_wanted, live=False):
+    """Answer from the local job store, scraping live only to top it up
+
+    live=True always scrapes, as the crawler does when re-warming a query.
+    """
+    # Over-fetch so near-duplicates don't leave the stored answer short. Only
+    # jobs matching every word count here: "rust developer" isn't answered by
+    # stored "developer" jobs
+    stored, store_status = job_store.search_with_status(search_term, location, results_wanted * 2, all_words=True)
+    stored = dedupe_jobs(stored)
+    
+    if len(stored) >= results_wanted and not live:
+        # Enough stored matches: answer now and refresh the index off the request path
+        print(f"Found {len(stored)} stored jobs")
+        if job_store.claim_refresh(search_term, location, results_wanted):
+            threading.Thread(
+                target=gather_sources,
+                args=(job_sources(search_term, location, results_wanted),),
+                daemon=True
+            ).start()
+        return finalize_jobs(stored, [store_status], search_term, location, results_wanted)
+    
+    job_store.claim_refresh(search_term, location, results_wanted)
+    # Partial matches still top up the live results
+    stored, store_status = job_store.search_with_status(search_term, location, results_wanted * 2)
+    stored = dedupe_jobs(stored)
+    
+    # Fetch every real job source at once, bounded by one overall deadline
+    print("Fetching jobs from multiple sources...")
+    results, source_status = gather_sources(job_sources(search_term, location, results_wanted))
+    
+    jobs = []
+    for status in source_status:
+        source_jobs = results.get(status["name"], [])
+        jobs.extend(source_jobs)
+        print(f"Found {len(source_jobs)} {status['name']} jobs ({status['status']}, {status['latencyMs']}ms)")
+    
+    # Fresh results first, then stored matches the live scrape didn't return
+    jobs.extend(stored)
+    return finalize_jobs(jobs, [store_status] + source_status, search_term, location, results_wanted)
+
+def finalize_jobs(jobs, source_status, search_term, location, results_wanted):
+    """Fill, rank and summarize scraped jobs into the search response payload"""
+    # Drop cross-source duplicates before they eat into the quota
+    jobs = dedupe_jobs(jobs)
+    
+    # Always ensure we have some jobs - fill with mock data
+    if len(jobs) < results_wanted:
+        remaining = results_wanted - len(jobs)
+        mock_jobs = generate_mock_jobs(search_term, location, remaining)
+        jobs.extend(mock_jobs)
+        print(f"Added {len(mock_jobs)} mock jobs to fill quota")
+    
+    # Score the merged list in one batch (stored jobs may carry stale scores), then rank
+    score_jobs(jobs)
+    jobs.sort(key=lambda x: x.get('relevanceScore', 0), reverse=True)
+    
+    real_jobs = len([j for j in jobs if j.get('source') in ['Indeed', 'RemoteOK', 'LinkedIn']])
+    mock_jobs = len(jobs) - real_jobs
+    
+    message_parts = []
+    if real_jobs > 0:
+        message_parts.append(f"{real_jobs} real jobs")
+    if mock_jobs > 0:
+        message_parts.append(f"{mock_jobs} demo jobs")
+        
+    # The full ranked list is kept so later pages can be served from a snapshot,
+    # column-wise so a large cached result stays small; rows become dicts
+    # again only for the responses that include them
+    return {
+        "jobs": JobTable.from_jobs(jobs),
+        "total": len(jobs),
+        "message": f"Found {' + '.join(message_parts)} from multiple sources",
+        "sources": source_status
+    }
+
+def has_real_jobs(payload):
+    """Only cache searches where at least one real source answered and every source got to run"""
+    statuses = payload["sources"]
+    return any(status["count"] > 0 for status in statuses) and all_sources_ran(statuses)
+
+def warm_search(search_term, location, results_wanted):
+    """Crawler hook: scrape a popular search live into the job store and result cache"""
+    payload = collect_jobs(search_term, location, results_wanted, live=True)
+    if has_real_jobs(payload):
+        search_cache.put(make_search_key(search_term, location, results_wanted), payload)
+
+# Indeed (up to 2 feeds) + LinkedIn (feed and search page) + RemoteOK refresh
+crawler = start_crawler(warm_search, request_cost=5)
+lazy_imports.warm_up()
+
+def search_query(args):
+    """(search_term, location, results_wanted) of a search request"""
+    return args.get('search', 'developer'), args.get('location', 'Nashville, TN'), int(args.get('limit', 20))
+
+def search_plan(args):
+    """(cache key, compute, should_cache) of a plain search request, or None for paged and streamed ones
+
+    Lets asgi.py run the search before the view does.
+    """
+    if args.get('cursor') or wants_stream(args):
+        return None
+    search_term, location, results_wanted = search_query(args)
+    compute = lambda: collect_jobs(search_term, location, results_wanted)
+    return make_search_key(search_term, location, results_wanted), compute, has_real_jobs
 
 @app.route('/api/jobs/search', methods=['GET'])
 def search_jobs():
     """Search for jobs using simple scraping"""
     try:
-        search_term = request.args.get('search', 'developer')
-        location = request.args.get('location', 'Nashville, TN')
-        results_wanted = int(request.args.get('limit', 20))
-        
-        print(f"Searching for: {search_term} in {location}")
+        search_term, location, results_wanted = search_query(request.args)
         
-        jobs = []
+        # Later pages come from the first page's snapshot, never from upstreams
+        cursor = request.args.get('cursor')
+        if cursor:
+            return cursor_response(cursor, results_wanted)
         
-        # Try multiple real job sources with error handling
-        print("Fetching jobs from multiple sources...")
-        
-        # 1. Try Indeed RSS feeds first (most reliable)
-        try:
-            indeed_jobs = scrape_indeed_jobs(search_term, location, results_wanted // 3)
-            jobs.extend(indeed_jobs)
-            print(f"Found {len(indeed_jobs)} Indeed jobs")
-        except Exception as e:
-            print(f"Indeed scraping failed: {e}")
-        
-        # 2. Try LinkedIn jobs (professional network)
-        if len(jobs) < results_wanted:
-            try:
-                remaining = results_wanted - len(jobs)
-                linkedin_jobs = scrape_linkedin_jobs(search_term, location, min(remaining, results_wanted // 3))
-                jobs.extend(linkedin_jobs)
-                print(f"Found {len(linkedin_jobs)} LinkedIn jobs")
-            except Exception as e:
-                print(f"LinkedIn scraping failed: {e}")
+        print(f"Searching for: {search_term} in {location}")
+        job_store.record_query(search_term, location, results_wanted)
         
-        # 3. Try RemoteOK for remote jobs
-        if len(jobs) < results_wanted:
-            try:
-                remaining = results_wanted - len(jobs)
-                remoteok_jobs = scrape_remoteok_jobs(search_term, remaining)
-                jobs.extend(remoteok_jobs)
-                print(f"Found {len(remoteok_jobs)} RemoteOK jobs")
-            except Exception as e:
-                print(f"RemoteOK scraping failed: {e}")
+        cache_key = make_search_key(search_term, location, results_wanted)
+        keep = salary_filter(*salary_bounds(request.args))
+        weights = parse_weights(request.args)
+        compute = lambda: collect_jobs(search_term, location, results_wanted)
         
-        # 4. Always ensure we have some jobs - fill with mock data
-        if len(jobs) < results_wanted:
-            remaining = results_wanted - len(jobs)
-            mock_jobs = generate_mock_jobs(search_term, location, remaining)
-            jobs.extend(mock_jobs)
-            print(f"Added {len(mock_jobs)} mock jobs to fill quota")
+        if wants_stream(request.args):
+            payload, cache_state = search_cache.lookup(cache_key, compute, should_cache=has_real_jobs)
+            if payload is None and search_cache.pending(cache_key) is not None:
+                # The same search is already scraping for another request; wait for it rather than repeat it
+                payload, cache_state = search_cache.compute_missed(cache_key, compute, should_cache=has_real_jobs)
+            g.cache_state = cache_state
+            if payload is not None:
+                return ndjson_response(stream_cached_payload(payload, cache_state, keep=keep))
+            
+            def store(payload):
+                if has_real_jobs(payload):
+                    search_cache.put(cache_key, payload)
+            
+            # Stored matches go out first; live sources follow and top up the store
+            sources = [("Store", job_store.search, (search_term, location, results_wanted))]
+            return ndjson_response(stream_live_search(
+                sources + job_sources(search_term, location, results_wanted),
+                lambda jobs, statuses: finalize_jobs(jobs, statuses, search_term, location, results_wanted),
+                on_complete=store,
+                keep=keep
+            ))
         
-        # Sort all jobs by relevance score
-        jobs.sort(key=lambda x: x.get('relevanceScore', 0), reverse=True)
+        payload, cache_state = cached_search(cache_key, compute, should_cache=has_real_jobs)
+        g.cache_state = cache_state
         
-        real_jobs = len([j for j in jobs if j.get('source') in ['Indeed', 'RemoteOK', 'LinkedIn']])
-        mock_jobs = len(jobs) - real_jobs
+        # Salary filters and custom weights run on the cached payload, so they all share one cache entry
+        cached = payload
+        payload = rerank_payload(filter_payload(cached, keep), weights)
+        # First pages of the same cached payload, filtered and weighted alike, share one snapshot
+        variant = (getattr(keep, 'bounds', None), tuple(sorted(weights.items())) if weights else None)
         
-        message_parts = []
-        if real_jobs > 0:
-            message_parts.append(f"{real_jobs} real jobs")
-        if mock_jobs > 0:
-            message_parts.append(f"{mock_jobs} demo jobs")
-            
-        return jsonify({
-            "jobs": jobs[:results_wanted],
-            "total": len(jobs),
-            "message": f"Found {' + '.join(message_parts)} from multiple sources"
-        })
+        # Re-polls of an unchanged first page get a 304 before a snapshot or body is made
+        return conditional_page(
+            page_etag(payload, 0, results_wanted),
+            lambda: snapshot_store.first_page(payload, results_wanted, source=cached, variant=variant, cache=cache_state),
+            snapshots=snapshot_store
+        )
         
     except Exception as e:
         print(f"Error searching jobs: {str(e)}")
+        metrics.REQUEST_ERRORS.inc('/api/jobs/search')
         
         # Ultimate fallback - pure mock data
         mock_jobs = generate_mock_jobs(
@@ -147,9 +267,24 @@ def health_check():
     return jsonify({
         "status": "healthy",
         "message": "Fallback JobSpy backend is running",
-        "python_version": "< 3.10 (fallback mode)"
+        "python_version": "< 3.10 (fallback mode)",
+        "cache": search_cache.stats(),
+        "remoteok": remoteok_store.stats(),
+        "http": http_client.stats(),
+        "store": job_store.stats(),
+        "crawler": crawler.stats(),
+        "snapshots": snapshot_store.stats(),
+        "scoring": scorer.stats(),
+        "json": json_fragments.stats(),
+        "upstreams": upstream_guard.stats(),
+        "imports": lazy_imports.stats()
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     debug_mode = os.environ.get('FLASK_ENV') != 'production'
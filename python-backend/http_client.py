@@ -0,0 +1,131 @@
+"""
+Shared keep-alive HTTP client for all scrapers
+One pooled session per process so repeat requests to the same host reuse
+their TCP/TLS connections instead of handshaking every time
+"""
+
+import os
+import random
+import threading
+import time
+
+import lazy_imports
+import metrics
+import upstream_guard
+
+# Loaded with the first request rather than at startup
+requests = lazy_imports.module('requests')
+
+POOL_CONNECTIONS = int(os.environ.get('HTTP_POOL_CONNECTIONS', 10))  # hosts kept pooled
+POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', 10))  # connections per host
+MAX_RETRIES = int(os.environ.get('HTTP_RETRIES', 2))
+BACKOFF_BASE = float(os.environ.get('HTTP_BACKOFF_SECONDS', 0.3))
+
+DEFAULT_HEADERS = {
+    # Only advertise encodings requests can decode without extra packages
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+_session = None
+_session_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"requests": 0, "retries": 0, "errors": 0}
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                _session = session
+    return _session
+
+def _count(key):
+    with _stats_lock:
+        _stats[key] += 1
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff for the given retry attempt (0-based)"""
+    return random.uniform(0, BACKOFF_BASE * (2 ** attempt))
+
+def get(url, headers=None, timeout=10, retries=None, **kwargs):
+    """GET through the shared pool, retrying connection errors with jittered backoff
+
+    HTTP error statuses are returned to the caller as-is; only failures to
+    connect (including connect timeouts) are retried. Time until the
+    response headers arrive is recorded as the current source's fetch stage.
+    Raises upstream_guard.UpstreamUnavailable, without sending anything,
+    while the host's circuit is open or its rate budget is spent.
+    """
+    if retries is None:
+        retries = MAX_RETRIES
+
+    guard = upstream_guard.guard_for(url)
+    with metrics.stage('fetch'):
+        try:
+            permit = guard.acquire()
+        except upstream_guard.UpstreamUnavailable as e:
+            metrics.record_upstream(url, e.reason)
+            raise
+        try:
+            response = _get_with_retries(url, headers, timeout, retries, **kwargs)
+        except Exception:
+            guard.record(permit, failed=True)
+            raise
+    guard.record(permit, response.status_code, retry_after=response.headers.get('Retry-After'))
+    metrics.record_upstream(url, response.status_code)
+    return response
+
+def _get_with_retries(url, headers, timeout, retries, **kwargs):
+    session = get_session()
+    attempt = 0
+    while True:
+        _count("requests")
+        try:
+            return session.get(url, headers=headers, timeout=timeout, **kwargs)
+        except requests.ConnectionError as e:
+            if attempt >= retries:
+                _count("errors")
+                metrics.record_upstream(url, 'timeout' if isinstance(e, requests.Timeout) else 'error')
+                raise
+            _count("retries")
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
+        except requests.RequestException as e:
+            _count("errors")
+            metrics.record_upstream(url, 'timeout' if isinstance(e, requests.Timeout) else 'error')
+            raise
+
+def stats():
+    """Request counters plus per-host connection reuse from the urllib3 pools"""
+    with _stats_lock:
+        result = dict(_stats)
+
+    hosts = {}
+    opened = 0
+    served = 0
+    if _session is not None:
+        for adapter in set(_session.adapters.values()):
+            for key in list(adapter.poolmanager.pools.keys()):
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                host = f"{pool.scheme}://{pool.host}:{pool.port}"
+                hosts[host] = {
+                    "connectionsOpened": pool.num_connections,
+                    "requests": pool.num_requests,
+                    "connectionsReused": max(0, pool.num_requests - pool.num_connections)
+                }
+                opened += pool.num_connections
+                served += pool.num_requests
+
+    result["connectionsOpened"] = opened
+    result["connectionsReused"] = max(0, served - opened)
+    result["hosts"] = hosts
+    return result
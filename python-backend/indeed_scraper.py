@@ -2,29 +2,53 @@
 Indeed RSS feed scraper for real job data
 """
 
-import requests
+import http_client
 import xml.etree.ElementTree as ET
 from datetime import datetime
-import uuid
 import re
+import os
 
+from keyword_matcher import matcher
+from job_document import JobDocument
+from job_store import stable_job_id
+from salary import find_salary
+from scoring import scored, scorer
+import metrics
+from rss_stream import iter_rss_items
+import upstream_guard
+
+# Overridable so benchmarks can point the scraper at a local stub server
+INDEED_RSS_URL = os.environ.get('INDEED_RSS_URL', 'https://rss.indeed.com/rss')
+
+upstream_guard.register_source("Indeed", INDEED_RSS_URL)
+
+@scored
 def scrape_indeed_jobs(search_term="developer", location="remote", limit=20):
-    """Scrape jobs from Indeed RSS feeds"""
+    """Scrape jobs from Indeed RSS feeds
+
+    A feed that fails is skipped, but if every feed tried fails the last
+    error is raised, so the source is reported as failed rather than empty.
+    """
     try:
         # Indeed RSS feed URLs
         search_query = search_term.replace(' ', '+')
         location_query = location.replace(' ', '+')
         
         base_urls = [
-            f"https://rss.indeed.com/rss?q={search_query}&l={location_query}",
-            f"https://rss.indeed.com/rss?q=react+developer&l=remote",
-            f"https://rss.indeed.com/rss?q=frontend+developer&l=remote",
-            f"https://rss.indeed.com/rss?q=javascript+developer&l=remote"
+            f"{INDEED_RSS_URL}?q={search_query}&l={location_query}",
+            f"{INDEED_RSS_URL}?q=react+developer&l=remote",
+            f"{INDEED_RSS_URL}?q=frontend+developer&l=remote",
+            f"{INDEED_RSS_URL}?q=javascript+developer&l=remote"
         ]
         
         all_jobs = []
+        fetched = False
+        last_error = None
         
         for url in base_urls[:2]:  # Try first 2 URLs to avoid rate limits
+            if len(all_jobs) >= limit:
+                break
+            
             print(f"Fetching Indeed RSS: {url}")
             
             headers = {
@@ -33,147 +57,132 @@ def scrape_indeed_jobs(search_term="developer", location="remote", limit=20):
             }
             
             try:
-                response = requests.get(url, headers=headers, timeout=10)
+                response = http_client.get(url, headers=headers, timeout=10, stream=True)
                 if response.status_code != 200:
                     print(f"Indeed RSS error: {response.status_code}")
+                    response.close()
+                    last_error = RuntimeError(f"Indeed RSS error: {response.status_code}")
                     continue
                 
-                # Parse XML
-                root = ET.fromstring(response.content)
-                
-                # Find all job items
-                items = root.findall('.//item')
-                print(f"Found {len(items)} jobs in Indeed RSS")
+                # Stream job items off the socket, stopping once we have enough
+                found_before = len(all_jobs)
+                for item in metrics.timed_iter(iter_rss_items(response, limit - len(all_jobs))):
+                    all_jobs.append(parse_indeed_item(item, location, search_term))
+                fetched = True
                 
-                for item in items:
-                    if len(all_jobs) >= limit:
-                        break
-                        
-                    title = item.find('title')
-                    title_text = title.text if title is not None else 'Developer'
-                    
-                    description = item.find('description')
-                    description_text = description.text if description is not None else ''
-                    
-                    link = item.find('link')
-                    link_url = link.text if link is not None else '#'
-                    
-                    pub_date = item.find('pubDate')
-                    pub_date_text = pub_date.text if pub_date is not None else ''
-                    
-                    # Extract company name from title (format: "Job Title at Company Name")
-                    company_match = re.search(r' at (.+?)(?:$| - | in )', title_text)
-                    company = company_match.group(1) if company_match else 'Company'
-                    
-                    # Clean up job title (remove "at Company" part)
-                    clean_title = re.sub(r' at .+', '', title_text)
-                    
-                    # Extract location from description or use search location
-                    location_match = re.search(r'Location: ([^<\n]+)', description_text)
-                    job_location = location_match.group(1).strip() if location_match else location.title()
-                    
-                    # Determine if remote
-                    is_remote = 'remote' in job_location.lower() or 'remote' in description_text.lower()
-                    
-                    job = {
-                        "id": str(uuid.uuid4()),
-                        "title": clean_title.strip(),
-                        "company": company.strip(),
-                        "location": "Remote" if is_remote else job_location,
-                        "salary": extract_salary_from_description(description_text),
-                        "postedDate": parse_indeed_date(pub_date_text),
-                        "source": "Indeed",
-                        "description": clean_html_description(description_text)[:500],
-                        "requirements": extract_skills_from_description(description_text),
-                        "isRemote": is_remote,
-                        "relevanceScore": calculate_indeed_relevance(title_text, description_text, search_term),
-                        "applicationStatus": "not_applied",
-                        "tags": extract_job_tags(title_text, description_text),
-                        "url": link_url
-                    }
-                    
-                    all_jobs.append(job)
+                print(f"Found {len(all_jobs) - found_before} jobs in Indeed RSS")
                     
             except ET.ParseError as e:
                 print(f"XML parse error for {url}: {e}")
+                last_error = e
                 continue
             except Exception as e:
                 print(f"Error fetching {url}: {e}")
+                last_error = e
                 continue
         
+        if not fetched and not all_jobs and last_error is not None:
+            raise last_error
+        
         print(f"Total Indeed jobs found: {len(all_jobs)}")
         return all_jobs[:limit]
         
     except Exception as e:
         print(f"Indeed scraping error: {e}")
-        return []
+        raise
 
-def extract_salary_from_description(description):
-    """Extract salary information from job description"""
-    # Look for salary patterns
-    salary_patterns = [
-        r'\$(\d{2,3}),?(\d{3})\s*-\s*\$(\d{2,3}),?(\d{3})',  # $80,000 - $120,000
-        r'\$(\d{2,3})k\s*-\s*\$(\d{2,3})k',                   # $80k - $120k
-        r'(\d{2,3}),?(\d{3})\s*-\s*(\d{2,3}),?(\d{3})',      # 80,000 - 120,000
-        r'\$(\d{2,3}),?(\d{3})',                              # $80,000
-    ]
-    
-    for pattern in salary_patterns:
-        match = re.search(pattern, description, re.IGNORECASE)
-        if match:
-            return match.group(0)
-    
-    return "Salary not specified"
-
-def clean_html_description(description):
-    """Clean HTML tags from description"""
-    # Remove HTML tags
-    clean_text = re.sub(r'<[^>]+>', '', description)
-    # Clean up extra whitespace
-    clean_text = ' '.join(clean_text.split())
-    return clean_text
+@metrics.timed('convert')
+def parse_indeed_item(item, location, search_term):
+    """Convert one Indeed RSS <item> into our job format"""
+    title = item.find('title')
+    title_text = title.text if title is not None else 'Developer'
+    
+    description = item.find('description')
+    description_text = description.text if description is not None else ''
+    
+    link = item.find('link')
+    link_url = link.text if link is not None else '#'
+    
+    pub_date = item.find('pubDate')
+    pub_date_text = pub_date.text if pub_date is not None else ''
+    
+    # Extract company name from title (format: "Job Title at Company Name")
+    company_match = re.search(r' at (.+?)(?:$| - | in )', title_text)
+    company = company_match.group(1) if company_match else 'Company'
+    
+    # Clean up job title (remove "at Company" part)
+    clean_title = re.sub(r' at .+', '', title_text)
+    
+    # Extract location from description or use search location
+    location_match = re.search(r'Location: ([^<\n]+)', description_text)
+    job_location = location_match.group(1).strip() if location_match else location.title()
+    
+    # Each text field is normalized once and shared by every heuristic below
+    doc = JobDocument(title=title_text, description=description_text, location=job_location)
+    
+    # Determine if remote
+    is_remote = 'remote' in doc.lower('location') or 'remote' in doc.lower('description')
+    
+    salary_text, salary = find_salary(description_text)
+    
+    job = {
+        "id": stable_job_id(link_url, clean_title.strip(), company.strip()),
+        "title": clean_title.strip(),
+        "company": company.strip(),
+        "location": "Remote" if is_remote else job_location,
+        "salary": salary_text or "Salary not specified",
+        **salary,
+        "postedDate": parse_indeed_date(pub_date_text),
+        "source": "Indeed",
+        "description": doc.clean('description')[:500],
+        "requirements": extract_skills_from_description(doc),
+        "isRemote": is_remote,
+        "relevanceScore": 0,  # set for the whole batch by scoring
+        "applicationStatus": "not_applied",
+        "tags": extract_job_tags(doc),
+        "url": link_url
+    }
+    
+    # Scoring reads its features from this document instead of the dict
+    scorer.prime(job, doc)
+    return job
 
-def extract_skills_from_description(description):
-    """Extract technical skills from job description"""
+def extract_skills_from_description(doc):
+    """Extract technical skills from a JobDocument's description"""
     skills = [
         'React', 'JavaScript', 'TypeScript', 'Python', 'Node.js', 'Next.js',
         'HTML', 'CSS', 'Vue', 'Angular', 'AWS', 'Docker', 'Git', 'SQL',
         'MongoDB', 'PostgreSQL', 'Redis', 'GraphQL', 'REST', 'API'
     ]
     
-    found_skills = []
-    description_lower = description.lower()
-    
-    for skill in skills:
-        if skill.lower() in description_lower:
-            found_skills.append(skill)
+    found_skills = matcher.select(doc.found('description'), skills)
     
     return found_skills[:8]  # Limit to 8 skills
 
-def extract_job_tags(title, description):
-    """Extract job tags from title and description"""
+def extract_job_tags(doc):
+    """Extract job tags from a JobDocument's title and description"""
     tags = []
     
-    text = (title + ' ' + description).lower()
+    found = doc.found('title', 'description')
     
     # Experience level
-    if any(word in text for word in ['senior', 'sr.', 'lead']):
+    if found.intersection(['senior', 'sr.', 'lead']):
         tags.append('Senior')
-    elif any(word in text for word in ['junior', 'jr.', 'entry']):
+    elif found.intersection(['junior', 'jr.', 'entry']):
         tags.append('Junior')
     else:
         tags.append('Mid-Level')
     
     # Job type
-    if any(word in text for word in ['full time', 'full-time', 'permanent']):
+    if found.intersection(['full time', 'full-time', 'permanent']):
         tags.append('Full-Time')
-    elif any(word in text for word in ['part time', 'part-time']):
+    elif found.intersection(['part time', 'part-time']):
         tags.append('Part-Time')
-    elif any(word in text for word in ['contract', 'contractor', 'freelance']):
+    elif found.intersection(['contract', 'contractor', 'freelance']):
         tags.append('Contract')
     
     # Remote
-    if 'remote' in text:
+    if 'remote' in found:
         tags.append('Remote')
     
     return tags
@@ -187,34 +196,6 @@ def parse_indeed_date(date_string):
     except:
         return datetime.now().isoformat()
 
-def calculate_indeed_relevance(title, description, search_term):
-    """Calculate job relevance score"""
-    score = 60  # Base score
-    
-    title_lower = title.lower()
-    description_lower = description.lower()
-    search_lower = search_term.lower()
-    
-    # Search term in title
-    if search_lower in title_lower:
-        score += 20
-    
-    # Search term in description
-    if search_lower in description_lower:
-        score += 10
-    
-    # Tech skills
-    tech_skills = ['react', 'javascript', 'typescript', 'python', 'node.js']
-    for skill in tech_skills:
-        if skill in title_lower or skill in description_lower:
-            score += 3
-    
-    # Remote bonus
-    if 'remote' in title_lower or 'remote' in description_lower:
-        score += 8
-    
-    return min(95, score)
-
 if __name__ == "__main__":
     # Test the scraper
     jobs = scrape_indeed_jobs("react developer", "remote", 5)
@@ -0,0 +1,97 @@
+"""
+Analyze-once view of a job's text for the per-job heuristics
+Remote detection, skills, tags, seniority and relevance all look at the same
+title and description. A JobDocument normalizes each field (HTML-stripped,
+lowercased, keyword-scanned) at most once, on first use, and every heuristic
+reads the result from it instead of lowercasing and re-scanning the text.
+"""
+
+import re
+
+from keyword_matcher import matcher as default_matcher
+
+HTML_TAG = re.compile(r'<[^>]+>')
+NOTHING = frozenset()
+
+# Job dict fields a document built from a finished job reads
+JOB_FIELDS = ('title', 'company', 'location', 'description', 'requirements', 'tags')
+
+def _as_text(value):
+    if isinstance(value, str):
+        return value
+    if value is None or (isinstance(value, float) and value != value):
+        # Missing, including pandas' NaN
+        return ''
+    if isinstance(value, (list, tuple)):
+        return ' '.join(map(str, value))
+    return str(value)
+
+class JobDocument:
+    """Lazily normalized text fields of one job
+
+    Fields are passed by name (title=..., description=...); unknown or
+    missing fields read as empty text. Results are cached per field, and
+    keyword scans per field and matcher, so combining fields costs a set
+    union rather than another scan.
+    """
+
+    __slots__ = ('fields', '_lower', '_clean', '_found')
+
+    def __init__(self, **fields):
+        self.fields = fields
+        self._lower = {}
+        self._clean = None
+        self._found = {}
+
+    @classmethod
+    def from_job(cls, job, fields=JOB_FIELDS):
+        """Document over a job dict's text fields"""
+        return cls(**{name: job.get(name) for name in fields})
+
+    def fill(self, job, fields=JOB_FIELDS):
+        """Add the job dict's fields this document was built without; returns the document"""
+        for name in fields:
+            if name not in self.fields:
+                self.fields[name] = job.get(name)
+        return self
+
+    def text(self, field):
+        """The field as a string ('' when missing)"""
+        return _as_text(self.fields.get(field))
+
+    def clean(self, field):
+        """The field with HTML tags removed and whitespace collapsed"""
+        if self._clean is None:
+            self._clean = {}
+        value = self._clean.get(field)
+        if value is None:
+            value = self._clean[field] = ' '.join(HTML_TAG.sub('', self.text(field)).split())
+        return value
+
+    def lower(self, field):
+        """The field lowercased"""
+        value = self._lower.get(field)
+        if value is None:
+            value = self._lower[field] = self.text(field).lower()
+        return value
+
+    def found(self, *fields, matcher=default_matcher):
+        """Canonical phrases matcher finds in any of the fields; treat the result as read-only"""
+        scans = self._found.get(matcher)
+        if scans is None:
+            scans = self._found[matcher] = {}
+
+        results = []
+        for field in fields:
+            value = scans.get(field)
+            if value is None:
+                text = self.lower(field)
+                value = scans[field] = matcher.scan_lowered(text) if text else NOTHING
+            results.append(value)
+        if len(results) == 1:
+            return results[0]
+        return set().union(*results)
+
+    def in_category(self, category, *fields):
+        """Phrases of one default-vocabulary category found in the fields"""
+        return default_matcher.in_category(self.found(*fields), category)
@@ -0,0 +1,423 @@
+"""
+Persistent SQLite job store with stable IDs and full-text search
+Every scraped job is upserted under an ID hashed from its canonical URL (or
+title + company), so searches can be answered from the local index and live
+scraping only has to top it up
+"""
+
+import functools
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import metrics
+from result_cache import make_search_key
+
+STORE_PATH = os.environ.get('JOB_STORE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jobs.db'))
+MAX_AGE_DAYS = float(os.environ.get('JOB_STORE_MAX_AGE_DAYS', 14))
+REFRESH_INTERVAL = float(os.environ.get('JOB_STORE_REFRESH_SECONDS', 600))
+# Query popularity halves after this long without requests
+POPULARITY_HALF_LIFE = float(os.environ.get('QUERY_POPULARITY_HALF_LIFE_HOURS', 24)) * 3600
+# Request counts are kept in memory and written at most this often
+POPULARITY_FLUSH_SECONDS = float(os.environ.get('QUERY_POPULARITY_FLUSH_SECONDS', 30))
+
+# Query parameters that only track how a posting was reached
+TRACKING_PARAMS = {'refid', 'trackingid', 'trk', 'position', 'pagenum', 'from', 'src', 'ref', 'referer', 'source'}
+
+# bm25 column weights for title, company, description, requirements
+FTS_WEIGHTS = (10.0, 2.0, 1.0, 4.0)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    source TEXT,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    description TEXT,
+    requirements TEXT,
+    is_remote INTEGER,
+    data TEXT NOT NULL,
+    first_seen REAL,
+    last_seen REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs(last_seen);
+CREATE TABLE IF NOT EXISTS queries (
+    key TEXT PRIMARY KEY,
+    scraped_at REAL
+);
+CREATE TABLE IF NOT EXISTS query_stats (
+    key TEXT PRIMARY KEY,
+    search TEXT,
+    location TEXT,
+    result_limit INTEGER,
+    score REAL,
+    last_requested REAL
+);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company, description, requirements,
+    content='jobs', content_rowid='rowid', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, company, description, requirements)
+    VALUES (new.rowid, new.title, new.company, new.description, new.requirements);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description, requirements)
+    VALUES ('delete', old.rowid, old.title, old.company, old.description, old.requirements);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description, requirements)
+    VALUES ('delete', old.rowid, old.title, old.company, old.description, old.requirements);
+    INSERT INTO jobs_fts(rowid, title, company, description, requirements)
+    VALUES (new.rowid, new.title, new.company, new.description, new.requirements);
+END;
+"""
+
+def canonical_url(url):
+    """Normalize a posting URL for hashing, or None if it doesn't identify one"""
+    if not url or not isinstance(url, str):
+        return None
+
+    parts = urlsplit(url.strip())
+    if not parts.netloc:
+        return None
+
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    )
+    return urlunsplit(('https', host, parts.path.rstrip('/'), urlencode(query), ''))
+
+def query_key(search_term, location, limit):
+    """Normalized (search, location, limit) as one string key"""
+    return '|'.join(str(part) for part in make_search_key(search_term, location, limit))
+
+def stable_job_id(url=None, title='', company=''):
+    """Job ID that stays the same across scrapes of the same posting
+
+    Hashes the canonical URL when there is one, otherwise the normalized
+    title and company.
+    """
+    key = canonical_url(url)
+    if key is None:
+        key = '|'.join(' '.join(str(value).lower().split()) for value in (title, company))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:24]
+
+def search_words(search_term):
+    """Lowercased words of a search term"""
+    return re.findall(r'\w+', str(search_term).lower())
+
+def fts_query(search_term, all_words=False):
+    """FTS5 MATCH expression for any word of the search term, or every word with all_words
+
+    Like the live scrapers, a partial match still counts by default; bm25
+    ranks jobs matching more of the words (especially in the title) first.
+    """
+    return (' ' if all_words else ' OR ').join(f'"{word}"' for word in search_words(search_term))
+
+def decayed(score, since, now):
+    """Popularity score counted at time since, decayed to now"""
+    return score * 0.5 ** ((now - since) / POPULARITY_HALF_LIFE)
+
+class JobStore:
+    """SQLite table of scraped jobs with an FTS5 index kept in sync by triggers
+
+    Falls back to LIKE matching when the SQLite build lacks FTS5, and to a
+    disabled store (empty searches, ignored upserts) if the database can't
+    be opened, e.g. on a read-only filesystem.
+    """
+
+    def __init__(self, path=STORE_PATH, max_age_days=MAX_AGE_DAYS, refresh_interval=REFRESH_INTERVAL,
+                 flush_interval=POPULARITY_FLUSH_SECONDS):
+        self.path = path
+        self.max_age = max_age_days * 86400
+        self.refresh_interval = refresh_interval
+        self.flush_interval = flush_interval
+        self.fts = False
+        self.disabled = False
+        self._conn = None
+        self._lock = threading.Lock()
+        self._last_pruned = 0.0
+        # Query key -> [search, location, limit, score, last_requested] not yet written
+        self._pending_queries = {}
+        self._last_flushed = time.time()
+
+    def _connect(self):
+        """Open the database on first use; returns None if the store is disabled"""
+        if self._conn is None and not self.disabled:
+            try:
+                conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                conn.executescript(SCHEMA)
+                try:
+                    conn.executescript(FTS_SCHEMA)
+                    self.fts = True
+                except sqlite3.OperationalError as e:
+                    print(f"SQLite FTS5 unavailable, job store search falls back to LIKE: {e}")
+                conn.commit()
+                self._conn = conn
+            except sqlite3.Error as e:
+                print(f"Job store disabled, could not open {self.path}: {e}")
+                self.disabled = True
+        return self._conn
+
+    def upsert(self, jobs):
+        """Insert or refresh scraped jobs by ID; returns how many were written"""
+        now = time.time()
+        rows = [
+            (
+                job["id"],
+                job.get("source"),
+                job.get("title"),
+                job.get("company"),
+                job.get("location"),
+                job.get("description"),
+                ' '.join(job.get("requirements") or []),
+                1 if job.get("isRemote") else 0,
+                json.dumps(job),
+                now,
+                now,
+            )
+            for job in jobs if job and job.get("id")
+        ]
+        if not rows:
+            return 0
+
+        with metrics.stage('store'), self._lock:
+            conn = self._connect()
+            if conn is None:
+                return 0
+            try:
+                with conn:
+                    conn.executemany("""
+                        INSERT INTO jobs (id, source, title, company, location, description,
+                                          requirements, is_remote, data, first_seen, last_seen)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(id) DO UPDATE SET
+                            source = excluded.source, title = excluded.title,
+                            company = excluded.company, location = excluded.location,
+                            description = excluded.description, requirements = excluded.requirements,
+                            is_remote = excluded.is_remote, data = excluded.data,
+                            last_seen = excluded.last_seen
+                    """, rows)
+                    if now - self._last_pruned > 3600:
+                        conn.execute("DELETE FROM jobs WHERE last_seen < ?", (now - self.max_age,))
+                        self._last_pruned = now
+            except sqlite3.Error as e:
+                print(f"Job store upsert failed: {e}")
+                return 0
+        return len(rows)
+
+    def search(self, search_term, location=None, limit=20, all_words=False):
+        """Best-matching stored jobs seen within max_age, filtered to the location
+
+        With all_words, only jobs containing every word of the search term match.
+        """
+        clauses = ["j.last_seen >= ?"]
+        params = [time.time() - self.max_age]
+
+        place = ' '.join(str(location or '').lower().split())
+        if place == 'remote':
+            clauses.append("j.is_remote = 1")
+        elif place and place != 'both':
+            clauses.append("(j.is_remote = 1 OR lower(j.location) LIKE ?)")
+            params.append(f"%{place.split(',')[0].strip()}%")
+
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return []
+
+            query = fts_query(search_term, all_words)
+            if not query:
+                sql = f"SELECT j.data FROM jobs j WHERE {' AND '.join(clauses)} ORDER BY j.last_seen DESC LIMIT ?"
+                args = params + [limit]
+            elif self.fts:
+                sql = f"""
+                    SELECT j.data FROM jobs_fts f JOIN jobs j ON j.rowid = f.rowid
+                    WHERE jobs_fts MATCH ? AND {' AND '.join(clauses)}
+                    ORDER BY bm25(jobs_fts, {', '.join(str(w) for w in FTS_WEIGHTS)}) LIMIT ?
+                """
+                args = [query] + params + [limit]
+            else:
+                words = search_words(search_term)
+                text = "lower(j.title || ' ' || j.company || ' ' || j.description || ' ' || j.requirements)"
+                clauses.append('(' + (' AND ' if all_words else ' OR ').join(f"{text} LIKE ?" for _ in words) + ')')
+                params.extend(f"%{word}%" for word in words)
+                sql = f"SELECT j.data FROM jobs j WHERE {' AND '.join(clauses)} ORDER BY j.last_seen DESC LIMIT ?"
+                args = params + [limit]
+
+            try:
+                rows = conn.execute(sql, args).fetchall()
+            except sqlite3.Error as e:
+                print(f"Job store search failed: {e}")
+                return []
+
+        return [json.loads(data) for (data,) in rows]
+
+    def search_with_status(self, search_term, location=None, limit=20, all_words=False):
+        """search() plus a "Store" entry shaped like an aggregator source status"""
+        started = time.monotonic()
+        jobs = self.search(search_term, location, limit, all_words)
+        status = {
+            "name": "Store",
+            "status": "ok",
+            "latencyMs": int((time.monotonic() - started) * 1000),
+            "count": len(jobs)
+        }
+        return jobs, status
+
+    def claim_refresh(self, search_term, location, limit):
+        """True (and records the scrape) if the query hasn't been scraped within refresh_interval
+
+        Atomic in the database, so concurrent requests, gunicorn workers and
+        the crawler don't all top up the same query at once.
+        """
+        key = query_key(search_term, location, limit)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return True
+            try:
+                with conn:
+                    cursor = conn.execute("""
+                        INSERT INTO queries (key, scraped_at) VALUES (?, ?)
+                        ON CONFLICT(key) DO UPDATE SET scraped_at = excluded.scraped_at
+                        WHERE queries.scraped_at < ?
+                    """, (key, now, now - self.refresh_interval))
+                return cursor.rowcount > 0
+            except sqlite3.Error as e:
+                print(f"Job store refresh claim failed: {e}")
+                return True
+
+    def record_query(self, search_term, location, limit):
+        """Count one request for a query towards its exponentially decaying popularity
+
+        Counts build up in memory and are written every flush_interval, so
+        cache hits don't each cost a SQLite write.
+        """
+        search, place, limit = make_search_key(search_term, location, limit)
+        key = query_key(search, place, limit)
+        now = time.time()
+        with self._lock:
+            pending = self._pending_queries.get(key)
+            if pending is None:
+                self._pending_queries[key] = [search, place, limit, 1.0, now]
+            else:
+                pending[3] = decayed(pending[3], pending[4], now) + 1
+                pending[4] = now
+            if now - self._last_flushed >= self.flush_interval:
+                self._flush_queries(now)
+
+    def _flush_queries(self, now):
+        """Add the pending request counts to query_stats; call with the lock held"""
+        pending = self._pending_queries
+        self._pending_queries = {}
+        self._last_flushed = now
+        if not pending:
+            return
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            with conn:
+                for key, (search, place, limit, score, last_requested) in pending.items():
+                    row = conn.execute("SELECT score, last_requested FROM query_stats WHERE key = ?", (key,)).fetchone()
+                    if row is not None:
+                        score += decayed(row[0], row[1], last_requested)
+                    conn.execute("""
+                        INSERT INTO query_stats (key, search, location, result_limit, score, last_requested)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(key) DO UPDATE SET score = excluded.score, last_requested = excluded.last_requested
+                    """, (key, search, place, limit, score, last_requested))
+        except sqlite3.Error as e:
+            print(f"Job store query tracking failed: {e}")
+
+    def popular_queries(self, n):
+        """Top n (search, location, limit, popularity) by decayed request count
+
+        Queries whose popularity has decayed to almost nothing are dropped.
+        """
+        now = time.time()
+        with self._lock:
+            self._flush_queries(now)
+            conn = self._connect()
+            if conn is None:
+                return []
+            try:
+                rows = conn.execute("SELECT key, search, location, result_limit, score, last_requested FROM query_stats").fetchall()
+                ranked = []
+                forgotten = []
+                for key, search, place, limit, score, last_requested in rows:
+                    popularity = decayed(score, last_requested, now)
+                    if popularity < 0.05:
+                        forgotten.append((key,))
+                    else:
+                        ranked.append((popularity, search, place, limit))
+                if forgotten:
+                    with conn:
+                        conn.executemany("DELETE FROM query_stats WHERE key = ?", forgotten)
+            except sqlite3.Error as e:
+                print(f"Job store popular queries failed: {e}")
+                return []
+
+        ranked.sort(reverse=True)
+        return [(search, place, limit, round(popularity, 3)) for popularity, search, place, limit in ranked[:n]]
+
+    def ingesting(self, scrape):
+        """Wrap a scraper so every job it returns is upserted into the store"""
+        @functools.wraps(scrape)
+        def scrape_and_store(*args, **kwargs):
+            jobs = scrape(*args, **kwargs)
+            if jobs:
+                self.upsert(jobs)
+            return jobs
+        return scrape_and_store
+
+    def clear(self):
+        """Delete every stored job and scrape record"""
+        with self._lock:
+            self._pending_queries = {}
+            conn = self._connect()
+            if conn is None:
+                return
+            with conn:
+                conn.execute("DELETE FROM jobs")
+                conn.execute("DELETE FROM queries")
+                conn.execute("DELETE FROM query_stats")
+
+    def stats(self):
+        """Row counts for the health endpoint"""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return {"enabled": False, "path": self.path}
+            try:
+                jobs = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+                queries = conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+            except sqlite3.Error:
+                jobs = queries = None
+        return {
+            "enabled": True,
+            "path": self.path,
+            "fts": self.fts,
+            "jobs": jobs,
+            "queries": queries,
+            "maxAgeDays": self.max_age / 86400
+        }
+
+job_store = JobStore()
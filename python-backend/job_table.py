@@ -0,0 +1,347 @@
+"""
+Compact column-oriented storage for the jobs of finished search payloads
+A cached search can hold thousands of postings. As dicts, each one carries
+its own hash table, its own lists and its own copy of strings like "Indeed"
+or "Nashville, TN". A JobTable keeps one column per field instead:
+repeated values (source, status, location, tags...) are stored once and
+referenced by an int32 code, and numbers, dates and flags sit in NumPy arrays.
+Only free text (title, description, URL) stays one string per job. Rows
+become the frontend's Job dicts only when a response needs them, and each
+row's JSON is encoded on first use and kept for later responses.
+"""
+
+import sys
+from datetime import datetime
+
+from json_fragments import digest, dumps
+from salary import annual_range
+import lazy_imports
+
+# Imported with the first table built, not with the app
+np = lazy_imports.module('numpy')
+
+# Integers beyond this don't survive a float64 column
+MAX_EXACT_INT = 2 ** 53
+
+class TextColumn:
+    """One string per row, for fields that are rarely shared between jobs"""
+
+    def __init__(self):
+        self.values = []
+
+    def append(self, value):
+        if not isinstance(value, str):
+            return False
+        self.values.append(value)
+        return True
+
+    def skip(self):
+        self.values.append(None)
+
+    def freeze(self):
+        pass
+
+    def get(self, row):
+        return self.values[row]
+
+class CategoryColumn:
+    """Dictionary-encoded values: an int32 code per row into the list of distinct values
+
+    Holds strings, None and lists of strings (kept as tuples, read back as
+    new lists). Strings are interned, so every table shares one copy.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.codes = []
+        self._index = {}
+
+    def append(self, value):
+        if isinstance(value, list):
+            key = tuple(value)
+        elif isinstance(value, str) or value is None:
+            key = value
+        else:
+            return False
+
+        try:
+            code = self._index.get(key)
+        except TypeError:
+            # A list holding something unhashable
+            return False
+        if code is None:
+            # Only new values are checked and interned; equal values found above already were
+            if isinstance(key, tuple):
+                if not all(isinstance(item, str) for item in key):
+                    return False
+                key = tuple(sys.intern(item) for item in key)
+            elif key is not None:
+                key = sys.intern(key)
+            code = self._index[key] = len(self.values)
+            self.values.append(key)
+        self.codes.append(code)
+        return True
+
+    def skip(self):
+        self.append(None)
+
+    def freeze(self):
+        self.codes = np.array(self.codes, dtype=np.int32)
+        self._index = None
+
+    def get(self, row):
+        value = self.values[self.codes.item(row)]
+        return list(value) if isinstance(value, tuple) else value
+
+class NumberColumn:
+    """float64 values plus an int8 kind per row (0 None, 1 int, 2 float), so ints come back as ints"""
+
+    def __init__(self):
+        self.values = []
+        self.kinds = []
+
+    def append(self, value):
+        if value is None:
+            self.skip()
+        elif type(value) is int and -MAX_EXACT_INT <= value <= MAX_EXACT_INT:
+            self.values.append(value)
+            self.kinds.append(1)
+        elif type(value) is float:
+            self.values.append(value)
+            self.kinds.append(2)
+        else:
+            # bool, NumPy scalars and huge ints keep their exact type as extras
+            return False
+        return True
+
+    def skip(self):
+        self.values.append(np.nan)
+        self.kinds.append(0)
+
+    def freeze(self):
+        self.values = np.array(self.values, dtype=np.float64)
+        self.kinds = np.array(self.kinds, dtype=np.int8)
+
+    def get(self, row):
+        kind = self.kinds.item(row)
+        if kind == 0:
+            return None
+        value = self.values.item(row)
+        return int(value) if kind == 1 else value
+
+class DateColumn:
+    """Naive ISO date-times as datetime64[us], for values that are nearly unique per row
+
+    A string is stored only if datetime.isoformat() gives it back exactly;
+    others (dates without a time, offsets, other spellings) stay extras.
+    """
+
+    def __init__(self):
+        self.values = []
+
+    def append(self, value):
+        if value is None:
+            self.skip()
+            return True
+        if not isinstance(value, str):
+            return False
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return False
+        if parsed.tzinfo is not None or parsed.isoformat() != value:
+            return False
+        self.values.append(parsed)
+        return True
+
+    def skip(self):
+        self.values.append(None)
+
+    def freeze(self):
+        # None becomes NaT, which item() reads back as None
+        self.values = np.array(self.values, dtype='datetime64[us]')
+
+    def get(self, row):
+        value = self.values.item(row)
+        return None if value is None else value.isoformat()
+
+class FlagColumn:
+    """One bool per row"""
+
+    def __init__(self):
+        self.values = []
+
+    def append(self, value):
+        if type(value) is not bool:
+            return False
+        self.values.append(value)
+        return True
+
+    def skip(self):
+        self.values.append(False)
+
+    def freeze(self):
+        self.values = np.array(self.values, dtype=bool)
+
+    def get(self, row):
+        return self.values.item(row)
+
+# The frontend's Job fields and how each is stored. Values a column can't
+# hold exactly, and fields not listed here, are kept per row as extras.
+COLUMNS = (
+    ('id', TextColumn),
+    ('title', TextColumn),
+    ('company', CategoryColumn),
+    ('location', CategoryColumn),
+    ('salary', CategoryColumn),
+    ('salaryMin', NumberColumn),
+    ('salaryMax', NumberColumn),
+    ('salaryPeriod', CategoryColumn),
+    ('salaryCurrency', CategoryColumn),
+    ('postedDate', DateColumn),
+    ('source', CategoryColumn),
+    ('description', TextColumn),
+    ('requirements', CategoryColumn),
+    ('isRemote', FlagColumn),
+    ('relevanceScore', NumberColumn),
+    ('applicationStatus', CategoryColumn),
+    ('tags', CategoryColumn),
+    ('url', TextColumn),
+)
+
+class _Storage:
+    """The columns behind one or more JobTable views; never changes once built"""
+
+    def __init__(self, jobs):
+        self.columns = {name: column() for name, column in COLUMNS}
+        # Each row's keys in their original order, so a row reads back exactly as it was given
+        self.layouts = CategoryColumn()
+        self.extras = []
+        pay = []
+
+        for job in jobs:
+            extra = None
+            for name, column in self.columns.items():
+                if name not in job:
+                    column.skip()
+                elif not column.append(job[name]):
+                    column.skip()
+                    extra = extra or {}
+                    extra[name] = job[name]
+            for key in job:
+                if key not in self.columns:
+                    extra = extra or {}
+                    extra[key] = job[key]
+            self.layouts.append(list(job))
+            self.extras.append(extra)
+            pay.append(annual_range(job) or (np.nan, np.nan))
+
+        for column in self.columns.values():
+            column.freeze()
+        self.layouts.freeze()
+
+        # Yearly pay range per row (NaN without a salary), for salary filters
+        pay = np.array(pay, dtype=np.float64).reshape(len(self.extras), 2)
+        self.pay_low = pay[:, 0]
+        self.pay_high = pay[:, 1]
+
+        # (JSON bytes, version) per row, filled in when the row is first served
+        self.encoded = [None] * len(self.extras)
+
+    def row(self, row):
+        """The job dict of one row"""
+        columns = self.columns
+        extra = self.extras[row]
+        job = {}
+        for key in self.layouts.get(row):
+            if extra is not None and key in extra:
+                job[key] = extra[key]
+            else:
+                job[key] = columns[key].get(row)
+        return job
+
+    def encode(self, row):
+        """(JSON bytes, version) of one row, and whether this call encoded it"""
+        entry = self.encoded[row]
+        if entry is not None:
+            return entry, False
+        data = dumps(self.row(row))
+        entry = self.encoded[row] = (data, digest(data))
+        return entry, True
+
+class JobTable:
+    """Read-only sequence of job dicts backed by shared columns
+
+    Indexing returns a fresh dict; slicing and select() return views over the
+    same columns. Treat rows as read-only: they are rebuilt on every access.
+    """
+
+    __slots__ = ('_storage', '_rows')
+
+    def __init__(self, storage, rows):
+        self._storage = storage
+        self._rows = rows
+
+    @classmethod
+    def from_jobs(cls, jobs):
+        """Table of a list of job dicts, in order"""
+        storage = _Storage(jobs)
+        return cls(storage, np.arange(len(storage.extras), dtype=np.int32))
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        row = self._storage.row
+        for index in self._rows.tolist():
+            yield row(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return JobTable(self._storage, self._rows[index])
+        return self._storage.row(self._rows.item(index))
+
+    def select(self, keep):
+        """View of the rows keep(job) accepts
+
+        Salary filters (salary.salary_filter) are applied to the pay columns
+        without building any rows.
+        """
+        bounds = getattr(keep, 'bounds', None)
+        if bounds is None:
+            mask = np.fromiter((bool(keep(job)) for job in self), dtype=bool, count=len(self))
+        else:
+            min_salary, max_salary = bounds
+            low = self._storage.pay_low[self._rows]
+            high = self._storage.pay_high[self._rows]
+            mask = ~np.isnan(low)
+            if min_salary is not None:
+                mask &= high >= min_salary
+            if max_salary is not None:
+                mask &= low <= max_salary
+        return JobTable(self._storage, self._rows[mask])
+
+    def fragments(self):
+        """(JSON bytes of each row, number of rows encoded by this call)"""
+        encode = self._storage.encode
+        parts = []
+        encoded = 0
+        for index in self._rows.tolist():
+            (data, _), fresh = encode(index)
+            parts.append(data)
+            encoded += fresh
+        return parts, encoded
+
+    def versions(self):
+        """(content hash of each row's JSON, number of rows encoded by this call)"""
+        encode = self._storage.encode
+        result = []
+        encoded = 0
+        for index in self._rows.tolist():
+            (_, version), fresh = encode(index)
+            result.append(version)
+            encoded += fresh
+        return result, encoded
+
+    def __repr__(self):
+        return f"<JobTable of {len(self)} jobs>"
@@ -0,0 +1,104 @@
+"""
+Pre-encoded job JSON and search responses assembled from it
+Every job in a finished search payload (a job_table.JobTable) is encoded
+once, the first time a response includes it. Later responses (cache hits,
+cursor pages, salary-filtered views, cached streams) join those bytes around
+a small header instead of encoding the jobs again. Uses orjson when it is
+installed.
+"""
+
+import hashlib
+import json
+import threading
+
+from flask import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MIMETYPE = 'application/json'
+VERSION_BYTES = 8
+
+def _default(value):
+    # NumPy scalars from the JobSpy / scoring paths, dates from anywhere
+    if hasattr(value, 'item'):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(value):
+    """Compact UTF-8 JSON bytes of value"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def digest(data):
+    """Short content hash of encoded JSON, used as a job's version"""
+    return hashlib.blake2b(data, digest_size=VERSION_BYTES).digest()
+
+class _Counters:
+    """How often response jobs were encoded fresh vs reused"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.encoded = 0
+        self.reused = 0
+        self.missed = 0
+
+    def add(self, encoded=0, reused=0, missed=0):
+        with self._lock:
+            self.encoded += encoded
+            self.reused += reused
+            self.missed += missed
+
+    def clear(self):
+        with self._lock:
+            self.encoded = self.reused = self.missed = 0
+
+    def stats(self):
+        with self._lock:
+            return {"encoded": self.encoded, "reused": self.reused, "encodedOnRequest": self.missed}
+
+counters = _Counters()
+
+def join(jobs):
+    """JSON array bytes of jobs
+
+    A job_table.JobTable encodes each row once, the first time it is served,
+    and reuses the bytes afterwards. Plain lists (re-ranked copies, payloads
+    shared by other workers) are one-offs and are encoded every time.
+    """
+    if hasattr(jobs, 'fragments'):
+        parts, encoded = jobs.fragments()
+        counters.add(encoded=encoded, reused=len(parts) - encoded)
+    else:
+        parts = [dumps(job) for job in jobs]
+        counters.add(missed=len(parts))
+    return b'[' + b','.join(parts) + b']'
+
+def versions(jobs):
+    """Content hash of each job's JSON"""
+    if hasattr(jobs, 'versions'):
+        result, encoded = jobs.versions()
+        counters.add(encoded=encoded)
+        return result
+    return [digest(dumps(job)) for job in jobs]
+
+def stats():
+    """Counters for the health endpoint"""
+    return dict(encoder="orjson" if orjson is not None else "json", **counters.stats())
+
+def payload_bytes(payload):
+    """JSON bytes of a payload: its jobs joined from their fragments, the rest encoded fresh"""
+    header = dumps({key: value for key, value in payload.items() if key != "jobs"})
+    if "jobs" not in payload:
+        return header
+    separator = b',"jobs":' if len(header) > 2 else b'"jobs":'
+    return header[:-1] + separator + join(payload["jobs"]) + b'}'
+
+def json_response(payload, status=200):
+    """Flask JSON response for a search payload, like jsonify without re-encoding its jobs"""
+    return Response(payload_bytes(payload), status=status, mimetype=MIMETYPE)
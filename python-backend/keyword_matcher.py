@@ -0,0 +1,95 @@
+"""
+Shared multi-keyword matcher for skills, tags and remote detection
+Every vocabulary phrase is compiled into one word-bounded alternation regex,
+so a single pass over a text finds all of them ("git" no longer matches
+"digital" and "css" no longer matches "access")
+"""
+
+import re
+
+# Default vocabulary used by every scraper, grouped by what the phrase signals.
+# Phrases are lowercase; a phrase may appear in more than one category.
+DEFAULT_VOCABULARY = {
+    "skill": [
+        'react', 'javascript', 'typescript', 'python', 'node.js', 'next.js',
+        'html', 'css', 'tailwindcss', 'vue', 'angular', 'aws', 'docker', 'git',
+        'sql', 'mongodb', 'postgresql', 'redis', 'graphql', 'rest api', 'rest',
+        'api', 'django', 'flask', 'frontend', 'developer'
+    ],
+    "remote": ['remote', 'work from home', 'wfh', 'distributed', 'anywhere'],
+    "seniority": [
+        'senior', 'sr.', 'lead', 'principal', 'junior', 'jr.', 'entry', 'mid',
+        'intermediate'
+    ],
+    "job_type": [
+        'full time', 'full-time', 'permanent', 'part time', 'part-time',
+        'contract', 'contractor', 'freelance'
+    ],
+    "location": ['nashville', 'tennessee'],
+}
+
+# Alternate spellings reported as their canonical phrase
+DEFAULT_ALIASES = {
+    'reactjs': 'react',
+    'react.js': 'react',
+    'nodejs': 'node.js',
+    'nextjs': 'next.js',
+    'postgres': 'postgresql',
+    'work-from-home': 'work from home',
+    'fulltime': 'full-time',
+    'parttime': 'part-time',
+}
+
+class KeywordMatcher:
+    """Finds every vocabulary phrase in a text with one compiled regex"""
+
+    def __init__(self, vocabulary=None, aliases=None):
+        self.vocabulary = {
+            category: [phrase.lower() for phrase in phrases]
+            for category, phrases in (vocabulary or DEFAULT_VOCABULARY).items()
+        }
+        self.aliases = {alias.lower(): canonical.lower() for alias, canonical in (aliases or DEFAULT_ALIASES).items()}
+
+        canonical = {phrase for phrases in self.vocabulary.values() for phrase in phrases}
+        spellings = canonical | set(self.aliases)
+
+        # A long phrase also reports the shorter phrases it starts with
+        # ("rest api" -> "rest"), since only the longest match per position is seen
+        self._implied = {}
+        for spelling in spellings:
+            phrase = self.aliases.get(spelling, spelling)
+            implied = {phrase}
+            for other in canonical:
+                if other != spelling and spelling.startswith(other) and not spelling[len(other)].isalnum():
+                    implied.add(other)
+            self._implied[spelling] = frozenset(implied)
+
+        # Longest first so the alternation prefers "rest api" over "rest";
+        # the lookahead keeps matching zero-width so overlapping phrases are all found
+        alternation = '|'.join(re.escape(s) for s in sorted(spellings, key=len, reverse=True))
+        self.pattern = re.compile(r'(?=(?<![a-z0-9])(' + alternation + r')(?![a-z0-9]))')
+
+    def scan(self, *texts):
+        """Return the set of canonical phrases found in any of the texts"""
+        found = set()
+        for text in texts:
+            if text:
+                found |= self.scan_lowered(str(text).lower())
+        return found
+
+    def scan_lowered(self, text):
+        """scan() for one text that is already lowercase"""
+        found = set()
+        for match in self.pattern.finditer(text):
+            found |= self._implied[match.group(1)]
+        return found
+
+    def in_category(self, found, category):
+        """Phrases from a scan result that belong to one vocabulary category"""
+        return found.intersection(self.vocabulary.get(category, ()))
+
+    def select(self, found, names):
+        """Keep display names whose lowercase form was found, in the given order"""
+        return [name for name in names if self.aliases.get(name.lower(), name.lower()) in found]
+
+matcher = KeywordMatcher()
@@ -0,0 +1,123 @@
+"""
+Deferred imports for heavy dependencies and job source modules
+The apps name what they need at startup (a scraper function, pandas) but only
+import it the first time it is used, so a cold start can answer /api/health
+before jobspy, pandas, numpy, bs4 or lxml have loaded. warm_up() loads everything
+that is still pending on a background thread once the app is serving, so
+the first search usually doesn't pay for it either.
+"""
+
+import importlib
+import os
+import threading
+import time
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+class _Lazy:
+    """A module imported on first use; failures are remembered and re-raised"""
+
+    def __init__(self, module_name):
+        self.module_name = module_name
+        self._module = None
+        self._error = None
+        self._lock = threading.Lock()
+        self.load_ms = None
+
+    def load(self):
+        """The imported module; raises the import's error if it failed"""
+        if self._module is None:
+            with self._lock:
+                if self._module is None and self._error is None:
+                    started = time.perf_counter()
+                    try:
+                        self._module = importlib.import_module(self.module_name)
+                        print(f"✅ {self.module_name} imported successfully")
+                    except Exception as e:
+                        print(f"❌ Error importing {self.module_name}: {e}")
+                        self._error = e
+                    self.load_ms = round((time.perf_counter() - started) * 1000, 1)
+            if self._error is not None:
+                raise self._error
+        return self._module
+
+    def state(self):
+        if self._module is not None:
+            return "loaded"
+        return "failed" if self._error is not None else "pending"
+
+def _lazy(module_name):
+    """The one loader of a module, shared by every proxy for it"""
+    with _registry_lock:
+        lazy = _registry.get(module_name)
+        if lazy is None:
+            lazy = _registry[module_name] = _Lazy(module_name)
+        return lazy
+
+class LazyModule:
+    """Stands in for a module; the real one is imported on first attribute access"""
+
+    def __init__(self, module_name):
+        self._lazy = _lazy(module_name)
+
+    def __getattr__(self, name):
+        return getattr(self._lazy.load(), name)
+
+class LazyFunction:
+    """Stands in for module.attr; imported on first call
+
+    With a fallback, a module that fails to import is reported once and the
+    fallback is called instead, as the apps did with their guarded imports.
+    """
+
+    def __init__(self, module_name, attr, fallback=None):
+        self._lazy = _lazy(module_name)
+        self.attr = attr
+        self.fallback = fallback
+        self._function = None
+        self.__name__ = attr
+
+    def __call__(self, *args, **kwargs):
+        function = self._function
+        if function is None:
+            try:
+                function = getattr(self._lazy.load(), self.attr)
+            except Exception:
+                if self.fallback is None:
+                    raise
+                function = self.fallback
+            self._function = function
+        return function(*args, **kwargs)
+
+def module(module_name):
+    """Proxy for a module imported on first attribute access"""
+    return LazyModule(module_name)
+
+def function(module_name, attr, fallback=None):
+    """Proxy for a module-level function imported on first call"""
+    return LazyFunction(module_name, attr, fallback)
+
+def warm_up():
+    """Import every pending module on a daemon thread; set WARM_IMPORTS=0 to load strictly on first use"""
+    if os.environ.get('WARM_IMPORTS', '1') == '0':
+        return None
+
+    def run():
+        with _registry_lock:
+            pending = list(_registry.values())
+        for lazy in pending:
+            try:
+                lazy.load()
+            except Exception:
+                pass
+
+    thread = threading.Thread(target=run, name='import-warm-up', daemon=True)
+    thread.start()
+    return thread
+
+def stats():
+    """State and import time of every deferred module, for the health endpoint"""
+    with _registry_lock:
+        lazies = sorted(_registry.items())
+    return {name: {"state": lazy.state(), "loadMs": lazy.load_ms} for name, lazy in lazies}
@@ -2,44 +2,94 @@
 LinkedIn job scraper using RSS feeds and search URLs
 """
 
-import requests
-import xml.etree.ElementTree as ET
+import http_client
 from bs4 import BeautifulSoup
 import re
-import uuid
 from datetime import datetime, timedelta
 import urllib.parse
+import os
 
+from keyword_matcher import matcher
+from job_document import JobDocument
+from job_store import stable_job_id
+from salary import NO_SALARY
+from rss_stream import iter_rss_items
+from scoring import scored, scorer
+import metrics
+import upstream_guard
+
+# Overridable so benchmarks can point the scraper at a local stub server
+LINKEDIN_RSS_URL = os.environ.get('LINKEDIN_RSS_URL', 'https://www.linkedin.com/jobs/feed')
+LINKEDIN_SEARCH_URL = os.environ.get('LINKEDIN_SEARCH_URL', 'https://www.linkedin.com/jobs/search')
+
+upstream_guard.register_source("LinkedIn", LINKEDIN_RSS_URL, LINKEDIN_SEARCH_URL)
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+# Job card containers: any div whose class mentions job or card
+CARD_CLASS = re.compile(r'job|card', re.IGNORECASE)
+
+if etree is not None:
+    _CLASS_LOWER = "translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+    CARD_TITLE_XPATH = etree.XPath(f".//*[self::h3 or self::h2 or self::a][contains({_CLASS_LOWER}, 'job')]")
+    CARD_COMPANY_XPATH = etree.XPath(f".//*[self::span or self::div][contains({_CLASS_LOWER}, 'company')]")
+    CARD_LOCATION_XPATH = etree.XPath(f".//*[self::span or self::div][contains({_CLASS_LOWER}, 'location')]")
+    CARD_LINK_XPATH = etree.XPath(".//a/@href")
+    TEXT_XPATH = etree.XPath("string()")
+
+@scored
 def scrape_linkedin_jobs(search_term="developer", location="remote", limit=20):
-    """Scrape LinkedIn jobs using RSS and search"""
+    """Scrape LinkedIn jobs using RSS and search
+
+    Either method may fail on its own; if every method tried fails, the last
+    error is raised so the source is reported as failed rather than empty.
+    """
     try:
         jobs = []
+        fetched = False
+        last_error = None
         
         # Method 1: Try LinkedIn RSS (limited but official)
-        rss_jobs = scrape_linkedin_rss(search_term, location, limit // 2)
-        jobs.extend(rss_jobs)
+        try:
+            rss_jobs = scrape_linkedin_rss(search_term, location, limit // 2)
+            jobs.extend(rss_jobs)
+            fetched = True
+        except Exception as e:
+            last_error = e
         
         # Method 2: Try LinkedIn job search URLs (more risky but more data)
         if len(jobs) < limit:
             remaining = limit - len(jobs)
-            search_jobs = scrape_linkedin_search(search_term, location, remaining)
-            jobs.extend(search_jobs)
+            try:
+                search_jobs = scrape_linkedin_search(search_term, location, remaining)
+                jobs.extend(search_jobs)
+                fetched = True
+            except Exception as e:
+                last_error = e
+        
+        if not fetched and last_error is not None:
+            raise last_error
         
         print(f"Total LinkedIn jobs found: {len(jobs)}")
         return jobs[:limit]
         
     except Exception as e:
         print(f"LinkedIn scraping error: {e}")
-        return []
+        raise
 
 def scrape_linkedin_rss(search_term, location, limit):
-    """Try LinkedIn RSS feeds (limited availability)"""
+    """Try LinkedIn RSS feeds (limited availability); raises if no feed could be read"""
     jobs = []
+    fetched = False
+    last_error = None
     
     try:
         # LinkedIn company RSS feeds (if available)
         rss_urls = [
-            "https://www.linkedin.com/jobs/feed",  # General feed (may not work)
+            LINKEDIN_RSS_URL,  # General feed (may not work)
         ]
         
         for url in rss_urls:
@@ -49,27 +99,33 @@ def scrape_linkedin_rss(search_term, location, limit):
                     'Accept': 'application/rss+xml, application/xml'
                 }
                 
-                response = requests.get(url, headers=headers, timeout=10)
+                response = http_client.get(url, headers=headers, timeout=10, stream=True)
                 if response.status_code == 200:
-                    root = ET.fromstring(response.content)
-                    items = root.findall('.//item')
-                    
-                    for item in items[:limit]:
+                    for item in metrics.timed_iter(iter_rss_items(response, limit)):
                         job = parse_linkedin_rss_item(item)
                         if job:
                             jobs.append(job)
+                    fetched = True
+                else:
+                    response.close()
+                    last_error = RuntimeError(f"LinkedIn RSS error: {response.status_code}")
                             
             except Exception as e:
                 print(f"LinkedIn RSS error: {e}")
+                last_error = e
                 continue
+        
+        if not fetched and not jobs and last_error is not None:
+            raise last_error
                 
     except Exception as e:
         print(f"LinkedIn RSS scraping error: {e}")
+        raise
     
     return jobs
 
 def scrape_linkedin_search(search_term, location, limit):
-    """Scrape LinkedIn job search results (be careful with rate limits)"""
+    """Scrape LinkedIn job search results (be careful with rate limits); raises if the search fails"""
     jobs = []
     
     try:
@@ -78,7 +134,7 @@ def scrape_linkedin_search(search_term, location, limit):
         location_encoded = urllib.parse.quote_plus(location)
         
         # LinkedIn job search URL structure
-        base_url = "https://www.linkedin.com/jobs/search"
+        base_url = LINKEDIN_SEARCH_URL
         params = {
             'keywords': search_term,
             'location': location,
@@ -93,112 +149,192 @@ def scrape_linkedin_search(search_term, location, limit):
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
         
         print(f"Trying LinkedIn search: {url}")
         
-        # Make request with session for better success rate
-        session = requests.Session()
-        response = session.get(url, headers=headers, timeout=15)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for job cards in LinkedIn's HTML structure
-            job_cards = soup.find_all(['div'], class_=lambda x: x and ('job' in x.lower() or 'card' in x.lower()))
-            
-            print(f"Found {len(job_cards)} potential job elements")
+        # Shared pooled session keeps the connection and cookies between searches
+        response = http_client.get(url, headers=headers, timeout=15, stream=True)
+        try:
+            if response.status_code != 200:
+                print(f"LinkedIn search failed: {response.status_code}")
+                raise RuntimeError(f"LinkedIn search failed: {response.status_code}")
             
-            for card in job_cards[:limit]:
-                job = parse_linkedin_job_card(card, search_term)
-                if job:
-                    jobs.append(job)
-                    
-        else:
-            print(f"LinkedIn search failed: {response.status_code}")
+            with metrics.stage('parse'):
+                if etree is not None:
+                    # Partial lxml parse straight off the socket, stopping after `limit` cards
+                    cards = extract_linkedin_cards(response.iter_content(16384), limit, response_encoding(response))
+                else:
+                    cards = extract_linkedin_cards_bs4(response.content, limit)
+        finally:
+            # Release the pooled connection however the page was (or wasn't) read
+            response.close()
+        metrics.count_parsed(len(cards))
+        
+        print(f"Found {len(cards)} potential job elements")
+        
+        for fields in cards:
+            job = parse_linkedin_job_card(fields, search_term)
+            if job:
+                jobs.append(job)
             
     except Exception as e:
         print(f"LinkedIn search scraping error: {e}")
+        raise
     
     return jobs
 
+@metrics.timed('convert')
 def parse_linkedin_rss_item(item):
     """Parse LinkedIn RSS item"""
     try:
         title = item.find('title')
-        title_text = title.text if title else 'Developer'
+        title_text = title.text if title is not None else 'Developer'
         
         link = item.find('link') 
-        link_url = link.text if link else '#'
+        link_url = link.text if link is not None else '#'
         
         description = item.find('description')
-        desc_text = description.text if description else ''
+        doc = JobDocument(description=description.text if description is not None else '')
         
         # Extract company from title (LinkedIn format varies)
         company_match = re.search(r'at (.+?)(?:\s*-|\s*$)', title_text)
         company = company_match.group(1) if company_match else 'LinkedIn Company'
         
         job = {
-            "id": str(uuid.uuid4()),
+            "id": stable_job_id(link_url, clean_job_title(title_text), company.strip()),
             "title": clean_job_title(title_text),
             "company": company.strip(),
             "location": "Remote",
             "salary": "Salary not specified",
+            **NO_SALARY,
             "postedDate": datetime.now().isoformat(),
             "source": "LinkedIn",
-            "description": clean_html_description(desc_text)[:500],
-            "requirements": extract_skills_from_text(desc_text),
+            "description": doc.clean('description')[:500],
+            "requirements": extract_skills_from_text(doc),
             "isRemote": True,
-            "relevanceScore": calculate_linkedin_relevance(title_text, desc_text),
+            "relevanceScore": 0,  # set for the whole batch by scoring
             "applicationStatus": "not_applied",
             "tags": ["LinkedIn", "Professional"],
             "url": link_url
         }
         
+        # Scoring reads its features from this document instead of the dict
+        scorer.prime(job, doc)
         return job
         
     except Exception as e:
         print(f"Error parsing LinkedIn RSS item: {e}")
         return None
 
-def parse_linkedin_job_card(card, search_term):
-    """Parse LinkedIn job card from HTML"""
-    try:
+def response_encoding(response):
+    """Charset declared by the server, defaulting HTML to UTF-8 rather than Latin-1"""
+    if 'charset' in response.headers.get('Content-Type', '').lower():
+        return response.encoding
+    return 'utf-8'
+
+def extract_linkedin_cards(chunks, limit, encoding='utf-8'):
+    """Extract job card fields from streamed HTML chunks with lxml
+
+    Card containers are matched on their start tag, in document order, with
+    the same rule as the BeautifulSoup path (a div whose class mentions job
+    or card). Parsing stops as soon as the first `limit` cards are closed,
+    so the rest of the page is never read or built into a tree.
+    """
+    if limit <= 0:
+        return []
+    
+    parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding)
+    cards = []
+    open_cards = set()
+    
+    def collect():
+        for event, elem in parser.read_events():
+            if event == 'start':
+                if len(cards) < limit and elem.tag == 'div' and CARD_CLASS.search(elem.get('class', '')):
+                    cards.append(elem)
+                    open_cards.add(elem)
+            else:
+                open_cards.discard(elem)
+    
+    for chunk in chunks:
+        parser.feed(chunk)
+        collect()
+        if len(cards) >= limit and not open_cards:
+            break
+    else:
+        # End of page: flush whatever the parser is still holding
+        parser.close()
+        collect()
+    
+    return [read_linkedin_card(card) for card in cards]
+
+def read_linkedin_card(card):
+    """Pull title, company, location and link out of an lxml job card"""
+    title_elems = CARD_TITLE_XPATH(card)
+    company_elems = CARD_COMPANY_XPATH(card)
+    location_elems = CARD_LOCATION_XPATH(card)
+    links = CARD_LINK_XPATH(card)
+    
+    return {
+        "title": TEXT_XPATH(title_elems[0]).strip() if title_elems else None,
+        "company": TEXT_XPATH(company_elems[0]).strip() if company_elems else None,
+        "location": TEXT_XPATH(location_elems[0]).strip() if location_elems else None,
+        "url": links[0] if links else None
+    }
+
+def extract_linkedin_cards_bs4(content, limit):
+    """Extract job card fields with BeautifulSoup (used when lxml is unavailable)"""
+    soup = BeautifulSoup(content, 'html.parser')
+    
+    # Look for job cards in LinkedIn's HTML structure
+    job_cards = soup.find_all(['div'], class_=lambda x: x and ('job' in x.lower() or 'card' in x.lower()))
+    
+    cards = []
+    for card in job_cards[:limit]:
         # This is challenging as LinkedIn's HTML structure changes frequently
         # Look for common patterns
-        
         title_elem = card.find(['h3', 'h2', 'a'], class_=lambda x: x and 'job' in x.lower())
-        title = title_elem.get_text().strip() if title_elem else f"{search_term.title()} Position"
-        
-        company_elem = card.find(['span', 'div'], class_=lambda x: x and 'company' in x.lower())  
-        company = company_elem.get_text().strip() if company_elem else 'LinkedIn Company'
-        
+        company_elem = card.find(['span', 'div'], class_=lambda x: x and 'company' in x.lower())
         location_elem = card.find(['span', 'div'], class_=lambda x: x and 'location' in x.lower())
-        location = location_elem.get_text().strip() if location_elem else 'Remote'
-        
-        # Try to find job link
         link_elem = card.find('a', href=True)
-        job_url = link_elem['href'] if link_elem else '#'
+        
+        cards.append({
+            "title": title_elem.get_text().strip() if title_elem else None,
+            "company": company_elem.get_text().strip() if company_elem else None,
+            "location": location_elem.get_text().strip() if location_elem else None,
+            "url": link_elem['href'] if link_elem else None
+        })
+    
+    return cards
+
+@metrics.timed('convert')
+def parse_linkedin_job_card(fields, search_term):
+    """Build a job from extracted LinkedIn card fields"""
+    try:
+        title = fields["title"] if fields["title"] is not None else f"{search_term.title()} Position"
+        company = fields["company"] if fields["company"] is not None else 'LinkedIn Company'
+        location = fields["location"] if fields["location"] is not None else 'Remote'
+        job_url = fields["url"] if fields["url"] is not None else '#'
         
         # Make relative URLs absolute
         if job_url.startswith('/'):
             job_url = f"https://www.linkedin.com{job_url}"
         
         job = {
-            "id": str(uuid.uuid4()),
+            "id": stable_job_id(job_url, clean_job_title(title), company),
             "title": clean_job_title(title),
             "company": company,
             "location": location,
             "salary": "Competitive salary",
+            **NO_SALARY,
             "postedDate": (datetime.now() - timedelta(days=1)).isoformat(),
             "source": "LinkedIn",
             "description": f"Professional {search_term} opportunity at {company}. Join a dynamic team and advance your career with this exciting role.",
             "requirements": generate_linkedin_skills(search_term),
             "isRemote": 'remote' in location.lower(),
-            "relevanceScore": calculate_linkedin_relevance(title, search_term),
+            "relevanceScore": 0,  # set for the whole batch by scoring
             "applicationStatus": "not_applied",
             "tags": ["LinkedIn", "Professional", "Network"],
             "url": job_url
@@ -216,23 +352,10 @@ def clean_job_title(title):
     title = re.sub(r'\s+at\s+.+$', '', title)
     return title.strip()
 
-def clean_html_description(text):
-    """Clean HTML from description"""
-    if not text:
-        return ""
-    # Remove HTML tags
-    clean_text = re.sub(r'<[^>]+>', '', text)
-    return ' '.join(clean_text.split())
-
-def extract_skills_from_text(text):
-    """Extract skills from text"""
+def extract_skills_from_text(doc):
+    """Extract skills from a JobDocument's description"""
     skills = ['React', 'JavaScript', 'Python', 'TypeScript', 'Node.js', 'CSS', 'HTML', 'Git', 'AWS']
-    found_skills = []
-    text_lower = text.lower() if text else ''
-    
-    for skill in skills:
-        if skill.lower() in text_lower:
-            found_skills.append(skill)
+    found_skills = matcher.select(doc.found('description'), skills)
     
     return found_skills[:6]
 
@@ -253,23 +376,6 @@ def generate_linkedin_skills(search_term):
     
     return ['JavaScript', 'React', 'CSS', 'HTML']
 
-def calculate_linkedin_relevance(title, description):
-    """Calculate relevance score"""
-    score = 75  # Higher base for LinkedIn (professional network)
-    
-    if title:
-        title_lower = title.lower()
-        if any(word in title_lower for word in ['senior', 'lead', 'principal']):
-            score += 10
-        elif any(word in title_lower for word in ['junior', 'entry']):
-            score += 5
-        
-        # Tech keywords
-        if any(word in title_lower for word in ['react', 'javascript', 'frontend', 'developer']):
-            score += 8
-    
-    return min(95, score)
-
 if __name__ == "__main__":
     # Test the scraper
     jobs = scrape_linkedin_jobs("react developer", "remote", 3)
@@ -0,0 +1,296 @@
+"""
+In-process Prometheus metrics for job sources, scraper stages and the API
+Counters and histograms are rendered in the Prometheus text format by
+/api/metrics, without needing the prometheus_client package
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from urllib.parse import urlsplit
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; covers cached responses (ms) up to the search deadline
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 15, 30)
+
+_registry = []
+_local = threading.local()
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _number(value):
+    if isinstance(value, float) and value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonic counter with a fixed set of label names"""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in values:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}")
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram with a fixed set of label names"""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket..., count over the last bucket, sum]
+        self._series = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[:-1]) if series else 0
+
+    def render(self):
+        with self._lock:
+            snapshot = sorted((labels, list(series)) for labels, series in self._series.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series[:-1]):
+                cumulative += count
+                le = 'le="' + (bound if bound == '+Inf' else _number(float(bound))) + '"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(round(series[-1], 6))}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+REQUEST_DURATION = Histogram(
+    'jobseek_request_duration_seconds',
+    'API request latency, until the response body is fully sent',
+    ['endpoint', 'status', 'cache']
+)
+REQUEST_ERRORS = Counter(
+    'jobseek_request_errors_total',
+    'API requests that hit an unexpected exception',
+    ['endpoint']
+)
+SOURCE_RUNS = Counter(
+    'jobseek_source_runs_total',
+    'Source scrapes by outcome within the search deadline (ok, error, timeout)',
+    ['source', 'status']
+)
+SOURCE_DURATION = Histogram(
+    'jobseek_source_duration_seconds',
+    'Wall time of one source scrape, including ones that overran the deadline',
+    ['source']
+)
+STAGE_DURATION = Histogram(
+    'jobseek_stage_duration_seconds',
+    'Time one source scrape spent in each stage (fetch, parse, convert, score, search)',
+    ['source', 'stage']
+)
+SOURCE_ITEMS = Counter(
+    'jobseek_source_items_total',
+    'Items parsed from upstream responses and jobs returned by each source',
+    ['source', 'kind']
+)
+UPSTREAM_RESPONSES = Counter(
+    'jobseek_upstream_responses_total',
+    'Upstream HTTP responses by status code, or timeout / error when none arrived',
+    ['source', 'status']
+)
+
+class SourceRun:
+    """Stage timings and item counts for one source scrape on the current thread
+
+    Stages may nest (score inside convert); each stage is charged only for
+    its own time, so the stages of a run add up to at most its duration.
+    Everything is recorded once, when the run ends.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.stages = {}
+        self.parsed = 0
+        self.returned = None
+        self._stack = []
+        self._previous = None
+        self._started = None
+
+    def __enter__(self):
+        self._previous = getattr(_local, 'run', None)
+        _local.run = self
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._started
+        _local.run = self._previous
+
+        SOURCE_DURATION.observe(elapsed, self.source)
+        for stage_name, seconds in self.stages.items():
+            STAGE_DURATION.observe(seconds, self.source, stage_name)
+        if self.parsed:
+            SOURCE_ITEMS.inc(self.source, 'parsed', amount=self.parsed)
+        if self.returned is not None:
+            SOURCE_ITEMS.inc(self.source, 'returned', amount=self.returned)
+        return False
+
+    def start(self, stage_name):
+        self._stack.append([stage_name, time.perf_counter(), 0.0])
+
+    def stop(self):
+        stage_name, started, nested = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        self.stages[stage_name] = self.stages.get(stage_name, 0.0) + elapsed - nested
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+def track_source(source):
+    """Context manager attributing stages, fetches and items on this thread to source"""
+    return SourceRun(source)
+
+def current_source():
+    """Name of the source being scraped on this thread, if any"""
+    run = getattr(_local, 'run', None)
+    return run.source if run is not None else None
+
+class _Stage:
+    __slots__ = ('name', 'run')
+
+    def __init__(self, name):
+        self.name = name
+        self.run = None
+
+    def __enter__(self):
+        self.run = getattr(_local, 'run', None)
+        if self.run is not None:
+            self.run.start(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        if self.run is not None:
+            self.run.stop()
+        return False
+
+def stage(name):
+    """Context manager timing a stage of the current source run (no-op outside one)"""
+    return _Stage(name)
+
+def timed(stage_name):
+    """Decorator timing every call of a function as a stage of the current source run"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            run = getattr(_local, 'run', None)
+            if run is None:
+                return fn(*args, **kwargs)
+            run.start(stage_name)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                run.stop()
+        return wrapper
+    return decorate
+
+def timed_iter(iterable, stage_name='parse'):
+    """Yield from iterable, timing each step as a stage and counting items as parsed
+
+    Only the time spent producing items is charged; whatever the caller does
+    with each item between steps is not.
+    """
+    run = getattr(_local, 'run', None)
+    if run is None:
+        yield from iterable
+        return
+
+    iterator = iter(iterable)
+    while True:
+        run.start(stage_name)
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            run.stop()
+        run.parsed += 1
+        yield item
+
+def count_parsed(n):
+    """Count items parsed from an upstream response for the current source run"""
+    run = getattr(_local, 'run', None)
+    if run is not None:
+        run.parsed += n
+
+def record_upstream(url, status):
+    """Count one upstream response (status code) or failure (timeout / error)"""
+    source = current_source() or urlsplit(url).hostname or 'unknown'
+    UPSTREAM_RESPONSES.inc(source, str(status))
+
+def instrument_app(app):
+    """Record the latency of every request to a Flask app, streamed bodies included"""
+    from flask import g, request
+
+    @app.before_request
+    def _start_timer():
+        # Under asgi.py a search may have waited on upstreams before reaching Flask
+        scope = request.environ.get('asgi.scope')
+        started = scope.get('jobseek.started') if scope else None
+        g.metrics_started = started if started is not None else time.perf_counter()
+
+    @app.after_request
+    def _record_latency(response):
+        started = g.get('metrics_started')
+        if started is None:
+            return response
+
+        rule = request.url_rule
+        labels = (rule.rule if rule is not None else 'unmatched', str(response.status_code), g.get('cache_state', 'none'))
+        # Runs once the body has been sent, so streamed responses count their full duration
+        response.call_on_close(lambda: REQUEST_DURATION.observe(time.perf_counter() - started, *labels))
+        return response
+
+    return app
+
+def render():
+    """Every registered metric in the Prometheus text exposition format"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
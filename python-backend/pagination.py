@@ -0,0 +1,201 @@
+"""
+Cursor pagination over materialized search results
+The first page of a search stores its full ranked result list as a snapshot
+and returns an opaque cursor; later pages are slices of that snapshot, so
+they never re-scrape and always agree with the pages before them
+"""
+
+import base64
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from flask import g, jsonify
+
+from conditional import conditional_page, page_etag
+
+class InvalidCursor(ValueError):
+    """A cursor that was not issued by this server"""
+
+def encode_cursor(snapshot_id, offset):
+    """Opaque cursor for the page of a snapshot starting at offset"""
+    raw = f"{snapshot_id}:{offset}".encode('ascii')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """(snapshot_id, offset) of a cursor; raises InvalidCursor if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii')
+        snapshot_id, offset = raw.split(':')
+        offset = int(offset)
+    except Exception:
+        raise InvalidCursor(f"Malformed cursor: {cursor!r}")
+    if offset < 0:
+        raise InvalidCursor(f"Malformed cursor: {cursor!r}")
+    return snapshot_id, offset
+
+def _timestamp(seconds):
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat()
+
+class SnapshotStore:
+    """Bounded, expiring snapshots of search payloads, addressed by cursor
+
+    A snapshot keeps a reference to the payload it was made from (payloads
+    are never mutated once built, so nothing is copied) and expires ttl
+    seconds after it was created, however often it is paged through.
+    First pages of the same cached payload share one snapshot, so a popular
+    query doesn't push everyone else's snapshots out.
+    """
+
+    def __init__(self, ttl=900, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # snapshot_id -> (expires_at, payload, source, share_key)
+        self._snapshots = OrderedDict()
+        # share_key -> snapshot_id of the snapshot new first pages reuse
+        self._shared = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.served = 0
+        self.expired = 0
+
+    def first_page(self, payload, limit, source=None, variant=None, **extra):
+        """Response for the first page of payload, with a cursor if there are more
+
+        source is the cached payload that payload was derived from and
+        variant a hashable description of how (filters, weights). First pages
+        with the same source and variant reuse one snapshot while it has at
+        least half its ttl left; after that a new one is started, and the old
+        one lives on for the cursors already handed out.
+        """
+        jobs = payload.get("jobs", [])
+        if len(jobs) <= limit:
+            return self._page(payload, jobs, None, 0, limit, None, extra)
+
+        share_key = (id(source), variant) if source is not None else None
+        now = time.time()
+        with self._lock:
+            snapshot_id = self._shared.get(share_key) if share_key is not None else None
+            entry = self._snapshots.get(snapshot_id) if snapshot_id is not None else None
+            if entry is not None and entry[2] is source and entry[0] - now >= self.ttl / 2:
+                self._snapshots.move_to_end(snapshot_id)
+                self.reused += 1
+                expires_at, payload = entry[0], entry[1]
+            else:
+                snapshot_id = secrets.token_urlsafe(9)
+                expires_at = now + self.ttl
+                self._snapshots[snapshot_id] = (expires_at, payload, source, share_key)
+                if share_key is not None:
+                    self._shared[share_key] = snapshot_id
+                while len(self._snapshots) > self.max_entries:
+                    self._drop(next(iter(self._snapshots)))
+                self.created += 1
+        return self._page(payload, payload.get("jobs", []), snapshot_id, 0, limit, expires_at, extra)
+
+    def _drop(self, snapshot_id):
+        """Forget a snapshot; the caller holds the lock"""
+        entry = self._snapshots.pop(snapshot_id)
+        share_key = entry[3]
+        if share_key is not None and self._shared.get(share_key) == snapshot_id:
+            del self._shared[share_key]
+
+    def page(self, cursor, limit):
+        """Response for the page a cursor points at, or None if its snapshot expired
+
+        Raises InvalidCursor for cursors this server could not have issued.
+        """
+        entry = self.lookup(cursor)
+        return self.page_of(entry, limit) if entry is not None else None
+
+    def lookup(self, cursor):
+        """(snapshot_id, offset, expires_at, payload) a cursor points at, or None if its snapshot expired
+
+        Raises InvalidCursor for cursors this server could not have issued.
+        """
+        snapshot_id, offset = decode_cursor(cursor)
+        with self._lock:
+            entry = self._snapshots.get(snapshot_id)
+            if entry is not None and entry[0] < time.time():
+                self._drop(snapshot_id)
+                entry = None
+            if entry is None:
+                self.expired += 1
+                return None
+            self.served += 1
+
+        expires_at, payload = entry[0], entry[1]
+        return snapshot_id, offset, expires_at, payload
+
+    def alive(self, snapshot_id):
+        """True while a snapshot can still be paged through"""
+        with self._lock:
+            entry = self._snapshots.get(snapshot_id)
+            return entry is not None and entry[0] >= time.time()
+
+    def snapshot_of(self, page):
+        """Snapshot ID behind a page's nextCursor, or None for a last page"""
+        cursor = page.get("nextCursor")
+        return decode_cursor(cursor)[0] if cursor else None
+
+    def page_of(self, entry, limit):
+        """Response for a lookup() result"""
+        snapshot_id, offset, expires_at, payload = entry
+        return self._page(payload, payload.get("jobs", []), snapshot_id, offset, limit, expires_at, {})
+
+    def _page(self, payload, jobs, snapshot_id, offset, limit, expires_at, extra):
+        end = offset + limit
+        has_more = snapshot_id is not None and end < len(jobs)
+
+        response = {key: value for key, value in payload.items() if key != "jobs"}
+        response.update(extra)
+        response.update({
+            "jobs": jobs[offset:end],
+            "total": len(jobs),
+            "offset": offset,
+            "limit": limit,
+            "hasMore": has_more,
+            "nextCursor": encode_cursor(snapshot_id, end) if has_more else None,
+            "snapshotExpiresAt": _timestamp(expires_at) if expires_at is not None else None
+        })
+        return response
+
+    def clear(self):
+        """Drop every snapshot and reset counters"""
+        with self._lock:
+            self._snapshots.clear()
+            self._shared.clear()
+            self.created = self.reused = self.served = self.expired = 0
+
+    def stats(self):
+        """Counters for the health endpoint"""
+        with self._lock:
+            return {
+                "entries": len(self._snapshots),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl,
+                "created": self.created,
+                "reused": self.reused,
+                "pagesServed": self.served,
+                "expiredLookups": self.expired
+            }
+
+def cursor_response(cursor, limit):
+    """Flask response for a ?cursor= request: the page (or 304), or 400 / 410 for bad or expired cursors"""
+    g.cache_state = 'snapshot'
+    try:
+        entry = snapshot_store.lookup(cursor)
+    except InvalidCursor as e:
+        return jsonify({"error": str(e), "jobs": [], "total": 0}), 400
+    if entry is None:
+        return jsonify({"error": "Cursor expired; start the search again", "jobs": [], "total": 0}), 410
+    _, offset, _, payload = entry
+    return conditional_page(page_etag(payload, offset, limit), lambda: snapshot_store.page_of(entry, limit))
+
+snapshot_store = SnapshotStore(
+    ttl=float(os.environ.get('SEARCH_SNAPSHOT_TTL', 900)),
+    max_entries=int(os.environ.get('SEARCH_SNAPSHOT_MAX_ENTRIES', 256))
+)
@@ -0,0 +1,150 @@
+"""
+Process-wide RemoteOK feed snapshot with an in-memory inverted index
+The feed is downloaded once per refresh interval and shared by every search
+"""
+
+import os
+import re
+import threading
+import time
+
+import http_client
+
+REMOTEOK_API_URL = os.environ.get('REMOTEOK_API_URL', "https://remoteok.com/api")
+REFRESH_INTERVAL = float(os.environ.get('REMOTEOK_REFRESH_SECONDS', 300))
+
+# Terms every RemoteOK search also matches, on top of the user's query
+DEFAULT_TERMS = ['react', 'javascript', 'frontend', 'developer']
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*')
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+def tokenize(text):
+    """Split text into lowercase search tokens (keeps node.js, c++, c# intact)"""
+    return TOKEN_PATTERN.findall(TAG_PATTERN.sub(' ', str(text)).lower())
+
+def fetch_remoteok_feed():
+    """Download the RemoteOK API payload and return its job postings"""
+    headers = {
+        'User-Agent': 'JobSeek/1.0 (https://jobseek1-0.vercel.app)',
+        'Accept': 'application/json',
+    }
+
+    print(f"Fetching from RemoteOK: {REMOTEOK_API_URL}")
+    response = http_client.get(REMOTEOK_API_URL, headers=headers, timeout=15)
+    print(f"RemoteOK response status: {response.status_code}")
+
+    if response.status_code != 200:
+        raise RuntimeError(f"RemoteOK API error: {response.status_code}")
+
+    data = response.json()
+    print(f"RemoteOK returned {len(data)} total items")
+
+    # First item is metadata
+    return [item for item in data[1:] if isinstance(item, dict)]
+
+def build_index(postings):
+    """Map each token to the ascending list of posting positions containing it"""
+    index = {}
+    for position, posting in enumerate(postings):
+        text = ' '.join([
+            str(posting.get('position', '')),
+            ' '.join(str(tag) for tag in posting.get('tags', []) or []),
+            str(posting.get('company', '')),
+            str(posting.get('description', '')),
+        ])
+        for token in set(tokenize(text)):
+            index.setdefault(token, []).append(position)
+    return index
+
+class RemoteOKStore:
+    """Shared RemoteOK snapshot refreshed on a background schedule"""
+
+    def __init__(self, fetch=fetch_remoteok_feed, refresh_interval=REFRESH_INTERVAL):
+        self.fetch = fetch
+        self.refresh_interval = refresh_interval
+        # (postings, index, fetched_at) swapped atomically on refresh
+        self._snapshot = None
+        self._refresh_lock = threading.Lock()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self.downloads = 0
+        self.failures = 0
+
+    def refresh(self):
+        """Download the feed and rebuild the index, keeping the old snapshot on failure"""
+        with self._refresh_lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self):
+        try:
+            postings = self.fetch()
+            self.downloads += 1
+        except Exception as e:
+            self.failures += 1
+            print(f"Error refreshing RemoteOK feed: {e}")
+            return False
+
+        self._snapshot = (postings, build_index(postings), time.time())
+        print(f"Indexed {len(postings)} RemoteOK postings")
+        return True
+
+    def start(self):
+        """Start the background refresh thread once per process"""
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='remoteok-refresh', daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.refresh_interval)
+            self.refresh()
+
+    def snapshot(self):
+        """Current snapshot, loading it inline the first time it is needed"""
+        if self._snapshot is None:
+            with self._refresh_lock:
+                # Concurrent first searches share one download
+                if self._snapshot is None:
+                    self._refresh_locked()
+            self.start()
+        return self._snapshot
+
+    def search(self, search_term, limit):
+        """Return up to limit postings, in feed order, matching the query or a default term
+
+        Raises RuntimeError while no snapshot has ever been downloaded.
+        """
+        snapshot = self.snapshot()
+        if snapshot is None:
+            raise RuntimeError("RemoteOK feed unavailable")
+
+        postings, index, _ = snapshot
+
+        # Every token of the user's query must match; default terms match on their own
+        term_groups = [tokenize(search_term)] + [[term] for term in DEFAULT_TERMS]
+
+        matches = set()
+        for group in term_groups:
+            if not group:
+                continue
+            group_matches = set(index.get(group[0], ()))
+            for token in group[1:]:
+                group_matches.intersection_update(index.get(token, ()))
+            matches.update(group_matches)
+
+        return [postings[position] for position in sorted(matches)[:limit]]
+
+    def stats(self):
+        """Snapshot size and age for diagnostics"""
+        snapshot = self._snapshot
+        return {
+            "postings": len(snapshot[0]) if snapshot else 0,
+            "tokens": len(snapshot[1]) if snapshot else 0,
+            "ageSeconds": int(time.time() - snapshot[2]) if snapshot else None,
+            "downloads": self.downloads,
+            "failures": self.failures
+        }
+
+remoteok_store = RemoteOKStore()
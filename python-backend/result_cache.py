@@ -0,0 +1,275 @@
+"""
+In-process search result cache with TTL, LRU eviction and stale-while-revalidate
+Concurrent misses for the same key are coalesced: the first computes, the
+rest wait for its result. With SEARCH_LOCK_DIR set, that also holds across
+processes (gunicorn workers) sharing the directory.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+try:
+    import fcntl
+except ImportError:  # Windows: coalescing stays per process
+    fcntl = None
+
+def make_search_key(search_term, location, limit):
+    """Normalize a (search, location, limit) query into a cache key"""
+    return (
+        ' '.join(str(search_term).lower().split()),
+        ' '.join(str(location).lower().split()),
+        int(limit)
+    )
+
+class FileLocks:
+    """Cross-process single flight through one lock file per key
+
+    The process holding a key's lock computes it and leaves the result next
+    to the lock as JSON; processes that had to wait for the lock read that
+    result instead of computing again. Result files older than max_age are
+    swept as new ones are written.
+    """
+
+    def __init__(self, directory, max_age=3600):
+        self.directory = directory
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(repr(key).encode('utf-8')).hexdigest())
+
+    def run(self, key, compute):
+        """(value, computed_here) for key, computing it only if no other process just did"""
+        path = self._path(key)
+        waiting_since = time.time()
+        with open(path + '.lock', 'a') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Another process is computing this key; wait for it and take its result
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                value = self._read(path + '.json', waiting_since)
+                if value is not None:
+                    return value, False
+            try:
+                value = compute()
+                self._write(path + '.json', value)
+                return value, True
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read(self, path, newer_than):
+        try:
+            if os.path.getmtime(path) < newer_than:
+                return None
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path, value):
+        try:
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'w') as f:
+                # Job tables (job_table.JobTable) are shared as plain lists of jobs
+                json.dump(value, f, default=list)
+            os.replace(tmp, path)
+            self._sweep()
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Could not share search result {path}: {e}")
+
+    def _sweep(self):
+        cutoff = time.time() - self.max_age
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.name.endswith('.json') and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+class ResultCache:
+    """Bounded LRU cache whose expired entries are served stale while refreshing in the background
+
+    Misses are single-flight per key: while one caller computes a key,
+    other callers for it wait on the same Future and get its result.
+    """
+
+    def __init__(self, ttl=300, max_entries=128, stale_ttl=3600, lock_dir=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.file_locks = FileLocks(lock_dir, max_age=stale_ttl) if lock_dir and fcntl is not None else None
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.coalesced = 0
+
+    def get_or_compute(self, key, compute, should_cache=None):
+        """Return (value, state) where state is hit, stale, miss or coalesced
+
+        A fresh entry is a hit. An expired entry younger than stale_ttl is
+        returned as-is and refreshed on a background thread. Anything else is
+        computed inline, unless the same key is already being computed, in
+        which case this waits for that result (coalesced). should_cache(value)
+        can veto storing a result.
+        """
+        value, state = self.lookup(key, compute, should_cache)
+        if state != "miss":
+            return value, state
+        return self.compute_missed(key, compute, should_cache)
+
+    def compute_missed(self, key, compute, should_cache=None):
+        """(value, state) for a key lookup() just missed: joins its in-flight computation or runs it
+
+        For callers that did their own lookup, so the miss is counted once.
+        """
+        future, leader = self.join_flight(key)
+        state = self.run_flight(key, future, compute, should_cache) if leader else "coalesced"
+        return future.result(), state
+
+    def join_flight(self, key):
+        """(Future, leader) for the in-flight computation of key
+
+        The leader (the first caller) must complete the Future with
+        run_flight; everyone else just waits on it. A fresh entry stored
+        since the caller's lookup (a leader that just finished) is returned
+        as an already completed Future instead of starting another flight.
+        """
+        with self._lock:
+            future = self._flights.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.coalesced += 1
+                future = Future()
+                future.set_running_or_notify_cancel()
+                future.set_result(entry[1])
+                return future, False
+            future = self._flights[key] = Future()
+            # Running futures can't be cancelled, so one waiter giving up never fails the rest
+            future.set_running_or_notify_cancel()
+            return future, True
+
+    def run_flight(self, key, future, compute, should_cache=None):
+        """Compute key for everyone waiting on future, caching the result if should_cache allows
+
+        Returns the leader's cache state: miss, or coalesced when another
+        process computed the result. Errors go to the Future, not the caller.
+        """
+        state = "miss"
+        try:
+            if self.file_locks is not None:
+                value, computed = self.file_locks.run(key, compute)
+                if not computed:
+                    state = "coalesced"
+                    with self._lock:
+                        self.coalesced += 1
+            else:
+                value = compute()
+            if should_cache is None or should_cache(value):
+                self.put(key, value)
+            future.set_result(value)
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+        return state
+
+    def pending(self, key):
+        """Future of key's in-flight computation, or None"""
+        with self._lock:
+            return self._flights.get(key)
+
+    def lookup(self, key, refresh, should_cache=None):
+        """Like get_or_compute, but returns (None, "miss") instead of computing inline
+
+        refresh is only called, on a background thread, for stale entries.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                age = now - stored_at
+                if age <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value, "hit"
+                if age <= self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stale += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        threading.Thread(
+                            target=self._refresh,
+                            args=(key, refresh, should_cache),
+                            daemon=True
+                        ).start()
+                    return value, "stale"
+                del self._entries[key]
+            self.misses += 1
+
+        return None, "miss"
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entries past max_entries"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _refresh(self, key, compute, should_cache):
+        """Recompute an expired entry off the request path"""
+        try:
+            value = compute()
+            if should_cache is None or should_cache(value):
+                self.put(key, value)
+        except Exception as e:
+            print(f"Background cache refresh failed for {key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def clear(self):
+        """Drop every entry and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.stale = self.coalesced = 0
+
+    def stats(self):
+        """Counters for the health endpoint"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "coalesced": self.coalesced,
+                "inFlight": len(self._flights),
+                "refreshing": len(self._refreshing),
+                "crossProcess": self.file_locks is not None
+            }
+
+search_cache = ResultCache(
+    ttl=float(os.environ.get('SEARCH_CACHE_TTL', 300)),
+    max_entries=int(os.environ.get('SEARCH_CACHE_MAX_ENTRIES', 128)),
+    stale_ttl=float(os.environ.get('SEARCH_CACHE_STALE_TTL', 3600)),
+    lock_dir=os.environ.get('SEARCH_LOCK_DIR')
+)
@@ -0,0 +1,56 @@
+"""
+Streaming RSS item parser shared by the Indeed and LinkedIn scrapers
+Items are parsed straight off the response socket, handed out as soon as
+their closing tag arrives, and dropped from the tree right after use
+"""
+
+import xml.etree.ElementTree as ET
+
+def iter_rss_items(response, limit=None):
+    """Yield each <item> Element of a streamed RSS response, up to limit
+
+    The response must come from a stream=True request. The connection is
+    closed as soon as the limit is reached instead of reading the rest of
+    the body.
+    """
+    try:
+        if limit is not None and limit <= 0:
+            return
+
+        # Let urllib3 undo gzip/deflate so the parser sees plain XML
+        response.raw.decode_content = True
+
+        yield from iter_rss_elements(response.raw, limit)
+    finally:
+        response.close()
+
+def iter_rss_elements(stream, limit=None):
+    """Yield each <item> Element read incrementally from a file-like stream
+
+    Each yielded element is cleared and detached once the caller moves on,
+    so memory stays flat however long the feed is.
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    count = 0
+    open_elements = []
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            open_elements.append(elem)
+            continue
+
+        open_elements.pop()
+        if elem.tag.rsplit('}', 1)[-1] != 'item':
+            continue
+
+        yield elem
+
+        # Forget the item so the tree never holds more than one
+        elem.clear()
+        if open_elements:
+            open_elements[-1].remove(elem)
+
+        count += 1
+        if limit is not None and count >= limit:
+            return
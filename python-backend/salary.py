@@ -0,0 +1,252 @@
+"""
+Salary normalization into numeric fields, and server-side salary filtering
+Turns "$80k-$120k", "$80,000 - $120,000", "$45/hr", "£50,000 a year" and the
+like into salaryMin / salaryMax / salaryPeriod / salaryCurrency on each job,
+so range filters compare numbers instead of re-parsing display strings
+"""
+
+import math
+import re
+
+# Working time used to compare pay quoted per hour, day, week or month with yearly pay
+PERIODS_PER_YEAR = {'year': 1, 'month': 12, 'week': 52, 'day': 260, 'hour': 2080}
+
+PERIOD_ALIASES = {
+    'hour': 'hour', 'hr': 'hour', 'hourly': 'hour',
+    'day': 'day', 'daily': 'day',
+    'week': 'week', 'wk': 'week', 'weekly': 'week',
+    'month': 'month', 'mo': 'month', 'monthly': 'month',
+    'year': 'year', 'yr': 'year', 'annum': 'year', 'annually': 'year', 'yearly': 'year', 'annual': 'year'
+}
+
+PERIOD_SUFFIXES = {'year': '', 'month': ' a month', 'week': ' a week', 'day': ' a day', 'hour': ' an hour'}
+
+CURRENCY_SYMBOLS = {'$': 'USD', '€': 'EUR', '£': 'GBP'}
+SYMBOLS = {'USD': '$', 'EUR': '€', 'GBP': '£'}
+
+NO_SALARY = {"salaryMin": None, "salaryMax": None, "salaryPeriod": None, "salaryCurrency": None}
+
+_CURRENCY = r'[$€£]|\b(?:usd|eur|gbp|cad|aud)\b\s?'
+_NUMBER = r'\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?'
+
+# One pass over the text finds each amount, an optional second amount of a
+# range and an optional period. It opens with a single required character
+# (currency symbol or digit) so the regex engine can skip through prose fast;
+# the lookbehind then rejects digits inside words and version numbers
+SALARY_PATTERN = re.compile(
+    r'(?P<lead>[$€£\d])(?<![\w.,][$€£\d])'
+    rf'(?P<low>(?<=[$€£])\s?(?:{_NUMBER})|(?<=\d)(?:\d{{0,2}}(?:,\d{{3}})+|\d*(?:\.\d+)?))\s?(?P<low_k>k\b)?'
+    rf'(?:\s*(?:-|–|—|to)\s*(?P<high_currency>{_CURRENCY})?\s?(?P<high>{_NUMBER})\s?(?P<high_k>k\b)?)?'
+    r'(?:\s*(?:/|\bper\b|\ban?\b)\s*(?P<period>hour|hr|day|week|wk|month|mo|year|yr|annum)\b'
+    r'|\s*(?P<adverb>hourly|daily|weekly|monthly|yearly|annually|annual)\b)?',
+    re.IGNORECASE
+)
+
+CURRENCY_CODES = {'usd', 'eur', 'gbp', 'cad', 'aud'}
+
+def _amount(number, thousands):
+    value = float(number.replace(',', ''))
+    return value * 1000 if thousands else value
+
+def _clean(value):
+    """Positive number as int when whole, otherwise None"""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(value) or value <= 0:
+        return None
+    return int(value) if value == int(value) else round(value, 2)
+
+def salary_fields(low, high=None, period='year', currency='USD'):
+    """Numeric salary fields for a job; missing or zero amounts become None"""
+    low = _clean(low)
+    high = _clean(high)
+    if low is None and high is None:
+        return dict(NO_SALARY)
+    if low is not None and high is not None and low > high:
+        low, high = high, low
+    return {
+        "salaryMin": low,
+        "salaryMax": high,
+        "salaryPeriod": PERIOD_ALIASES.get(str(period or 'year').lower(), 'year'),
+        "salaryCurrency": str(currency or 'USD').upper()
+    }
+
+def _infer_period(amount):
+    """Period of an amount quoted without one"""
+    if amount >= 10000:
+        return 'year'
+    if amount >= 1000:
+        return 'month'
+    return 'hour'
+
+def _salary_at(text, match):
+    """(matched text, salary fields) for one pattern match, or None if it isn't pay"""
+    lead = match.group('lead')
+    low_text = match.group('low').strip()
+    low_k = bool(match.group('low_k'))
+    high_k = bool(match.group('high_k'))
+    high_text = match.group('high')
+    begin = match.start()
+
+    if lead in CURRENCY_SYMBOLS:
+        currency = CURRENCY_SYMBOLS[lead]
+    else:
+        low_text = lead + low_text
+        # A currency code just before the amount: "USD 60k"
+        before = text[max(0, begin - 4):begin]
+        code = before.strip().lower()
+        if code in CURRENCY_CODES and before[-1:].isspace() and not text[begin - 5:begin - 4].isalnum():
+            currency = code.upper()
+            begin -= len(before)
+        else:
+            currency = match.group('high_currency')
+            currency = CURRENCY_SYMBOLS.get(currency.strip(), currency.strip().upper()) if currency else None
+
+    period = match.group('period') or match.group('adverb')
+    if not (currency or low_k or high_k or ',' in low_text):
+        return None
+    # Without a currency only a range or a stated period reads as pay
+    if not currency and not (high_text or period):
+        return None
+
+    high = _amount(high_text, high_k) if high_text else None
+    # "$80-120k": the suffix applies to both ends
+    low = _amount(low_text, low_k or (high_k and float(low_text.replace(',', '')) < 1000))
+    period = PERIOD_ALIASES[period.lower()] if period else _infer_period(max(low, high or 0))
+
+    if text[max(0, begin - 6):begin].lower().rstrip().endswith('up to') and high is None:
+        low, high = None, low
+        begin = text.lower().rfind('up to', 0, begin)
+
+    fields = salary_fields(low, high, period, currency or 'USD')
+    annual = annualize(fields["salaryMax"] or fields["salaryMin"], fields["salaryPeriod"])
+    # Skip amounts that can't be pay for that period (a "$5" fee, a "$2,000,000" budget)
+    if annual is None or not 12000 <= annual <= 1000000:
+        return None
+    return text[begin:match.end()].strip(), fields
+
+def _symbol_positions(text):
+    """Offsets of currency symbols in text, in order"""
+    positions = []
+    for symbol in CURRENCY_SYMBOLS:
+        position = text.find(symbol)
+        while position != -1:
+            positions.append(position)
+            position = text.find(symbol, position + 1)
+    return sorted(positions)
+
+def find_salary(text):
+    """(matched text, salary fields) for the salary quoted in text, or (None, NO_SALARY)
+
+    An amount only counts as pay when it carries a currency, a k suffix or
+    thousands separators, and without a currency it must be a range or name
+    its period, so "3-5 years", "401k" or "10,000 users" are skipped.
+    Amounts with a currency symbol are preferred over ones without.
+    """
+    if not text:
+        return None, dict(NO_SALARY)
+
+    # Most pay is quoted with a currency symbol, and str.find jumps straight to
+    # those; scanning every digit only happens when none of them reads as pay
+    for position in _symbol_positions(text):
+        match = SALARY_PATTERN.match(text, position)
+        found = _salary_at(text, match) if match is not None else None
+        if found is not None:
+            return found
+
+    for match in SALARY_PATTERN.finditer(text):
+        if match.group('lead') not in CURRENCY_SYMBOLS:
+            found = _salary_at(text, match)
+            if found is not None:
+                return found
+
+    return None, dict(NO_SALARY)
+
+def parse_salary(text):
+    """Salary fields for a display or free-text salary string"""
+    return find_salary(text)[1]
+
+def format_salary(low, high=None, period='year', currency='USD'):
+    """Display string for a salary range, e.g. "$80,000 - $120,000" or "$45 - $55 an hour" """
+    fields = salary_fields(low, high, period, currency)
+    low, high = fields["salaryMin"], fields["salaryMax"]
+    if low is None and high is None:
+        return "Salary not specified"
+
+    symbol = SYMBOLS.get(fields["salaryCurrency"], fields["salaryCurrency"] + ' ')
+    amount = lambda value: f"{symbol}{value:,}" if isinstance(value, int) else f"{symbol}{value:,.2f}"
+    if low is not None and high is not None:
+        text = f"{amount(low)} - {amount(high)}"
+    elif low is not None:
+        text = f"{amount(low)}+"
+    else:
+        text = f"Up to {amount(high)}"
+    return text + PERIOD_SUFFIXES[fields["salaryPeriod"]]
+
+def annualize(amount, period):
+    """Yearly equivalent of an amount paid per period"""
+    if amount is None:
+        return None
+    return amount * PERIODS_PER_YEAR.get(period or 'year', 1)
+
+def annual_range(job):
+    """(low, high) yearly pay of a job, or None when it has no salary
+
+    Jobs stored before salary fields existed are parsed from their display string.
+    """
+    if "salaryMin" in job or "salaryMax" in job:
+        fields = job
+    else:
+        fields = parse_salary(job.get("salary"))
+
+    low = fields.get("salaryMin")
+    high = fields.get("salaryMax")
+    if low is None and high is None:
+        return None
+    period = fields.get("salaryPeriod")
+    return (annualize(low if low is not None else high, period),
+            annualize(high if high is not None else low, period))
+
+def salary_bounds(args):
+    """(minSalary, maxSalary) query parameters as yearly amounts; None when absent or invalid"""
+    bounds = []
+    for name in ('minSalary', 'maxSalary'):
+        try:
+            value = float(args.get(name))
+        except (TypeError, ValueError):
+            value = None
+        bounds.append(value if value is not None and not math.isnan(value) else None)
+    return tuple(bounds)
+
+def salary_filter(min_salary=None, max_salary=None):
+    """Predicate keeping jobs whose yearly pay range overlaps [min_salary, max_salary]
+
+    Jobs without a salary are dropped once either bound is set. Amounts are
+    compared as quoted; currencies are not converted. None when there are no bounds.
+    """
+    if min_salary is None and max_salary is None:
+        return None
+
+    def keep(job):
+        pay = annual_range(job)
+        if pay is None:
+            return False
+        low, high = pay
+        if min_salary is not None and high < min_salary:
+            return False
+        if max_salary is not None and low > max_salary:
+            return False
+        return True
+    # Lets job tables apply the filter to their pay columns directly
+    keep.bounds = (min_salary, max_salary)
+    return keep
+
+def filter_payload(payload, keep):
+    """Search payload with only the jobs keep() accepts; the payload itself if keep is None"""
+    if keep is None:
+        return payload
+    jobs = payload.get("jobs", [])
+    jobs = jobs.select(keep) if hasattr(jobs, 'select') else [job for job in jobs if keep(job)]
+    return dict(payload, jobs=jobs, total=len(jobs))
@@ -0,0 +1,385 @@
+"""
+Batch relevance scoring shared by every source, both apps and the frontend
+A port of the frontend's aiScoring factors (skill match, location, salary,
+industry, experience, recency) that scores a whole list of jobs at once:
+each job's text is scanned once into a row of boolean features, and every
+factor is then a NumPy operation over the feature matrix
+"""
+
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from job_document import JobDocument
+from keyword_matcher import KeywordMatcher
+from salary import PERIODS_PER_YEAR, annual_range
+import metrics
+import lazy_imports
+
+# Imported with the first batch scored, not with the app
+np = lazy_imports.module('numpy')
+
+DEFAULT_PROFILE = {
+    # Skill display names; SKILL_PHRASES lists the words that count for a name
+    "skills": {
+        "primary": ['React', 'JavaScript', 'Python', 'Next.js', 'TailwindCSS'],
+        "secondary": ['TypeScript', 'Node.js', 'HTML', 'CSS', 'Git'],
+        "emerging": ['AI/ML', 'Automation', 'APIs', 'AWS']
+    },
+    "skillPoints": {"primary": 20, "secondary": 10, "emerging": 15},
+    "remoteWeight": 1.1,
+    "preferredLocations": ['nashville'],
+    "nearbyLocations": ['tennessee', 'tn'],
+    "salaryMin": 65000,
+    # Share of the final score each factor contributes
+    "weights": {
+        "skills": 0.4,
+        "location": 0.15,
+        "salary": 0.15,
+        "industry": 0.1,
+        "experience": 0.1,
+        "recency": 0.1
+    }
+}
+
+FACTORS = ('skills', 'location', 'salary', 'industry', 'experience', 'recency')
+
+SKILL_PHRASES = {
+    'ai/ml': ['ai', 'ml', 'machine learning'],
+    'apis': ['api', 'apis', 'rest api'],
+    'node.js': ['node.js', 'node'],
+}
+
+# Alternate spellings counted as the skill they name
+SKILL_ALIASES = {
+    'reactjs': 'react',
+    'react.js': 'react',
+    'nextjs': 'next.js',
+    'nodejs': 'node.js',
+    'tailwind': 'tailwindcss',
+}
+
+INDUSTRY_PHRASES = {
+    'tech': ['tech', 'technology', 'technologies', 'startup', 'startups'],
+    'ai': ['ai', 'machine learning', 'ml'],
+    'automation': ['automation'],
+    'remote': ['remote'],
+    'innovation': ['innovation', 'innovative', 'cutting-edge', 'modern'],
+}
+INDUSTRY_POINTS = {'tech': 20, 'ai': 25, 'automation': 30, 'remote': 15, 'innovation': 10}
+
+# Checked in order; the first level found sets the experience score
+EXPERIENCE_LEVELS = [
+    (['junior', 'entry', 'associate'], 100),
+    (['mid', 'intermediate'], 90),
+    (['senior', 'lead', 'principal'], 60),
+    (['manager', 'director'], 30),
+]
+DEFAULT_EXPERIENCE_SCORE = 80
+
+# Days since posting -> score, first bound that fits wins
+RECENCY_STEPS = [(1, 100), (3, 90), (7, 80), (14, 70), (30, 60)]
+STALE_SCORE = 40
+
+MISSING = object()
+
+def load_profile(path=None):
+    """DEFAULT_PROFILE, with any keys from the JSON file at path (or SCORING_PROFILE) on top"""
+    profile = json.loads(json.dumps(DEFAULT_PROFILE))
+    path = path or os.environ.get('SCORING_PROFILE')
+    if not path:
+        return profile
+
+    try:
+        with open(path) as f:
+            overrides = json.load(f)
+    except Exception as e:
+        print(f"Could not load scoring profile {path}: {e}")
+        return profile
+
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(profile.get(key), dict):
+            profile[key].update(value)
+        else:
+            profile[key] = value
+    return profile
+
+def normalize_weights(weights):
+    """Factor weights scaled to sum to 1, so they are relative shares of the score
+
+    Missing, non-finite and negative weights count as 0. If no factor has a
+    positive weight, DEFAULT_PROFILE's weights are used.
+    """
+    clean = {}
+    for name in FACTORS:
+        try:
+            weight = float(weights.get(name, 0))
+        except (TypeError, ValueError):
+            weight = 0.0
+        clean[name] = weight if math.isfinite(weight) and weight > 0 else 0.0
+    total = sum(clean.values())
+    if total <= 0:
+        return normalize_weights(DEFAULT_PROFILE["weights"])
+    return {name: weight / total for name, weight in clean.items()}
+
+def _annual_max(jobs):
+    """Highest yearly pay of every job as a float array, 0 where there is no salary"""
+    pay = np.zeros(len(jobs))
+    for index, job in enumerate(jobs):
+        high = job.get("salaryMax", MISSING)
+        if high is MISSING and "salaryMin" not in job:
+            # Stored before salary fields existed; parse the display string
+            pay[index] = (annual_range(job) or (0, 0))[1]
+            continue
+        if high is None or high is MISSING:
+            high = job.get("salaryMin")
+        if high is not None:
+            pay[index] = high * PERIODS_PER_YEAR.get(job.get("salaryPeriod") or 'year', 1)
+    return pay
+
+@functools.lru_cache(maxsize=8192)
+def _posted_timestamp(value):
+    """Epoch seconds of an ISO postedDate, or NaN when missing or unparseable"""
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except (TypeError, ValueError):
+        return np.nan
+
+def _feature_key(job):
+    """Key of a job's cached feature row (ID, title and description)"""
+    return (job.get("id"), job.get("title"), job.get("description"))
+
+class RelevanceScorer:
+    """Scores batches of jobs against one profile
+
+    Text features depend only on a job's content, so they are cached per
+    job (by ID, title and description, oldest evicted first) and re-ranking
+    jobs that were scored before only costs the matrix arithmetic.
+    """
+
+    def __init__(self, profile=None, cache_size=20000):
+        self.profile = profile or load_profile()
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Feature columns: (name, phrases); one boolean per job each
+        skill_points = self.profile["skillPoints"]
+        self.skill_columns = []
+        self.skill_points = []
+        for tier, names in self.profile["skills"].items():
+            for name in names:
+                key = name.lower()
+                self.skill_columns.append((key, frozenset(SKILL_PHRASES.get(key, [key]))))
+                self.skill_points.append(skill_points.get(tier, 0))
+
+        self.industry_columns = [(name, frozenset(phrases)) for name, phrases in INDUSTRY_PHRASES.items()]
+        self.experience_columns = [(str(score), frozenset(phrases)) for phrases, score in EXPERIENCE_LEVELS]
+        self.location_columns = [
+            ('preferred', frozenset(p.lower() for p in self.profile["preferredLocations"])),
+            ('nearby', frozenset(p.lower() for p in self.profile["nearbyLocations"])),
+        ]
+
+        vocabulary = {}
+        for group, columns in (('skill', self.skill_columns), ('industry', self.industry_columns),
+                               ('experience', self.experience_columns), ('location', self.location_columns)):
+            vocabulary[group] = sorted(set().union(*(phrases for _, phrases in columns)))
+        self.matcher = KeywordMatcher(vocabulary, SKILL_ALIASES)
+
+    def _text_features(self, job, doc=None):
+        """Feature row for one job (skills, industry, experience, location), one byte per column
+
+        doc is the scraper's own JobDocument for the job, if it kept one;
+        fields it was built without are read from the job.
+        """
+        doc = JobDocument.from_job(job) if doc is None else doc.fill(job)
+        matcher = self.matcher
+        description = doc.found('description', matcher=matcher)
+        skills_found = description | doc.found('requirements', matcher=matcher)
+        industry_found = description | doc.found('company', 'tags', matcher=matcher)
+        experience_found = description | doc.found('title', matcher=matcher)
+        location_found = doc.found('location', matcher=matcher)
+
+        row = []
+        for found, columns in ((skills_found, self.skill_columns), (industry_found, self.industry_columns),
+                               (experience_found, self.experience_columns), (location_found, self.location_columns)):
+            row.extend(not found.isdisjoint(phrases) for _, phrases in columns)
+        # Packed as bytes so a whole batch joins into one buffer for NumPy
+        return bytes(row)
+
+    def _remember(self, computed):
+        """Cache (key, row) pairs, evicting the oldest rows past cache_size"""
+        with self._lock:
+            for key, row in computed:
+                self._cache[key] = row
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def prime(self, job, doc):
+        """Cache a freshly scraped job's feature row from the scraper's JobDocument
+
+        The scraper has already lowercased the job's text into doc, so when the
+        batch is scored its rows are cached rather than rebuilt from the dicts.
+        """
+        self._remember([(_feature_key(job), self._text_features(job, doc))])
+
+    def features(self, jobs):
+        """(N x columns) boolean feature matrix for jobs, scanning only jobs not seen before"""
+        with self._lock:
+            rows = [self._cache.get(_feature_key(job)) for job in jobs]
+        misses = [(index, _feature_key(job), job) for index, (job, row) in enumerate(zip(jobs, rows)) if row is None]
+
+        if misses:
+            computed = [(key, self._text_features(job)) for _, key, job in misses]
+            for (index, _, _), (_, row) in zip(misses, computed):
+                rows[index] = row
+            self._remember(computed)
+
+        width = len(self.skill_columns) + len(self.industry_columns) + len(self.experience_columns) + len(self.location_columns)
+        return np.frombuffer(b''.join(rows), dtype=bool).reshape(len(jobs), width)
+
+    def factor_scores(self, jobs, now=None):
+        """Dict of factor name -> per-job score array (0-100, location up to 100 * remoteWeight)"""
+        now = time.time() if now is None else now
+        matrix = self.features(jobs)
+
+        n_skills = len(self.skill_columns)
+        n_industry = len(self.industry_columns)
+        n_experience = len(self.experience_columns)
+        skills = matrix[:, :n_skills]
+        industry = matrix[:, n_skills:n_skills + n_industry]
+        experience = matrix[:, n_skills + n_industry:n_skills + n_industry + n_experience]
+        location = matrix[:, n_skills + n_industry + n_experience:]
+
+        is_remote = np.array([bool(job.get("isRemote")) for job in jobs], dtype=bool)
+
+        # Skill match: points per skill plus a bonus for breadth
+        matches = skills.sum(axis=1)
+        skill_score = skills @ np.array(self.skill_points, dtype=float) + 10 * (matches >= 3) + 10 * (matches >= 5)
+
+        location_score = np.select(
+            [is_remote, location[:, 0], location[:, 1]],
+            [100 * self.profile["remoteWeight"], 95, 85],
+            default=50
+        )
+
+        # Highest yearly pay against the profile's minimum; unknown pay counts as 0
+        pay = _annual_max(jobs)
+        salary_min = self.profile["salaryMin"]
+        salary_score = np.select(
+            [pay >= salary_min + 20000, pay >= salary_min + 10000, pay >= salary_min, pay >= salary_min - 5000],
+            [100, 90, 80, 70],
+            default=50
+        )
+
+        industry_flags = dict(zip(INDUSTRY_PHRASES, industry.T))
+        industry_flags['remote'] = industry_flags['remote'] & is_remote
+        industry_score = 50 + sum(INDUSTRY_POINTS[name] * flags for name, flags in industry_flags.items())
+
+        experience_score = np.select(
+            list(experience.T),
+            [score for _, score in EXPERIENCE_LEVELS],
+            default=DEFAULT_EXPERIENCE_SCORE
+        )
+
+        posted = np.array([_posted_timestamp(job.get("postedDate")) for job in jobs], dtype=float)
+        with np.errstate(invalid='ignore'):
+            days = np.floor((now - posted) / 86400)
+            recency_score = np.select(
+                [days <= bound for bound, _ in RECENCY_STEPS],
+                [score for _, score in RECENCY_STEPS],
+                default=STALE_SCORE
+            )
+
+        return {
+            "skills": np.minimum(100, skill_score),
+            "location": location_score,
+            "salary": salary_score,
+            "industry": np.minimum(100, industry_score),
+            "experience": experience_score,
+            "recency": recency_score
+        }
+
+    def score(self, jobs, weights=None, now=None):
+        """Integer 0-100 relevance per job
+
+        weights override the profile's factor weights, and the merged weights
+        are normalized, so only their proportions matter.
+        """
+        if not jobs:
+            return np.zeros(0, dtype=np.int64)
+
+        weights = normalize_weights(dict(self.profile["weights"], **(weights or {})))
+        factors = self.factor_scores(jobs, now)
+        total = sum(weights[name] * factors[name] for name in FACTORS)
+        # Round half up, as the frontend's Math.round did
+        return np.floor(np.clip(total, 0, 100) + 0.5).astype(np.int64)
+
+    def score_jobs(self, jobs, weights=None):
+        """Set relevanceScore on every job in place; returns jobs"""
+        for job, value in zip(jobs, self.score(jobs, weights).tolist()):
+            job["relevanceScore"] = value
+        return jobs
+
+    def rank(self, jobs, weights=None):
+        """Copies of jobs re-scored with weights, most relevant first (the originals are untouched)"""
+        # Build a job table's rows once rather than on every pass over them
+        jobs = list(jobs)
+        scores = self.score(jobs, weights).tolist()
+        order = sorted(range(len(jobs)), key=lambda i: scores[i], reverse=True)
+        return [dict(jobs[i], relevanceScore=scores[i]) for i in order]
+
+    def stats(self):
+        """Counters for the health endpoint"""
+        with self._lock:
+            return {"cachedJobs": len(self._cache), "maxCachedJobs": self.cache_size, "weights": self.profile["weights"]}
+
+scorer = RelevanceScorer()
+
+@metrics.timed('score')
+def score_jobs(jobs):
+    """Score a batch of jobs in place with the configured profile"""
+    return scorer.score_jobs(jobs)
+
+def scored(scrape):
+    """Wrap a scraper so the jobs it returns are scored as one batch"""
+    @functools.wraps(scrape)
+    def wrapper(*args, **kwargs):
+        return score_jobs(scrape(*args, **kwargs))
+    return wrapper
+
+def parse_weights(args):
+    """Factor weights from a ?weights=skills:0.5,recency:0.2 query parameter, or None
+
+    Unknown factors and values that aren't finite non-negative numbers are ignored.
+    """
+    raw = args.get('weights')
+    if not raw:
+        return None
+
+    weights = {}
+    for part in raw.split(','):
+        name, _, value = part.partition(':')
+        name = name.strip()
+        if name not in FACTORS:
+            continue
+        try:
+            weight = float(value)
+        except ValueError:
+            continue
+        # nan, inf and negative weights would push scores outside 0-100
+        if not math.isfinite(weight) or weight < 0:
+            continue
+        weights[name] = weight
+    return weights or None
+
+def rerank_payload(payload, weights):
+    """Search payload re-ranked with per-request weights; the payload itself if weights is None"""
+    if weights is None:
+        return payload
+    return dict(payload, jobs=scorer.rank(payload.get("jobs", []), weights))
@@ -0,0 +1,83 @@
+"""
+Streaming NDJSON mode for /api/jobs/search (?stream=1)
+Each source's jobs are flushed as soon as that source finishes, followed by
+one summary record, so time-to-first-job is the fastest source's latency
+"""
+
+from flask import Response, stream_with_context
+
+from aggregator import iter_sources
+from json_fragments import dumps, payload_bytes
+from salary import filter_payload
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def wants_stream(args):
+    """True when the request opted into the streaming response"""
+    return args.get('stream', '').lower() in ('1', 'true', 'yes', 'ndjson')
+
+def ndjson_line(record):
+    """Encode one NDJSON record"""
+    return dumps(record) + b'\n'
+
+def stream_live_search(sources, finalize, on_complete=None, deadline=None, keep=None):
+    """Yield NDJSON lines while sources finish, then the summary
+
+    Records, in order:
+      {"type": "jobs", "source": name, "status": {...}, "jobs": [...]}  one per source
+      {"type": "jobs", "source": "fill", "jobs": [...]}  jobs finalize added (e.g. mock fill)
+      {"type": "summary", ...}  the regular response body minus its jobs list
+
+    finalize(jobs, statuses) builds the regular (non-streamed) payload from
+    everything collected; on_complete(payload) receives it, e.g. for caching.
+    keep(job), if given, filters the jobs sent (e.g. by salary) but not the
+    payload on_complete receives. A job is sent once: a source returning a
+    job an earlier record already carried (by ID) is not sent it again.
+    """
+    collected = []
+    statuses = []
+    sent_ids = set()
+    for status, jobs in iter_sources(sources, deadline):
+        statuses.append(status)
+        collected.extend(jobs)
+        sent_jobs = []
+        for job in jobs:
+            if job.get("id") in sent_ids or (keep is not None and not keep(job)):
+                continue
+            sent_ids.add(job.get("id"))
+            sent_jobs.append(job)
+        yield ndjson_line({"type": "jobs", "source": status["name"], "status": status, "jobs": sent_jobs})
+
+    sent = set(job.get("id") for job in collected)
+    payload = finalize(list(collected), statuses)
+
+    # The payload's jobs are rebuilt from its table, so they're matched by ID
+    filtered = filter_payload(payload, keep)
+    filled = [job for job in filtered.get("jobs", []) if job.get("id") not in sent]
+    if filled:
+        yield ndjson_line({"type": "jobs", "source": "fill", "jobs": filled})
+
+    yield ndjson_line(summary_record(filtered))
+
+    if on_complete is not None:
+        on_complete(payload)
+
+def stream_cached_payload(payload, cache_state, keep=None):
+    """Yield a cached payload as one jobs record plus its summary"""
+    payload = filter_payload(payload, keep)
+    # Cached jobs were encoded when their payload was built
+    yield payload_bytes({"type": "jobs", "source": "cache", "jobs": payload.get("jobs", [])}) + b'\n'
+    yield ndjson_line(summary_record(dict(payload, cache=cache_state)))
+
+def summary_record(payload):
+    """Summary record: the payload's totals, message and source status without the jobs"""
+    record = {key: value for key, value in payload.items() if key != "jobs"}
+    record["type"] = "summary"
+    return record
+
+def ndjson_response(lines):
+    """Chunked NDJSON response that proxies should not buffer"""
+    response = Response(stream_with_context(lines), mimetype=NDJSON_MIMETYPE)
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
@@ -1,85 +1,61 @@
 """
 Simple job scraper fallback for Python < 3.10
-Uses requests and BeautifulSoup instead of JobSpy
+Uses requests instead of JobSpy
 """
 
-import requests
-from bs4 import BeautifulSoup
 import json
 import uuid
 from datetime import datetime, timedelta
 import random
 
+from remoteok_store import remoteok_store
+from job_store import stable_job_id
+from salary import salary_fields, format_salary
+from scoring import scored
+import metrics
+
+@scored
 def scrape_remoteok_jobs(search_term="developer", limit=20):
-    """Scrape jobs from RemoteOK (they have a public API)"""
+    """Search jobs from the shared RemoteOK feed snapshot (they have a public API)
+
+    Raises if the feed couldn't be downloaded, so the source is reported as
+    failed rather than empty.
+    """
     try:
-        # RemoteOK has a simple JSON API
-        url = f"https://remoteok.com/api"
-        headers = {
-            'User-Agent': 'JobSeek/1.0 (https://jobseek1-0.vercel.app)',
-            'Accept': 'application/json',
-        }
+        with metrics.stage('search'):
+            matches = remoteok_store.search(search_term, limit)
+        metrics.count_parsed(len(matches))
         
-        print(f"Fetching from RemoteOK: {url}")
-        response = requests.get(url, headers=headers, timeout=15)
-        print(f"RemoteOK response status: {response.status_code}")
-        
-        if response.status_code != 200:
-            print(f"RemoteOK API error: {response.status_code}")
-            return []
-        
-        data = response.json()
-        print(f"RemoteOK returned {len(data)} total items")
-        
-        if not data or len(data) <= 1:
+        if not matches:
             print("No job data from RemoteOK")
             return []
         
-        jobs = []
-        search_terms = [search_term.lower(), 'react', 'javascript', 'frontend', 'developer']
-        
-        for job_data in data[1:]:  # Skip first item (metadata)
-            if not isinstance(job_data, dict):
-                continue
-            
-            if len(jobs) >= limit:
-                break
-                
-            # More flexible search matching
-            title = str(job_data.get('position', '')).lower()
-            description = str(job_data.get('description', '')).lower()
-            tags = ' '.join(str(tag) for tag in job_data.get('tags', [])).lower()
-            company = str(job_data.get('company', '')).lower()
-            
-            # Check if any search term matches
-            job_text = f"{title} {description} {tags} {company}"
-            if not any(term in job_text for term in search_terms):
-                continue
-            
-            # Convert to our format
-            job = {
-                "id": str(uuid.uuid4()),
-                "title": job_data.get('position', 'Developer'),
-                "company": job_data.get('company', 'Remote Company'),
-                "location": "Remote",
-                "salary": format_salary_remoteok(job_data.get('salary_min'), job_data.get('salary_max')),
-                "postedDate": format_date_remoteok(job_data.get('date')),
-                "source": "RemoteOK",
-                "description": job_data.get('description', '')[:500] + '...' if len(job_data.get('description', '')) > 500 else job_data.get('description', ''),
-                "requirements": job_data.get('tags', [])[:8],
-                "isRemote": True,
-                "relevanceScore": calculate_relevance_simple(job_data, search_term),
-                "applicationStatus": "not_applied",
-                "tags": ["Remote"] + job_data.get('tags', [])[:5],
-                "url": create_search_url(job_data)
-            }
-            jobs.append(job)
-            
-        return jobs[:limit]
+        return [convert_remoteok_job(job_data, search_term) for job_data in matches]
         
     except Exception as e:
         print(f"Error scraping RemoteOK: {e}")
-        return []
+        raise
+
+@metrics.timed('convert')
+def convert_remoteok_job(job_data, search_term):
+    """Convert a RemoteOK posting to our format"""
+    return {
+        "id": stable_job_id(job_data.get('url'), job_data.get('position', ''), job_data.get('company', '')),
+        "title": job_data.get('position', 'Developer'),
+        "company": job_data.get('company', 'Remote Company'),
+        "location": "Remote",
+        "salary": format_salary_remoteok(job_data.get('salary_min'), job_data.get('salary_max')),
+        **salary_fields(job_data.get('salary_min'), job_data.get('salary_max')),
+        "postedDate": format_date_remoteok(job_data.get('date')),
+        "source": "RemoteOK",
+        "description": job_data.get('description', '')[:500] + '...' if len(job_data.get('description', '')) > 500 else job_data.get('description', ''),
+        "requirements": job_data.get('tags', [])[:8],
+        "isRemote": True,
+        "relevanceScore": 0,  # set for the whole batch by scoring
+        "applicationStatus": "not_applied",
+        "tags": ["Remote"] + job_data.get('tags', [])[:5],
+        "url": create_search_url(job_data)
+    }
 
 def generate_mock_jobs(search_term="developer", location="Nashville", limit=20):
     """Generate realistic mock jobs based on search term"""
@@ -115,6 +91,7 @@ def generate_mock_jobs(search_term="developer", location="Nashville", limit=20):
             "company": random.choice(companies),
             "location": "Remote" if is_remote else location,
             "salary": f"${salary_min:,} - ${salary_max:,}",
+            **salary_fields(salary_min, salary_max),
             "postedDate": (datetime.now() - timedelta(days=random.randint(1, 30))).isoformat(),
             "source": "Mock API",
             "description": f"We're looking for a talented {search_term} to join our growing team. Great opportunity to work with modern technologies and make an impact.",
@@ -130,13 +107,8 @@ def generate_mock_jobs(search_term="developer", location="Nashville", limit=20):
     return jobs
 
 def format_salary_remoteok(min_sal, max_sal):
-    """Format RemoteOK salary data"""
-    if min_sal and max_sal:
-        return f"${min_sal:,} - ${max_sal:,}"
-    elif min_sal:
-        return f"${min_sal:,}+"
-    else:
-        return "Salary not specified"
+    """Format RemoteOK salary data (yearly USD)"""
+    return format_salary(min_sal, max_sal)
 
 def format_date_remoteok(timestamp):
     """Format RemoteOK date"""
@@ -161,30 +133,12 @@ def create_search_url(job_data):
     else:
         return "https://remoteok.com/remote-jobs"
 
-def calculate_relevance_simple(job_data, search_term):
-    """Simple relevance calculation"""
-    score = 70  # Base score
-    
-    title = job_data.get('position', '').lower()
-    tags = ' '.join(job_data.get('tags', [])).lower()
-    
-    # Search term match
-    if search_term.lower() in title:
-        score += 15
-    if search_term.lower() in tags:
-        score += 10
-    
-    # Tech skills
-    tech_skills = ['react', 'javascript', 'python', 'typescript']
-    for skill in tech_skills:
-        if skill in tags or skill in title:
-            score += 3
-    
-    return min(95, score)
-
 if __name__ == "__main__":
     # Test the scraper
-    jobs = scrape_remoteok_jobs("react", 5)
+    try:
+        jobs = scrape_remoteok_jobs("react", 5)
+    except Exception:
+        jobs = []
     print(f"Found {len(jobs)} RemoteOK jobs")
     
     if jobs:
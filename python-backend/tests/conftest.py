@@ -0,0 +1,13 @@
+"""
+Shared setup: import the backend modules from the parent directory, with an
+in-memory job store and no crawler or background imports
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('JOB_STORE_PATH', ':memory:')
+os.environ.setdefault('CRAWLER_ENABLED', '0')
+os.environ.setdefault('WARM_IMPORTS', '0')
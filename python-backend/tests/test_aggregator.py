@@ -0,0 +1,69 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import aggregator
+from aggregator import all_sources_ran, gather_sources
+
+@pytest.fixture
+def pool(monkeypatch):
+    # The default pool's size, scaled down: room for 5 searches of 3 sources
+    executor = ThreadPoolExecutor(max_workers=15)
+    monkeypatch.setattr(aggregator, '_executor', executor)
+    yield executor
+    executor.shutdown(wait=True)
+
+def slow_source(seconds):
+    def scrape():
+        time.sleep(seconds)
+        return [{"id": "job"}]
+    return scrape
+
+def test_overlapping_searches_on_a_pool_sized_for_them_finish_in_time(pool):
+    statuses = [None] * 5
+    elapsed = [None] * 5
+
+    def search(index):
+        sources = [(f"Source{i}", slow_source(0.4), ()) for i in range(3)]
+        started = time.monotonic()
+        statuses[index] = [status["status"] for status in gather_sources(sources, deadline=0.6)[1]]
+        elapsed[index] = time.monotonic() - started
+
+    threads = [threading.Thread(target=search, args=(index,)) for index in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses == [["ok", "ok", "ok"]] * 5
+    assert max(elapsed) < 0.6
+
+def test_source_running_past_its_deadline_times_out(pool):
+    results, statuses = gather_sources([("Fast", slow_source(0), ()), ("Slow", slow_source(0.5), ())], deadline=0.2)
+    assert [status["status"] for status in statuses] == ["ok", "timeout"]
+    assert "Slow" not in results
+
+def test_source_that_never_gets_a_thread_is_skipped_within_the_deadline(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(aggregator, '_executor', executor)
+    try:
+        blocker = executor.submit(time.sleep, 0.5)
+        started = time.monotonic()
+        _, statuses = gather_sources([("Queued", slow_source(0), ())], deadline=0.1)
+        assert time.monotonic() - started < 0.3
+        assert statuses[0]["status"] == "skipped"
+        assert statuses[0]["error"] == aggregator.POOL_BUSY
+        assert not all_sources_ran(statuses)
+        blocker.result()
+    finally:
+        executor.shutdown(wait=True)
+
+def test_source_that_raises_is_an_error(pool):
+    def broken():
+        raise RuntimeError("upstream returned 503")
+
+    _, statuses = gather_sources([("Broken", broken, ())], deadline=1)
+    assert statuses[0]["status"] == "error"
+    assert statuses[0]["error"] == "upstream returned 503"
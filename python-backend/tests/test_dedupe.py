@@ -0,0 +1,59 @@
+from dedupe import dedupe_jobs, find_duplicate_clusters
+
+DESCRIPTION = (
+    "Join our clinical software team building patient scheduling tools in React and TypeScript. "
+    "You will ship features end to end, review code, mentor junior engineers and work closely "
+    "with nurses and physicians to improve care delivery across our hospital network."
+)
+OTHER_DESCRIPTION = (
+    "We are hiring a data engineer to own batch pipelines in Python and SQL. You will model "
+    "warehouse tables, tune Spark jobs, build dashboards for finance and keep our nightly loads "
+    "reliable while the analytics team grows."
+)
+
+def job(job_id, title, company, description=DESCRIPTION, location="Remote"):
+    return {"id": job_id, "title": title, "company": company, "description": description, "location": location}
+
+def clusters(jobs):
+    return [sorted(jobs[i]["id"] for i in members) for members in find_duplicate_clusters(jobs)]
+
+def test_company_strings_that_differ_slightly_match_on_description():
+    jobs = [
+        job("indeed-1", "Frontend Developer", "Acme Health"),
+        job("linkedin-1", "Frontend Developer (Remote)", "Acme Health Systems"),
+    ]
+    assert clusters(jobs) == [["indeed-1", "linkedin-1"]]
+
+def test_placeholder_companies_match_on_description_alone():
+    jobs = [
+        job("linkedin-1", "Frontend Developer", "LinkedIn Company"),
+        job("linkedin-2", "React Engineer", "Company"),
+        job("indeed-1", "Senior Frontend Engineer", "Acme Health"),
+    ]
+    assert clusters(jobs) == [["indeed-1", "linkedin-1", "linkedin-2"]]
+
+def test_different_companies_with_the_same_description_stay_apart():
+    jobs = [
+        job("a", "Frontend Developer", "Acme Health"),
+        job("b", "Frontend Developer", "Northwind Traders"),
+    ]
+    assert clusters(jobs) == [["a"], ["b"]]
+
+def test_different_descriptions_stay_apart_under_placeholder_companies():
+    jobs = [
+        job("a", "Frontend Developer", "LinkedIn Company"),
+        job("b", "Data Engineer", "LinkedIn Company", OTHER_DESCRIPTION),
+    ]
+    assert clusters(jobs) == [["a"], ["b"]]
+
+def test_postings_in_different_cities_stay_apart():
+    jobs = [
+        job("a", "Frontend Developer", "Acme Health", location="Nashville, TN"),
+        job("b", "Frontend Developer", "Acme Health Systems", location="Austin, TX"),
+    ]
+    assert clusters(jobs) == [["a"], ["b"]]
+
+def test_richest_record_of_a_cluster_is_kept():
+    sparse = job("linkedin-1", "Frontend Developer", "LinkedIn Company")
+    rich = dict(job("indeed-1", "Frontend Developer", "Acme Health"), salary="$90,000 - $110,000", url="https://example.com/1")
+    assert dedupe_jobs([sparse, rich]) == [rich]
@@ -0,0 +1,25 @@
+from job_store import JobStore
+
+def job(job_id, title):
+    return {"id": job_id, "title": title, "company": "Acme", "location": "Remote", "isRemote": True,
+            "description": f"{title} role", "requirements": []}
+
+def test_all_words_needs_every_word_of_the_search():
+    store = JobStore(':memory:')
+    store.upsert([job("1", "Python Developer"), job("2", "Java Developer"), job("3", "Rust Developer")])
+
+    assert len(store.search("rust developer", "remote")) == 3
+    assert [j["id"] for j in store.search("rust developer", "remote", all_words=True)] == ["3"]
+
+def test_query_popularity_is_written_in_batches():
+    store = JobStore(':memory:', flush_interval=3600)
+    for _ in range(3):
+        store.record_query("react", "nashville", 20)
+    store.record_query("python", "remote", 20)
+
+    assert store._connect().execute("SELECT COUNT(*) FROM query_stats").fetchone()[0] == 0
+    popular = store.popular_queries(2)
+    assert [(search, count) for search, _, _, count in popular] == [("react", 3.0), ("python", 1.0)]
+
+    store.record_query("react", "nashville", 20)
+    assert store.popular_queries(1)[0][3] == 4.0
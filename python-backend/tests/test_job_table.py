@@ -0,0 +1,18 @@
+from job_table import DateColumn, JobTable
+
+def test_posted_dates_read_back_exactly():
+    jobs = [
+        {"id": "a", "postedDate": "2026-10-15T12:34:56.789012"},
+        {"id": "b", "postedDate": "2026-10-15T00:00:00"},
+        {"id": "c", "postedDate": None},
+        {"id": "d"},
+        {"id": "e", "postedDate": "2026-10-15"},
+        {"id": "f", "postedDate": "2026-10-15T12:00:00+00:00"},
+        {"id": "g", "postedDate": "recently"},
+    ]
+    table = JobTable.from_jobs(jobs)
+
+    assert list(table) == jobs
+    assert isinstance(table._storage.columns["postedDate"], DateColumn)
+    # Only the strings isoformat() can't reproduce are kept per row
+    assert [bool(extra) for extra in table._storage.extras] == [False] * 4 + [True] * 3
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+import fallback_app
+from job_table import JobTable
+from pagination import snapshot_store
+from result_cache import search_cache
+
+URL = '/api/jobs/search?search=react&location=nashville&limit=5'
+
+def make_payload(*args, **kwargs):
+    jobs = [{"id": f"job-{i}", "title": f"React Developer {i}", "relevanceScore": 100 - i} for i in range(12)]
+    return {
+        "jobs": JobTable.from_jobs(jobs),
+        "total": len(jobs),
+        "message": f"Found {len(jobs)} jobs",
+        "sources": [{"name": "Stub", "status": "ok", "count": len(jobs), "latencyMs": 0}]
+    }
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(fallback_app, 'collect_jobs', make_payload)
+    monkeypatch.setattr(snapshot_store, 'ttl', 0.2)
+    search_cache.clear()
+    snapshot_store.clear()
+    yield fallback_app.app.test_client()
+    search_cache.clear()
+    snapshot_store.clear()
+
+def test_repoll_revalidates_while_snapshot_lives(client):
+    first = client.get(URL)
+    assert first.status_code == 200 and first.get_json()["hasMore"]
+
+    again = client.get(URL, headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+
+def test_repoll_after_snapshot_expiry_gets_a_working_cursor(client):
+    first = client.get(URL)
+    etag = first.headers['ETag']
+    cursor = first.get_json()["nextCursor"]
+
+    time.sleep(0.3)
+    assert client.get(f'/api/jobs/search?limit=5&cursor={cursor}').status_code == 410
+
+    repoll = client.get(URL, headers={'If-None-Match': etag})
+    assert repoll.status_code == 200
+    assert repoll.headers['ETag'] != etag
+
+    fresh_cursor = repoll.get_json()["nextCursor"]
+    page = client.get(f'/api/jobs/search?limit=5&cursor={fresh_cursor}')
+    assert page.status_code == 200
+    assert [job["id"] for job in page.get_json()["jobs"]] == [f"job-{i}" for i in range(5, 10)]
+
+def test_last_page_keeps_its_etag_without_a_snapshot(client):
+    url = '/api/jobs/search?search=react&location=nashville&limit=20'
+    first = client.get(url)
+    assert first.get_json()["nextCursor"] is None
+    assert client.get(url, headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+def snapshot_id(response):
+    return snapshot_store.snapshot_of(response.get_json())
+
+def test_first_pages_of_a_popular_query_share_one_snapshot(client, monkeypatch):
+    monkeypatch.setattr(snapshot_store, 'ttl', 60)
+    monkeypatch.setattr(snapshot_store, 'max_entries', 2)
+    other = client.get('/api/jobs/search?search=python&location=austin&limit=5').get_json()["nextCursor"]
+
+    shared = {snapshot_id(client.get(URL)) for _ in range(10)}
+    assert len(shared) == 1
+    assert client.get(f'/api/jobs/search?limit=5&cursor={other}').status_code == 200
+
+def test_differently_weighted_first_pages_get_their_own_snapshot(client, monkeypatch):
+    monkeypatch.setattr(snapshot_store, 'ttl', 60)
+    plain = snapshot_id(client.get(URL))
+    weighted = snapshot_id(client.get(URL + '&weights=recency:1'))
+
+    assert plain != weighted
+    assert snapshot_id(client.get(URL + '&weights=recency:1')) == weighted
@@ -0,0 +1,41 @@
+import threading
+import time
+
+from result_cache import ResultCache
+
+KEY = ("react", "nashville", 20)
+
+def never_called():
+    raise AssertionError("computed again")
+
+def test_caller_arriving_after_the_leader_finished_takes_its_result():
+    cache = ResultCache()
+    assert cache.lookup(KEY, never_called) == (None, "miss")
+
+    # The leader finishes between this caller's lookup and its join
+    assert cache.get_or_compute(KEY, lambda: "jobs") == ("jobs", "miss")
+
+    assert cache.compute_missed(KEY, never_called) == ("jobs", "coalesced")
+    assert cache.stats()["inFlight"] == 0
+
+def test_caller_joining_an_in_flight_search_counts_one_miss():
+    cache = ResultCache()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        time.sleep(0.2)
+        return "jobs"
+
+    leader = threading.Thread(target=cache.get_or_compute, args=(KEY, slow))
+    leader.start()
+    started.wait()
+
+    # As the streaming path does: look up first, then wait for the pending search
+    assert cache.lookup(KEY, never_called) == (None, "miss")
+    assert cache.pending(KEY) is not None
+    assert cache.compute_missed(KEY, never_called) == ("jobs", "coalesced")
+    leader.join()
+
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"]) == (2, 1)
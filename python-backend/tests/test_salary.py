@@ -0,0 +1,39 @@
+import pytest
+
+from salary import annual_range, find_salary, salary_filter
+
+@pytest.mark.parametrize('text, matched, low, high, period, currency', [
+    ("Pay: $80k-$120k DOE", "$80k-$120k", 80000, 120000, 'year', 'USD'),
+    ("$80-120k plus equity", "$80-120k", 80000, 120000, 'year', 'USD'),
+    ("Rate $45/hr on W2", "$45/hr", 45, None, 'hour', 'USD'),
+    ("$40 - $55 per hour", "$40 - $55 per hour", 40, 55, 'hour', 'USD'),
+    ("$25 hourly", "$25 hourly", 25, None, 'hour', 'USD'),
+    ("£50,000 a year", "£50,000 a year", 50000, None, 'year', 'GBP'),
+    ("€4,500 a month", "€4,500 a month", 4500, None, 'month', 'EUR'),
+    ("Up to $150K", "Up to $150K", None, 150000, 'year', 'USD'),
+    ("USD 60k base", "USD 60k", 60000, None, 'year', 'USD'),
+    ("Salary $90,000 - $110,000", "$90,000 - $110,000", 90000, 110000, 'year', 'USD'),
+])
+def test_find_salary_reads_quoted_pay(text, matched, low, high, period, currency):
+    assert find_salary(text) == (matched, {
+        "salaryMin": low, "salaryMax": high, "salaryPeriod": period, "salaryCurrency": currency
+    })
+
+@pytest.mark.parametrize('text', [
+    "Competitive salary",
+    "3-5 years of React",
+    "401k plan with match",
+    "Serve 10,000 users",
+    "$5 application fee",
+    "$2,000,000 budget",
+    "",
+])
+def test_find_salary_skips_numbers_that_are_not_pay(text):
+    assert find_salary(text)[0] is None
+
+def test_salary_filter_compares_yearly_equivalents():
+    hourly = find_salary("$40 - $55 per hour")[1]
+    assert annual_range(hourly) == (83200, 114400)
+
+    assert salary_filter(min_salary=100000)(hourly)
+    assert not salary_filter(min_salary=120000)(hourly)
@@ -0,0 +1,51 @@
+import pytest
+
+from job_document import JobDocument
+from scoring import parse_weights, scorer
+from simple_scraper import generate_mock_jobs
+
+@pytest.mark.parametrize('value', ['nan', 'NaN', 'inf', '-inf', '-1', 'heavy'])
+def test_parse_weights_ignores_values_that_are_not_finite_non_negative(value):
+    assert parse_weights({'weights': f'skills:{value}'}) is None
+    assert parse_weights({'weights': f'skills:{value},recency:0.5'}) == {'recency': 0.5}
+
+def test_parse_weights_keeps_zero_and_ignores_unknown_factors():
+    assert parse_weights({'weights': 'skills:0,luck:3'}) == {'skills': 0.0}
+
+def test_scores_stay_in_range_with_a_nan_weight_query():
+    jobs = generate_mock_jobs("react developer", "Nashville", 10)
+    ranked = scorer.rank(jobs, parse_weights({'weights': 'skills:nan,recency:0.5'}))
+
+    assert all(0 <= job["relevanceScore"] <= 100 for job in ranked)
+
+def salary_jobs():
+    return [
+        {"id": str(pay), "title": "React Developer", "description": "React and JavaScript", "location": "Remote",
+         "isRemote": True, "salaryMin": pay, "salaryMax": pay, "salaryPeriod": "year", "salaryCurrency": "USD"}
+        for pay in (40000, 70000, 120000)
+    ]
+
+def test_custom_weights_keep_scores_apart():
+    scores = scorer.score(salary_jobs(), parse_weights({'weights': 'salary:1'})).tolist()
+
+    assert len(set(scores)) == 3
+    assert max(scores) < 100
+    assert scores == sorted(scores)
+
+def test_only_weight_proportions_matter():
+    doubled = {name: 2 * weight for name, weight in scorer.profile["weights"].items()}
+
+    assert scorer.score(salary_jobs(), doubled).tolist() == scorer.score(salary_jobs()).tolist()
+
+def test_scraped_jobs_are_scored_from_the_scrapers_document(monkeypatch):
+    doc = JobDocument(title="Senior React Developer", description="React, TypeScript and AWS in healthcare")
+    job = {"id": "indeed-primed", "title": "Senior React Developer", "description": "React, TypeScript and AWS",
+           "location": "Nashville, TN", "requirements": ["React"], "tags": []}
+    scorer.prime(job, doc)
+
+    def rebuilt(job, fields=None):
+        raise AssertionError("document rebuilt from the job dict")
+    monkeypatch.setattr(JobDocument, 'from_job', rebuilt)
+
+    assert scorer.score_jobs([job])[0]["relevanceScore"] > 0
+    assert doc.lower('location') == "nashville, tn"
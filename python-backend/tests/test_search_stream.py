@@ -0,0 +1,32 @@
+import json
+
+from search_stream import stream_live_search
+
+def job(job_id, pay=None):
+    return {"id": job_id, "title": f"Job {job_id}", "salaryMin": pay, "salaryMax": pay, "salaryPeriod": "year"}
+
+def finalize(jobs, statuses):
+    unique = list({job["id"]: job for job in jobs}.values())
+    return {"jobs": unique, "total": len(unique), "sources": statuses}
+
+def records(lines):
+    return [json.loads(line) for line in lines]
+
+def test_jobs_already_streamed_are_not_sent_again():
+    sources = [
+        ("Store", lambda: [job("a"), job("b")], ()),
+        ("Live", lambda: [job("b"), job("a"), job("c")], ()),
+    ]
+    lines = records(stream_live_search(sources, finalize, deadline=5))
+
+    sent = [item["id"] for record in lines if record["type"] == "jobs" for item in record["jobs"]]
+    summary = lines[-1]
+    assert sorted(sent) == ["a", "b", "c"]
+    assert len(sent) == summary["total"]
+
+def test_keep_still_filters_streamed_jobs():
+    sources = [("Live", lambda: [job("a", 50000), job("b", 150000)], ())]
+    keep = lambda item: item["salaryMin"] >= 100000
+    lines = records(stream_live_search(sources, finalize, deadline=5, keep=keep))
+
+    assert [item["id"] for item in lines[0]["jobs"]] == ["b"]
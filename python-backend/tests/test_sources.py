@@ -0,0 +1,48 @@
+import pytest
+
+import fallback_app
+import http_client
+import linkedin_scraper
+from aggregator import gather_sources
+from remoteok_store import remoteok_store
+
+class FailedResponse:
+    status_code = 503
+    headers = {}
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def upstreams_down(monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise RuntimeError("RemoteOK API error: 503")
+
+    monkeypatch.setattr(http_client, 'get', lambda *args, **kwargs: FailedResponse())
+    monkeypatch.setattr(remoteok_store, 'fetch', unavailable)
+    monkeypatch.setattr(remoteok_store, '_snapshot', None)
+    monkeypatch.setattr(remoteok_store, 'start', lambda: None)
+
+def test_failed_sources_are_reported_as_errors(upstreams_down):
+    _, statuses = gather_sources(fallback_app.job_sources("react developer", "remote", 9), deadline=5)
+
+    assert [status["name"] for status in statuses] == ["Indeed", "LinkedIn", "RemoteOK"]
+    assert [status["status"] for status in statuses] == ["error", "error", "error"]
+    assert "503" in statuses[0]["error"]
+    assert "503" in statuses[1]["error"]
+    assert statuses[2]["error"] == "RemoteOK feed unavailable"
+
+def test_payload_with_only_failed_sources_is_not_cached(upstreams_down):
+    payload = fallback_app.collect_jobs("react developer", "remote", 9, live=True)
+
+    assert not fallback_app.has_real_jobs(payload)
+    assert all(job["source"] == "Mock API" for job in payload["jobs"])
+
+def test_linkedin_search_releases_a_failed_response(monkeypatch):
+    response = FailedResponse()
+    monkeypatch.setattr(http_client, 'get', lambda *args, **kwargs: response)
+
+    with pytest.raises(RuntimeError):
+        linkedin_scraper.scrape_linkedin_search("react developer", "remote", 5)
+    assert response.closed
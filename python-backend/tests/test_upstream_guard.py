@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+import app
+import upstream_guard
+
+@pytest.fixture(autouse=True)
+def fresh_guards(monkeypatch):
+    monkeypatch.setattr(upstream_guard, '_guards', {})
+
+def failing_scrape(**kwargs):
+    raise RuntimeError("blocked")
+
+def test_failures_of_the_all_sites_scrape_open_each_site_for_streaming(monkeypatch):
+    monkeypatch.setattr(app, 'scrape_jobs', failing_scrape)
+    for _ in range(upstream_guard.FAILURE_THRESHOLD):
+        with pytest.raises(RuntimeError):
+            app.scrape_all_jobs("react developer", "remote", 10)
+
+    assert not upstream_guard.guard_for(app.site_upstream("indeed")).available()
+    with pytest.raises(upstream_guard.UpstreamUnavailable):
+        app.scrape_site_jobs("indeed", "react developer", "remote", 10)
+    assert app.scrape_all_jobs("react developer", "remote", 10) == []
+
+def test_all_sites_scrape_leaves_out_a_site_tripped_by_streaming(monkeypatch):
+    monkeypatch.setattr(app, 'scrape_jobs', failing_scrape)
+    for _ in range(upstream_guard.FAILURE_THRESHOLD):
+        with pytest.raises(RuntimeError):
+            app.scrape_site_jobs("linkedin", "react developer", "remote", 10)
+
+    sites = []
+
+    def scrape(site_name, **kwargs):
+        sites.append(site_name)
+        return pd.DataFrame()
+
+    monkeypatch.setattr(app, 'scrape_jobs', scrape)
+    app.scrape_all_jobs("react developer", "remote", 10)
+    assert sites == [["indeed", "glassdoor"]]
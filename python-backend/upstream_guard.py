@@ -0,0 +1,322 @@
+"""
+Per-host rate limiting and circuit breaking for the upstream job sites
+Every scraper request asks its host's guard before it is sent. A token
+bucket spaces requests to a host out, and a circuit breaker stops sending to
+a host that keeps failing or throttling us, so a site that is down or
+blocking us is skipped at once instead of costing each search a timeout.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+RATE = float(os.environ.get('UPSTREAM_RATE', 2))  # requests per second per host; 0 disables
+BURST = float(os.environ.get('UPSTREAM_BURST', 5))
+MAX_WAIT = float(os.environ.get('UPSTREAM_MAX_WAIT_SECONDS', 1))
+FAILURE_THRESHOLD = int(os.environ.get('UPSTREAM_FAILURE_THRESHOLD', 3))  # 0 disables the breaker
+COOLDOWN = float(os.environ.get('UPSTREAM_COOLDOWN_SECONDS', 30))
+MAX_COOLDOWN = float(os.environ.get('UPSTREAM_MAX_COOLDOWN_SECONDS', 600))
+
+# Upstreams answer these when they want us gone (999 is LinkedIn's); open the circuit at once
+THROTTLE_STATUSES = {429, 999}
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class UpstreamUnavailable(Exception):
+    """A request was not sent because its host's circuit is open or its rate budget is spent"""
+
+    def __init__(self, host, reason, retry_in=None):
+        self.host = host
+        self.reason = reason  # circuit_open or rate_limited
+        self.retry_in = retry_in
+        detail = f", retry in {retry_in:.1f}s" if retry_in else ""
+        super().__init__(f"{host} skipped: {reason.replace('_', ' ')}{detail}")
+
+class TokenBucket:
+    """rate tokens per second, holding at most burst; not thread-safe on its own"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now, max_wait):
+        """Take a token, returning how long to wait before using it, or None if that is over max_wait
+
+        Tokens may be taken ahead (the count goes negative), so waiting
+        requests are spaced out rather than all retrying at the same moment.
+        """
+        if self.rate <= 0:
+            return 0.0
+        self._refill(now)
+        wait = max(0.0, (1 - self.tokens) / self.rate)
+        if wait > max_wait:
+            return None
+        self.tokens -= 1
+        return wait
+
+    def available(self, now):
+        if self.rate <= 0:
+            return None
+        self._refill(now)
+        return self.tokens
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker; not thread-safe on its own
+
+    failure_threshold consecutive failures (or one throttling response) open
+    the circuit for the cooldown. After it, one probe request is let through:
+    success closes the circuit, failure re-opens it for twice as long, up to
+    max_cooldown.
+    """
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN, max_cooldown=MAX_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.retry_at = 0.0
+        self.probing = False
+        self.opened = 0
+
+    def allow(self, now):
+        """CLOSED for a normal request, HALF_OPEN for the probe, or None when the request must not be sent"""
+        if self.failure_threshold <= 0:
+            return CLOSED
+        if self.state == OPEN:
+            if now < self.retry_at:
+                return None
+            self.state = HALF_OPEN
+            self.probing = False
+        if self.state == HALF_OPEN:
+            if self.probing:
+                return None
+            self.probing = True
+            return HALF_OPEN
+        return CLOSED
+
+    def retry_in(self, now):
+        return max(0.0, self.retry_at - now) if self.state == OPEN else 0.0
+
+    def cancel(self, permit):
+        """A permitted request was never sent"""
+        if permit == HALF_OPEN and self.state == HALF_OPEN:
+            self.probing = False
+
+    def success(self, permit):
+        # Answers to requests sent before the circuit opened say nothing about it now
+        if self.state == OPEN or (self.state == HALF_OPEN and permit != HALF_OPEN):
+            return
+        self.state = CLOSED
+        self.failures = 0
+        self.probing = False
+        self.cooldown = self.base_cooldown
+
+    def failure(self, permit, now, throttled=False, retry_after=None):
+        if self.failure_threshold <= 0 or self.state == OPEN:
+            return
+        if self.state == HALF_OPEN:
+            if permit != HALF_OPEN:
+                return
+            self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+            self._open(now, retry_after)
+            return
+        self.failures += 1
+        if throttled or self.failures >= self.failure_threshold:
+            self._open(now, retry_after)
+
+    def _open(self, now, retry_after):
+        cooldown = self.cooldown
+        if retry_after:
+            cooldown = min(self.max_cooldown, max(cooldown, retry_after))
+        self.state = OPEN
+        self.probing = False
+        self.retry_at = now + cooldown
+        self.opened += 1
+
+class HostGuard:
+    """Rate limiter and circuit breaker for one upstream host"""
+
+    def __init__(self, host, rate=RATE, burst=BURST, breaker=None):
+        self.host = host
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = breaker or CircuitBreaker()
+        self.requests = 0
+        self.failures = 0
+        self.rejected = {"circuit_open": 0, "rate_limited": 0}
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait=MAX_WAIT):
+        """Wait for permission to send one request and return its permit for record()
+
+        Raises UpstreamUnavailable without waiting when the circuit is open,
+        and when the host's rate budget would take longer than max_wait.
+        """
+        with self._lock:
+            now = time.monotonic()
+            permit = self.breaker.allow(now)
+            if permit is None:
+                self.rejected["circuit_open"] += 1
+                raise UpstreamUnavailable(self.host, "circuit_open", self.breaker.retry_in(now) or None)
+            wait = self.bucket.reserve(now, max_wait)
+            if wait is None:
+                self.breaker.cancel(permit)
+                self.rejected["rate_limited"] += 1
+                raise UpstreamUnavailable(self.host, "rate_limited")
+            self.requests += 1
+        if wait:
+            time.sleep(wait)
+        return permit
+
+    def record(self, permit, status=None, failed=False, retry_after=None):
+        """Feed the outcome of a permitted request to the breaker
+
+        Connection failures, timeouts, 5xx and throttling statuses count
+        against the host; any other status means it is up.
+        """
+        throttled = status in THROTTLE_STATUSES
+        failed = failed or throttled or (status is not None and status >= 500)
+        with self._lock:
+            if failed:
+                self.failures += 1
+                self.breaker.failure(permit, time.monotonic(), throttled, parse_retry_after(retry_after))
+            else:
+                self.breaker.success(permit)
+
+    def available(self):
+        """False while the circuit is open and its cooldown has not passed"""
+        with self._lock:
+            return self.breaker.state != OPEN or time.monotonic() >= self.breaker.retry_at
+
+    def stats(self):
+        with self._lock:
+            now = time.monotonic()
+            tokens = self.bucket.available(now)
+            return {
+                "state": self.breaker.state,
+                "consecutiveFailures": self.breaker.failures,
+                "retryInS": round(self.breaker.retry_in(now), 1),
+                "timesOpened": self.breaker.opened,
+                "tokens": round(max(0.0, tokens), 2) if tokens is not None else None,
+                "ratePerS": self.bucket.rate or None,
+                "burst": self.bucket.burst,
+                "requests": self.requests,
+                "failures": self.failures,
+                "rejected": {
+                    "circuitOpen": self.rejected["circuit_open"],
+                    "rateLimited": self.rejected["rate_limited"],
+                },
+            }
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header; HTTP dates are ignored"""
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def host_key(url):
+    """Guard key of a URL: its host[:port], or the name itself for non-HTTP upstreams"""
+    return (urlsplit(url).netloc or url).lower()
+
+def _host_limits():
+    """Per-host (rate, burst) overrides from UPSTREAM_HOST_LIMITS="www.linkedin.com=0.5/2,..." """
+    limits = {}
+    for entry in os.environ.get('UPSTREAM_HOST_LIMITS', '').split(','):
+        host, _, limit = entry.strip().partition('=')
+        if not host or not limit:
+            continue
+        rate, _, burst = limit.partition('/')
+        try:
+            limits[host.lower()] = (float(rate), float(burst) if burst else BURST)
+        except ValueError:
+            print(f"Ignoring bad UPSTREAM_HOST_LIMITS entry: {entry}")
+    return limits
+
+HOST_LIMITS = _host_limits()
+
+_guards = {}
+_guards_lock = threading.Lock()
+_sources = {}
+
+def guard_for(url):
+    """The process-wide guard of a URL's host, created on first use"""
+    key = host_key(url)
+    guard = _guards.get(key)
+    if guard is None:
+        with _guards_lock:
+            guard = _guards.get(key)
+            if guard is None:
+                rate, burst = HOST_LIMITS.get(key, (RATE, BURST))
+                guard = _guards[key] = HostGuard(key, rate, burst)
+    return guard
+
+@contextmanager
+def guarded(url):
+    """Guard a block that calls an upstream; an exception in it counts as a failure
+
+    For upstreams reached without http_client, such as JobSpy.
+    """
+    guard = guard_for(url)
+    permit = guard.acquire()
+    try:
+        yield guard
+    except Exception:
+        guard.record(permit, failed=True)
+        raise
+    guard.record(permit)
+
+@contextmanager
+def guarded_all(urls):
+    """Guard one call that reaches several upstreams at once, such as a multi-site JobSpy scrape
+
+    Yields the urls whose guards let a request through; the rest are left out
+    of the call. Its outcome is recorded against every url it included.
+    Raises UpstreamUnavailable when none of them may be called.
+    """
+    permits = []
+    error = None
+    for url in urls:
+        guard = guard_for(url)
+        try:
+            permits.append((url, guard, guard.acquire()))
+        except UpstreamUnavailable as e:
+            error = e
+    if not permits:
+        raise error
+    try:
+        yield [url for url, _, _ in permits]
+    except Exception:
+        for _, guard, permit in permits:
+            guard.record(permit, failed=True)
+        raise
+    for _, guard, permit in permits:
+        guard.record(permit)
+
+def register_source(name, *urls):
+    """Record the upstream hosts a search source depends on"""
+    _sources[name] = tuple(host_key(url) for url in urls)
+
+def source_available(name):
+    """False when every host a source depends on has an open circuit"""
+    hosts = _sources.get(name)
+    if not hosts:
+        return True
+    return any(host not in _guards or _guards[host].available() for host in hosts)
+
+def stats():
+    """Breaker state and remaining rate budget of every host contacted so far"""
+    with _guards_lock:
+        guards = sorted(_guards.items())
+    return {host: guard.stats() for host, guard in guards}
@@ -1,5 +1,4 @@
 import { Job } from '@/types/job';
-import { calculateRelevanceScore } from './aiScoring';
 
 const PYTHON_BACKEND_URL = process.env.NEXT_PUBLIC_PYTHON_BACKEND_URL || 'http://localhost:5000';
 
@@ -7,11 +6,20 @@ export interface JobSearchParams {
   search?: string;
   location?: string;
   limit?: number;
+  cursor?: string;
+  minSalary?: number;
+  maxSalary?: number;
+  // Factor weights for this search, e.g. { salary: 0.4, skills: 0.2 }
+  weights?: Record<string, number>;
 }
 
 export interface JobApiResponse {
   jobs: Job[];
   total: number;
+  offset?: number;
+  hasMore?: boolean;
+  nextCursor?: string | null;
+  snapshotExpiresAt?: string | null;
   message?: string;
   error?: string;
 }
@@ -41,6 +49,18 @@ export class JobApiService {
         location: params.location || 'nashville',
         limit: (params.limit || 20).toString(),
       });
+      if (params.cursor) {
+        searchParams.set('cursor', params.cursor);
+      }
+      if (params.minSalary != null) {
+        searchParams.set('minSalary', params.minSalary.toString());
+      }
+      if (params.maxSalary != null) {
+        searchParams.set('maxSalary', params.maxSalary.toString());
+      }
+      if (params.weights) {
+        searchParams.set('weights', Object.entries(params.weights).map(([name, value]) => `${name}:${value}`).join(','));
+      }
 
       console.log(`Searching jobs: ${PYTHON_BACKEND_URL}/api/jobs/search?${searchParams}`);
 
@@ -58,19 +78,8 @@ export class JobApiService {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
 
+      // Jobs arrive scored and ranked by the backend
       const data: JobApiResponse = await response.json();
-
-      // Enhanced AI scoring for each job
-      if (data.jobs && data.jobs.length > 0) {
-        data.jobs = data.jobs.map(job => ({
-          ...job,
-          relevanceScore: calculateRelevanceScore(job)
-        }));
-
-        // Sort by relevance score (highest first)
-        data.jobs.sort((a, b) => b.relevanceScore - a.relevanceScore);
-      }
-
       return data;
     } catch (error) {
       console.error('Error searching jobs:', error);
@@ -1,5 +1,20 @@
 import { Job } from '@/types/job';
 
+const PERIODS_PER_YEAR = { year: 1, month: 12, week: 52, day: 260, hour: 2080 };
+
+// Yearly [min, max] pay of a job: the backend's numeric fields when present,
+// otherwise the numbers in the display string
+export const annualSalaryRange = (job: Job): [number, number] => {
+  if (job.salaryMin != null || job.salaryMax != null) {
+    const perYear = PERIODS_PER_YEAR[job.salaryPeriod || 'year'];
+    const min = (job.salaryMin ?? job.salaryMax ?? 0) * perYear;
+    const max = (job.salaryMax ?? job.salaryMin ?? 0) * perYear;
+    return [min, max];
+  }
+  const salaryNumbers = job.salary.match(/\d+,?\d*/g)?.map(s => parseInt(s.replace(',', ''))) || [0];
+  return [Math.min(...salaryNumbers), Math.max(...salaryNumbers)];
+};
+
 export const filterJobs = (
   jobs: Job[],
   searchTerm: string = '',
@@ -23,10 +38,8 @@ export const filterJobs = (
       (location === 'nashville' && job.location.toLowerCase().includes('nashville')) ||
       (location === 'both' && (job.isRemote || job.location.toLowerCase().includes('nashville')));
 
-    // Salary filter (extract numeric values from salary string)
-    const salaryNumbers = job.salary.match(/\d+,?\d*/g)?.map(s => parseInt(s.replace(',', ''))) || [0];
-    const jobMinSalary = Math.min(...salaryNumbers);
-    const jobMaxSalary = Math.max(...salaryNumbers);
+    // Salary filter
+    const [jobMinSalary, jobMaxSalary] = annualSalaryRange(job);
     const matchesSalary = jobMaxSalary >= minSalary && jobMinSalary <= maxSalary;
 
     // Job type filter
@@ -45,11 +58,7 @@ export const filterJobs = (
       filtered.sort((a, b) => new Date(b.postedDate).getTime() - new Date(a.postedDate).getTime());
       break;
     case 'salary':
-      filtered.sort((a, b) => {
-        const aSalary = Math.max(...(a.salary.match(/\d+,?\d*/g)?.map(s => parseInt(s.replace(',', ''))) || [0]));
-        const bSalary = Math.max(...(b.salary.match(/\d+,?\d*/g)?.map(s => parseInt(s.replace(',', ''))) || [0]));
-        return bSalary - aSalary;
-      });
+      filtered.sort((a, b) => annualSalaryRange(b)[1] - annualSalaryRange(a)[1]);
       break;
     case 'company':
       filtered.sort((a, b) => a.company.localeCompare(b.company));
@@ -4,6 +4,11 @@ export interface Job {
   company: string;
   location: string;
   salary: string;
+  // Numeric salary parsed by the Python backend; null when unknown
+  salaryMin?: number | null;
+  salaryMax?: number | null;
+  salaryPeriod?: 'year' | 'month' | 'week' | 'day' | 'hour' | null;
+  salaryCurrency?: string | null;
   postedDate: string;
   source: string;
   description: string;